@@ -47,13 +47,17 @@ def make_plugin() -> Tuple[List[Type[AbstractDetector]], List[Type[AbstractPrint
     # 导入FlashLoanCallback检测器
     from slither_enhanced.src.python_module.detectors.FlashLoanCallback import FlashLoanCallback
     
+    # 导入并行协调器（按需启用：--detect enhanced-parallel）
+    from slither_enhanced.src.python_module.detectors.ParallelDetectors import ParallelEnhancedDetectors
+    
     detectors: List[Type[AbstractDetector]] = [
         UncheckedBalanceChangeDetector,
         UnboundedFlashLoanRisk,
         IntervalViolationDetector,
         IntervalBasedNumericalAnomalies, 
         DeFiRangeViolationDetector,  # 添加DeFiRangeViolationDetector检测器
-        FlashLoanCallback  # 添加FlashLoanCallback检测器
+        FlashLoanCallback,  # 添加FlashLoanCallback检测器
+        ParallelEnhancedDetectors  # 并行运行以上检测器的协调器
     ]
     
     printers: List[Type[AbstractPrinter]] = []
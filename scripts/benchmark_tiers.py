@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+
+"""
+比较区间分析各档位的耗时和结果
+
+用Slither编译目录下的每个Solidity文件，分别用0、1、2档运行区间分析，
+统计每档的分析耗时（不含编译）和违规数，并以2档的结果为基准计算
+低档位结果的精确率（低档位的违规中2档也报告的比例）和召回率（2档的违规中低档位也报告的比例）。
+
+用法:
+    python scripts/benchmark_tiers.py test/TestContracts/dataset [--solc-remaps "..."]
+"""
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+# 添加slither_enhanced所在目录到搜索路径
+ROOT_DIR = Path(__file__).resolve().parent.parent.parent
+sys.path.append(str(ROOT_DIR))
+
+from slither.slither import Slither
+from slither_enhanced.src.python_module.interval_analysis import ANALYSIS_TIERS, DEFAULT_TIER, DeFiRangeAnalyzer, IntervalFinding
+from slither_enhanced.src.python_module.interval_analysis.range_analysis import _SHARED_FUNCTION_RESULTS
+
+
+def parse_args():
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description='比较区间分析各档位的耗时和结果')
+    parser.add_argument('directory', help='包含Solidity文件的目录')
+    parser.add_argument('--solc-remaps', help='Solidity编译器重映射，用";"分隔', default="")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    logging.getLogger("IntervalAnalysis").setLevel(logging.WARNING)
+    solc_remaps = args.solc_remaps.split(";") if args.solc_remaps else []
+
+    elapsed = {tier: 0.0 for tier in ANALYSIS_TIERS}
+    findings = {tier: set() for tier in ANALYSIS_TIERS}
+    for source in sorted(Path(args.directory).rglob("*.sol")):
+        try:
+            slither = Slither(str(source), solc_remaps=solc_remaps)
+        except Exception as e:
+            print(f"{source}: 编译失败 ({e})")
+            continue
+        for tier in ANALYSIS_TIERS:
+            # 各档位的结果互不复用，计时只包含分析本身
+            _SHARED_FUNCTION_RESULTS.clear()
+            start = time.perf_counter()
+            for compilation_unit in slither.compilation_units:
+                for finding in DeFiRangeAnalyzer(compilation_unit, tier=tier).iter_findings():
+                    if isinstance(finding, IntervalFinding):
+                        findings[tier].add((str(source), finding["contract"], finding["function"], finding["variable"], finding["violation"]))
+            elapsed[tier] += time.perf_counter() - start
+
+    reference = findings[DEFAULT_TIER]
+    print(f"\n{'档位':<6}{'耗时(s)':>10}{'违规数':>10}{'精确率':>10}{'召回率':>10}")
+    for tier in ANALYSIS_TIERS:
+        common = len(findings[tier] & reference)
+        precision = common / len(findings[tier]) if findings[tier] else 1.0
+        recall = common / len(reference) if reference else 1.0
+        print(f"{tier:<6}{elapsed[tier]:>10.2f}{len(findings[tier]):>10}{precision:>10.1%}{recall:>10.1%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+
+"""
+生成库函数摘要数据库的指纹
+
+用Slither编译给定的库源码（如某个版本的OpenZeppelin SafeMath/Math/SafeCast、
+Uniswap FullMath），对数据库中签名匹配的每个函数计算规范化IR指纹并写回数据库，
+同时把数据库版本号加一。之后不同项目内置的同一份库代码可以直接按指纹匹配。
+
+用法:
+    python scripts/build_library_summaries.py SafeMath.sol Math.sol ... [--database PATH]
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# 添加slither_enhanced所在目录到搜索路径
+ROOT_DIR = Path(__file__).resolve().parent.parent.parent
+sys.path.append(str(ROOT_DIR))
+
+from slither.slither import Slither
+from slither_enhanced.src.python_module.interval_analysis.library_summaries import DATABASE_PATH
+from slither_enhanced.src.python_module.interval_analysis.fingerprints import ir_fingerprint
+
+
+def parse_args():
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description='从库源码生成摘要数据库的IR指纹')
+    parser.add_argument('sources', nargs='+', help='库的Solidity源文件')
+    parser.add_argument('--database', default=DATABASE_PATH, help='摘要数据库文件路径')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    with open(args.database, "r", encoding="utf-8") as f:
+        database = json.load(f)
+
+    # {(库名, 函数签名): 表项}
+    entries = {}
+    for entry in database["summaries"]:
+        for signature in entry["signatures"]:
+            entries[(entry["library"], signature)] = entry
+
+    added = 0
+    for source in args.sources:
+        slither = Slither(source)
+        for contract in slither.contracts:
+            name = contract.name[:-len("Upgradeable")] if contract.name.endswith("Upgradeable") else contract.name
+            for function in contract.functions:
+                entry = entries.get((name, function.full_name))
+                if entry is None or not function.nodes:
+                    continue
+                fingerprint = ir_fingerprint(function)
+                if fingerprint not in entry["fingerprints"]:
+                    entry["fingerprints"].append(fingerprint)
+                    added += 1
+                    print(f"{contract.name}.{function.full_name}: {fingerprint}")
+
+    if added:
+        database["version"] += 1
+        with open(args.database, "w", encoding="utf-8") as f:
+            json.dump(database, f, indent=4, ensure_ascii=False)
+            f.write("\n")
+    print(f"新增 {added} 个指纹，数据库版本 {database['version']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+
+"""
+在基准合约集上拟合区间分析的代价模型
+
+用Slither编译目录下的每个Solidity文件，对每个函数提取代价特征，
+关闭代价模型和函数去重后用2档完整分析，测量耗时和工作列表迭代轮数，
+用最小二乘拟合线性系数并写入系数文件。
+
+用法:
+    python scripts/fit_cost_model.py test/TestContracts/dataset [--output PATH] [--solc-remaps "..."]
+"""
+
+import argparse
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+
+# 添加slither_enhanced所在目录到搜索路径
+ROOT_DIR = Path(__file__).resolve().parent.parent.parent
+sys.path.append(str(ROOT_DIR))
+
+from slither.slither import Slither
+from slither_enhanced.src.python_module.interval_analysis import DeFiRangeAnalyzer
+from slither_enhanced.src.python_module.interval_analysis.cost_model import COST_MODEL_PATH, extract_features, fit_coefficients
+
+
+def parse_args():
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description='在基准合约集上拟合区间分析的代价模型')
+    parser.add_argument('directory', help='包含Solidity文件的目录')
+    parser.add_argument('--output', default=COST_MODEL_PATH, help='系数文件路径')
+    parser.add_argument('--solc-remaps', help='Solidity编译器重映射，用";"分隔', default="")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    logging.getLogger("IntervalAnalysis").setLevel(logging.WARNING)
+    solc_remaps = args.solc_remaps.split(";") if args.solc_remaps else []
+
+    samples = []
+    for source in sorted(Path(args.directory).rglob("*.sol")):
+        try:
+            slither = Slither(str(source), solc_remaps=solc_remaps)
+        except Exception as e:
+            print(f"{source}: 编译失败 ({e})")
+            continue
+        for compilation_unit in slither.compilation_units:
+            analyzer = DeFiRangeAnalyzer(compilation_unit, tier=2)
+            analyzer._use_cost_model = False
+            analyzer._dedupe_functions = False
+            for contract in compilation_unit.contracts_derived:
+                for function in contract.functions:
+                    if not function.nodes or function.is_constructor:
+                        continue
+                    iterations = analyzer.get_statistics()["iterations"]
+                    start = time.perf_counter()
+                    try:
+                        analyzer._analyze_function_worklist(function)
+                    except Exception as e:
+                        print(f"{contract.name}.{function.full_name}: 分析失败 ({e})")
+                        continue
+                    elapsed = time.perf_counter() - start
+                    samples.append((extract_features(function), elapsed, analyzer.get_statistics()["iterations"] - iterations))
+
+    if len(samples) < 10:
+        print(f"样本太少（{len(samples)} 个函数），不写入系数文件")
+        return 1
+
+    model = {"version": 1, "fitted": True, "source": f"{args.directory}，{len(samples)} 个函数"}
+    model.update(fit_coefficients(samples))
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(model, f, indent=4, ensure_ascii=False)
+        f.write("\n")
+    print(f"已用 {len(samples)} 个函数拟合系数，写入 {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+
+"""
+统计区间分析的函数去重比例
+
+用Slither编译目录下的每个Solidity文件，对每个编译单元运行区间分析。
+所有分析器共享同一张去重结果表，因此统计的是跨合约、跨文件的去重效果。
+
+用法:
+    python scripts/report_dedupe_ratio.py test/TestContracts/dataset [--solc-remaps "..."]
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+# 添加slither_enhanced所在目录到搜索路径
+ROOT_DIR = Path(__file__).resolve().parent.parent.parent
+sys.path.append(str(ROOT_DIR))
+
+from slither.slither import Slither
+from slither_enhanced.src.python_module.interval_analysis import DeFiRangeAnalyzer
+
+
+def parse_args():
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description='统计区间分析的函数去重比例')
+    parser.add_argument('directory', help='包含Solidity文件的目录')
+    parser.add_argument('--solc-remaps', help='Solidity编译器重映射，用";"分隔', default="")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    logging.getLogger("IntervalAnalysis").setLevel(logging.WARNING)
+    solc_remaps = args.solc_remaps.split(";") if args.solc_remaps else []
+
+    total = 0
+    hits = 0
+    failed = 0
+    for source in sorted(Path(args.directory).rglob("*.sol")):
+        try:
+            slither = Slither(str(source), solc_remaps=solc_remaps)
+        except Exception as e:
+            print(f"{source}: 编译失败 ({e})")
+            failed += 1
+            continue
+        file_total = 0
+        file_hits = 0
+        for compilation_unit in slither.compilation_units:
+            analyzer = DeFiRangeAnalyzer(compilation_unit)
+            analyzer.analyze()
+            statistics = analyzer.get_statistics()
+            file_total += statistics["dedupe_functions"]
+            file_hits += statistics["dedupe_hits"]
+        print(f"{source}: {file_hits}/{file_total} 个函数使用已有结果")
+        total += file_total
+        hits += file_hits
+
+    ratio = hits / total if total else 0.0
+    print(f"\n共 {total} 个函数，实际分析 {total - hits} 个，去重比例 {ratio:.1%}（{failed} 个文件编译失败）")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
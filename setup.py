@@ -6,6 +6,9 @@ setup(
     description="Slither插件模块，包含区间分析模块和DeFi特定检测器模块和UI模块",
     author="dcz",
     packages=find_packages(),
+    package_data={
+        "src.python_module.interval_analysis": ["data/*.json"],
+    },
     python_requires=">=3.8",
     install_requires=[
         "slither-analyzer>=0.9.0",
@@ -0,0 +1,28 @@
+"""
+检测器共享分析 (Shared Detector Analyses)
+
+增强检测器共用的数据流分析和索引，检测器不必各自重复遍历CFG和IR。
+"""
+
+from .budget import DetectorBudget, detector_timeout, truncated_result
+from .callback_registry import CallbackRegistry, CallbackSpec, classify_callback, get_callback_registry
+from .dataflow import BitsetDataflow, Universe, reverse_postorder
+from .function_facts import FunctionFacts, get_function_facts
+from .guards import GuardIndex, guard_conditions
+from .reachability import ReachabilityIndex, get_reachability_index
+from .result_cache import ResultCache, function_cache_key
+from .taint import get_modified_state, get_taint_summary
+from .unit_cache import unit_cache
+from .write_after_call import WriteBeforeCall, WrittenStateAnalysis, find_writes_before_calls
+
+__all__ = [
+    'DetectorBudget', 'detector_timeout', 'truncated_result',
+    'CallbackRegistry', 'CallbackSpec', 'classify_callback', 'get_callback_registry',
+    'BitsetDataflow', 'Universe', 'reverse_postorder',
+    'FunctionFacts', 'get_function_facts',
+    'GuardIndex', 'guard_conditions',
+    'ReachabilityIndex', 'get_reachability_index',
+    'ResultCache', 'function_cache_key',
+    'get_modified_state', 'get_taint_summary',
+    'unit_cache',
+    'WriteBeforeCall', 'WrittenStateAnalysis', 'find_writes_before_calls']
@@ -0,0 +1,97 @@
+"""
+检测器时间预算 (Detector Time Budget)
+
+单个病态合约可能让某个增强检测器长时间不返回，拖住整个slither调用。
+每个增强检测器在_detect开始时建立一个墙钟预算：
+1. 预算秒数由环境变量SLITHER_ENHANCED_TIMEOUT设置，不大于0时不限时
+2. 逐函数检测的检测器在处理每个函数前检查是否超时，区间分析检测器把剩余预算交给分析器
+3. 超时后返回已经得到的结果，并附加一条"结果被截断"的标记结果，
+   标记结果的additional_fields中 truncated 为 True，便于脚本识别
+"""
+
+import logging
+import os
+import time
+
+logger = logging.getLogger("DetectorBudget")
+
+# 单个检测器预算秒数的环境变量
+DETECTOR_TIMEOUT_ENVIRONMENT_VARIABLE = "SLITHER_ENHANCED_TIMEOUT"
+
+# 默认预算（秒）
+DEFAULT_DETECTOR_TIMEOUT = 600.0
+
+
+def detector_timeout():
+    """
+    读取单个检测器的预算秒数
+
+    Returns:
+        float或None: 预算秒数，不限时返回None
+    """
+    value = os.environ.get(DETECTOR_TIMEOUT_ENVIRONMENT_VARIABLE)
+    if value is None:
+        return DEFAULT_DETECTOR_TIMEOUT
+    try:
+        seconds = float(value)
+    except ValueError:
+        logger.warning(f"忽略无效的 {DETECTOR_TIMEOUT_ENVIRONMENT_VARIABLE}={value!r}，使用默认预算 {DEFAULT_DETECTOR_TIMEOUT} 秒")
+        return DEFAULT_DETECTOR_TIMEOUT
+    return seconds if seconds > 0 else None
+
+
+class DetectorBudget:
+    """
+    一次检测的墙钟预算
+    """
+
+    def __init__(self, seconds=None):
+        """
+        从现在开始计时
+
+        Args:
+            seconds: 预算秒数，为None时读取环境变量（不大于0表示不限时）
+        """
+        if seconds is None:
+            seconds = detector_timeout()
+        self.seconds = seconds if seconds is not None and seconds > 0 else None
+        self.deadline = time.monotonic() + self.seconds if self.seconds is not None else None
+
+    def expired(self):
+        """
+        判断预算是否已经用完
+
+        Returns:
+            bool: 超过截止时间时返回True
+        """
+        return self.deadline is not None and time.monotonic() > self.deadline
+
+    def remaining(self):
+        """
+        剩余的预算秒数
+
+        Returns:
+            float或None: 剩余秒数（不小于0），不限时返回None
+        """
+        if self.deadline is None:
+            return None
+        return max(self.deadline - time.monotonic(), 0.0)
+
+
+def truncated_result(detector, budget):
+    """
+    生成"结果被截断"的标记结果
+
+    Args:
+        detector: 超时的检测器实例
+        budget: 检测器的DetectorBudget
+
+    Returns:
+        Output: 标记结果（影响等级为Informational）
+    """
+    info = [f"{detector.ARGUMENT} 超过时间预算（{budget.seconds:g} 秒），以上结果不完整\n"]
+    result = detector.generate_result(info, additional_fields={"truncated": True, "time_budget": budget.seconds})
+    # 标记本身不是漏洞，不应按检测器的影响等级计入
+    result.data["impact"] = "Informational"
+    logger.warning(f"{detector.ARGUMENT} 超过时间预算 {budget.seconds:g} 秒，返回部分结果")
+    return result
@@ -0,0 +1,193 @@
+"""
+闪电贷回调注册表 (Flash Loan Callback Registry)
+
+各协议闪电贷回调的唯一登记处，FlashLoanCallback和UnboundedFlashLoanRisk共用：
+1. 每个回调记录协议、规范化签名和4字节选择器
+2. 按规范化签名和选择器建立索引，查找是O(1)的字典访问
+3. 结构体参数在不同源码里写法不一（DyDx的Account.Info），对含元组参数的回调，
+   签名不匹配时按"函数名 + 参数个数"退而匹配，取代检测器里对callFunction的特殊处理；
+   参数全是基本类型的签名是确定的，不匹配就不是回调（避免把任意的callback(uint256)当成回调）
+4. 每个编译单元只对全部函数分类一次，分类结果保存在编译单元上，检测器之间共享
+"""
+
+from collections import namedtuple
+import re
+
+from slither.utils.function import get_function_id
+
+from .unit_cache import unit_cache
+
+# 单个回调：协议、规范化签名、4字节选择器、函数名、参数个数
+CallbackSpec = namedtuple("CallbackSpec", ["provider", "signature", "selector", "name", "arity"])
+
+# (协议, 签名)，签名使用ABI规范形式：结构体展开为元组，合约类型写作address
+_CALLBACKS = (
+    ("Uniswap V2", "uniswapV2Call(address,uint256,uint256,bytes)"),
+    ("Uniswap V3", "uniswapV3FlashCallback(uint256,uint256,bytes)"),
+    ("Aave V1", "executeOperation(address,uint256,uint256,bytes)"),
+    ("Aave V2", "executeOperation(address[],uint256[],uint256[],address,bytes)"),
+    ("Aave V3", "executeOperation(address,uint256,uint256,address,bytes)"),
+    ("Balancer", "receiveFlashLoan(address[],uint256[],uint256[],bytes)"),
+    # ERC-3156，MakerDAO的DssFlash和Compound等实现共用
+    ("Maker", "onFlashLoan(address,address,uint256,uint256,bytes)"),
+    ("Maker", "onVatDaiFlashLoan(address,uint256,uint256,bytes)"),
+    ("Maker", "onFlashLoanTransfer(address,address,uint256,bytes)"),
+    # Account.Info {address owner; uint256 number}
+    ("DyDx", "callFunction(address,(address,uint256),bytes)"),
+    ("DyDx", "callFunction(address,(address,address,uint256,uint256),bytes)"),
+    ("Curve", "callback(bytes)"),
+    ("1inch", "flashCallback(address,uint256,uint256,bytes)"),
+)
+
+# 整数类型的简写
+_INTEGER_ALIAS = re.compile(r"\b(u?int)(?=[,)\[])")
+
+
+def normalize_signature(signature):
+    """
+    规范化函数签名：去掉空白，uint/int简写补全为uint256/int256
+
+    Args:
+        signature: 函数签名字符串
+
+    Returns:
+        str: 规范化后的签名
+    """
+    return _INTEGER_ALIAS.sub(r"\g<1>256", re.sub(r"\s+", "", signature))
+
+
+def _arity(signature):
+    """
+    计算签名的顶层参数个数（元组内部的逗号不计）
+    """
+    parameters = signature[signature.index("(") + 1:-1]
+    if not parameters:
+        return 0
+    depth = 0
+    count = 1
+    for char in parameters:
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "," and depth == 0:
+            count += 1
+    return count
+
+
+def _has_tuple_parameter(signature):
+    """
+    判断签名是否含元组（结构体）参数
+    """
+    return "(" in signature[signature.index("(") + 1:]
+
+
+class CallbackRegistry:
+    """
+    闪电贷回调注册表
+    """
+
+    def __init__(self, callbacks=_CALLBACKS):
+        """
+        建立签名、选择器和函数名索引
+
+        Args:
+            callbacks: [(协议, 签名)]
+        """
+        self.by_signature = {}
+        self.by_selector = {}
+        self._by_name = {}  # {(函数名, 参数个数): CallbackSpec}，含元组参数的回调在签名不匹配时的退路
+        for provider, signature in callbacks:
+            signature = normalize_signature(signature)
+            name = signature[:signature.index("(")]
+            spec = CallbackSpec(provider, signature, get_function_id(signature), name, _arity(signature))
+            self.by_signature[signature] = spec
+            self.by_selector[spec.selector] = spec
+            if _has_tuple_parameter(signature):
+                self._by_name.setdefault((name, spec.arity), spec)
+
+    def lookup_selector(self, selector):
+        """
+        按4字节选择器查找回调
+
+        Args:
+            selector: 选择器（整数或"0x"开头的十六进制字符串）
+
+        Returns:
+            CallbackSpec: 匹配的回调，没有时为None
+        """
+        if isinstance(selector, str):
+            selector = int(selector, 16)
+        return self.by_selector.get(selector)
+
+    def classify(self, function):
+        """
+        判断函数是否是已登记的闪电贷回调
+
+        Args:
+            function: Slither函数对象
+
+        Returns:
+            CallbackSpec: 匹配的回调，不是回调时为None
+        """
+        # 回调由借贷协议从外部调用
+        if function.visibility not in ("public", "external"):
+            return None
+        try:
+            signature = normalize_signature(function.solidity_signature)
+        except Exception:
+            # 无法转换参数类型时只按函数名和参数个数匹配
+            signature = None
+        spec = self.by_signature.get(signature) if signature else None
+        # 只有结构体参数的写法不一，签名全是基本类型时不退而按名称匹配
+        if spec is None and (signature is None or _has_tuple_parameter(signature)):
+            spec = self._by_name.get((function.name, len(function.parameters)))
+        return spec
+
+
+# 全局注册表，回调表是静态的，只建立一次
+_REGISTRY = None
+
+
+def get_callback_registry():
+    """
+    获取共享的闪电贷回调注册表
+
+    Returns:
+        CallbackRegistry: 注册表
+    """
+    global _REGISTRY
+    if _REGISTRY is None:
+        _REGISTRY = CallbackRegistry()
+    return _REGISTRY
+
+
+def _classify_unit(compilation_unit):
+    """
+    对编译单元的全部函数分类
+    """
+    registry = get_callback_registry()
+    classifications = {}
+    for contract in compilation_unit.contracts:
+        for candidate in contract.functions:
+            if candidate not in classifications:
+                classifications[candidate] = registry.classify(candidate)
+    return classifications
+
+
+def classify_callback(compilation_unit, function):
+    """
+    查询函数在编译单元中的回调分类；第一次查询某个编译单元时对其全部函数分类一次
+
+    Args:
+        compilation_unit: Slither编译单元对象
+        function: Slither函数对象
+
+    Returns:
+        CallbackSpec: 匹配的回调，不是回调时为None
+    """
+    # 编译单元的分类结果 {函数: CallbackSpec或None}
+    classifications = unit_cache(compilation_unit, "callback_classifications", lambda: _classify_unit(compilation_unit))
+    if function not in classifications:
+        classifications[function] = get_callback_registry().classify(function)
+    return classifications[function]
@@ -0,0 +1,251 @@
+"""
+位集数据流框架 (Bitset Dataflow Framework)
+
+检测器共用的单函数gen/kill数据流求解器：
+1. 全集（Universe）把对象编号，数据流事实是Python整数位集，合并和转移都是位运算
+2. 前向/后向、may（并集）/must（交集）由构造参数决定
+3. 工作列表按逆后序（后向分析按后序）取节点，只重新计算输入发生变化的节点，
+   无环CFG每个节点计算一次，有循环时迭代到不动点
+4. 默认转移函数为 out = (in & ~kill) | gen；需要按IR顺序处理或读取其他摘要的分析可以覆盖transfer
+
+must分析的初值是全集，因此全集必须在求解前确定：gen/kill在求解开始时对所有节点计算一次，
+覆盖transfer的must分析不应在求解过程中再编号新对象。
+"""
+
+import heapq
+
+
+def reverse_postorder(function):
+    """
+    计算函数CFG中从入口可达节点的逆后序
+
+    Args:
+        function: Slither函数对象
+
+    Returns:
+        list: 按逆后序排列的节点列表，没有入口节点时为空
+    """
+    entry = function.entry_point
+    if entry is None:
+        return []
+    postorder = []
+    visited = {entry}
+    # 显式栈避免深层CFG的递归溢出：(节点, 后继迭代器)
+    stack = [(entry, iter(entry.sons))]
+    while stack:
+        node, sons = stack[-1]
+        for son in sons:
+            if son not in visited:
+                visited.add(son)
+                stack.append((son, iter(son.sons)))
+                break
+        else:
+            stack.pop()
+            postorder.append(node)
+    postorder.reverse()
+    return postorder
+
+
+class Universe:
+    """
+    位集全集：对象到位号的编号表
+    """
+
+    def __init__(self, items=()):
+        """
+        初始化全集
+
+        Args:
+            items: 预先编号的对象
+        """
+        self._bits = {}
+        self._items = []
+        for item in items:
+            self.bit(item)
+
+    def bit(self, item):
+        """
+        返回对象对应的单位位集，第一次出现时分配新位号
+
+        Args:
+            item: 可哈希对象
+
+        Returns:
+            int: 只有该对象一位的位集
+        """
+        index = self._bits.get(item)
+        if index is None:
+            index = self._bits[item] = len(self._items)
+            self._items.append(item)
+        return 1 << index
+
+    def bits(self, items):
+        """
+        把对象集合编码为位集
+
+        Args:
+            items: 可迭代的对象
+
+        Returns:
+            int: 位集
+        """
+        result = 0
+        for item in items:
+            result |= self.bit(item)
+        return result
+
+    def members(self, bits):
+        """
+        把位集解码为对象列表（按位号顺序）
+
+        Args:
+            bits: 位集
+
+        Returns:
+            list: 对象列表
+        """
+        result = []
+        while bits:
+            low = bits & -bits
+            result.append(self._items[low.bit_length() - 1])
+            bits ^= low
+        return result
+
+    @property
+    def full(self):
+        """
+        当前全集的位集（所有位为1）
+        """
+        return (1 << len(self._items)) - 1
+
+    def __contains__(self, item):
+        return item in self._bits
+
+    def __len__(self):
+        return len(self._items)
+
+
+class BitsetDataflow:
+    """
+    单函数位集数据流分析
+
+    子类覆盖 gen_kill（或 transfer）和 boundary，调用 solve 后用 input/output 读取结果。
+    """
+
+    def __init__(self, function, forward=True, may=True, universe=None):
+        """
+        初始化分析
+
+        Args:
+            function: Slither函数对象
+            forward: True为前向分析，False为后向分析
+            may: True为may分析（合并取并集），False为must分析（合并取交集）
+            universe: 共享的全集，为None时新建
+        """
+        self.function = function
+        self.forward = forward
+        self.may = may
+        self.universe = universe if universe is not None else Universe()
+        self.order = reverse_postorder(function)
+        if not forward:
+            self.order.reverse()
+        self.inputs = {}
+        self.outputs = {}
+        self._gen_kill = {}
+
+    def gen_kill(self, node):
+        """
+        节点的gen和kill位集
+
+        Args:
+            node: CFG节点
+
+        Returns:
+            tuple: (gen, kill)
+        """
+        return 0, 0
+
+    def boundary(self):
+        """
+        边界节点（前向为入口，后向为出口）的输入事实
+
+        Returns:
+            int: 位集
+        """
+        return 0
+
+    def transfer(self, node, bits):
+        """
+        节点的转移函数，默认 out = (in & ~kill) | gen
+
+        Args:
+            node: CFG节点
+            bits: 节点的输入事实
+
+        Returns:
+            int: 节点的输出事实
+        """
+        gen, kill = self._gen_kill[node]
+        return (bits & ~kill) | gen
+
+    def _predecessors(self, node):
+        return node.fathers if self.forward else node.sons
+
+    def _successors(self, node):
+        return node.sons if self.forward else node.fathers
+
+    def solve(self):
+        """
+        用按逆后序排序的工作列表求解到不动点
+
+        Returns:
+            BitsetDataflow: self，便于链式调用
+        """
+        for node in self.order:
+            self._gen_kill[node] = self.gen_kill(node)
+        initial = 0 if self.may else self.universe.full
+        position = {node: index for index, node in enumerate(self.order)}
+        self.outputs = {node: initial for node in self.order}
+
+        worklist = list(range(len(self.order)))
+        queued = set(worklist)
+        while worklist:
+            index = heapq.heappop(worklist)
+            queued.discard(index)
+            node = self.order[index]
+
+            predecessors = [pred for pred in self._predecessors(node) if pred in position]
+            if not predecessors:
+                bits = self.boundary()
+            elif self.may:
+                bits = 0
+                for pred in predecessors:
+                    bits |= self.outputs[pred]
+            else:
+                bits = initial
+                for pred in predecessors:
+                    bits &= self.outputs[pred]
+            self.inputs[node] = bits
+
+            out = self.transfer(node, bits)
+            # 所有节点初始都在工作列表中，之后只有输出变化时才重新处理后继
+            if out != self.outputs[node]:
+                self.outputs[node] = out
+                for succ in self._successors(node):
+                    succ_index = position.get(succ)
+                    if succ_index is not None and succ_index not in queued:
+                        queued.add(succ_index)
+                        heapq.heappush(worklist, succ_index)
+        return self
+
+    def input(self, node):
+        """
+        节点的输入事实（不可达节点为0）
+        """
+        return self.inputs.get(node, 0)
+
+    def output(self, node):
+        """
+        节点的输出事实（不可达节点为0）
+        """
+        return self.outputs.get(node, 0)
@@ -0,0 +1,103 @@
+"""
+函数事实缓存 (Function Facts Cache)
+
+增强检测器需要的函数级事实在一次节点/IR遍历中提取，按编译单元缓存：
+1. 外部调用（LowLevelCall/HighLevelCall/Send/Transfer）及所在节点
+2. 写入的状态变量
+3. require/assert节点及其小写源码文本（只生成一次字符串）
+4. 修饰器及其小写名称
+5. 是否在require/assert中检查msg.sender、是否使用msg.value
+6. 被调用的函数、赋值和条件IR
+
+同一编译单元中每个函数只提取一次，各检测器读取同一份记录。
+"""
+
+from slither.slithir.operations import Assignment, Call, Condition, SolidityCall
+
+from .unit_cache import unit_cache
+from .write_after_call import EXTERNAL_CALL_TYPES
+
+
+class FunctionFacts:
+    """
+    单个函数的事实记录
+    """
+
+    __slots__ = (
+        "function", "external_calls", "state_variables_written", "require_nodes", "require_texts",
+        "modifiers", "modifier_names", "checks_msg_sender", "uses_msg_value", "called_functions",
+        "assignments", "conditions",
+    )
+
+    def __init__(self, function):
+        """
+        遍历一次函数的节点和IR，提取事实
+
+        Args:
+            function: Slither函数对象
+        """
+        self.function = function
+        self.modifiers = tuple(function.modifiers)
+        self.modifier_names = tuple(modifier.name.lower() for modifier in self.modifiers)
+
+        external_calls = []
+        written = {}  # 保持首次写入顺序的去重
+        require_nodes = []
+        require_texts = []
+        called = {}
+        assignments = []
+        conditions = []
+        uses_msg_value = False
+        for node in function.nodes:
+            for variable in node.state_variables_written:
+                written.setdefault(variable, None)
+            if node.contains_require_or_assert():
+                require_nodes.append(node)
+                require_texts.append(str(node).lower())
+            for ir in node.irs:
+                if isinstance(ir, EXTERNAL_CALL_TYPES):
+                    external_calls.append((node, ir))
+                if isinstance(ir, Call) and getattr(ir, "function", None) is not None:
+                    called.setdefault(ir.function, None)
+                if isinstance(ir, Assignment):
+                    assignments.append((node, ir))
+                elif isinstance(ir, Condition):
+                    conditions.append((node, ir))
+                elif isinstance(ir, SolidityCall) and not uses_msg_value and "msg.value" in str(ir):
+                    uses_msg_value = True
+
+        self.external_calls = tuple(external_calls)
+        self.state_variables_written = tuple(written)
+        self.require_nodes = tuple(require_nodes)
+        self.require_texts = tuple(require_texts)
+        self.called_functions = tuple(called)
+        self.assignments = tuple(assignments)
+        self.conditions = tuple(conditions)
+        self.uses_msg_value = uses_msg_value
+        self.checks_msg_sender = any(
+            "msg.sender" in text and any(term in text for term in ("==", "require", "equal"))
+            for text in require_texts
+        )
+
+    def __repr__(self):
+        return (f"FunctionFacts({self.function.name}, calls={len(self.external_calls)}, "
+                f"writes={len(self.state_variables_written)}, requires={len(self.require_nodes)})")
+
+
+def get_function_facts(compilation_unit, function):
+    """
+    获取函数的事实记录，同一编译单元中每个函数只提取一次
+
+    Args:
+        compilation_unit: Slither编译单元对象
+        function: Slither函数对象
+
+    Returns:
+        FunctionFacts: 事实记录
+    """
+    # 编译单元的事实表 {函数: FunctionFacts}
+    facts = unit_cache(compilation_unit, "function_facts")
+    record = facts.get(function)
+    if record is None:
+        record = facts[function] = FunctionFacts(function)
+    return record
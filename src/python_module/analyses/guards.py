@@ -0,0 +1,113 @@
+"""
+守卫索引 (Guard Index)
+
+判断"某个节点之前是否检查过某个变量"时，只有在所有路径上都经过的检查才生效。
+本模块对每个函数建立一次索引：
+1. 守卫：条件分支（Condition）和require/assert，对每个守卫只计算一次它依赖哪些被关注的变量
+2. 在位集数据流框架上求解前向must分析：节点入口的守卫变量 = 所有前驱出口守卫变量的交集，
+   支配节点上的检查必然包含在内，各分支分别检查同一变量的情况也能识别，循环迭代到不动点
+3. 查询某个节点受哪些变量的守卫只是一次字典访问
+"""
+
+from slither.analyses.data_dependency.data_dependency import is_dependent
+from slither.core.declarations.solidity_variables import SolidityFunction
+from slither.slithir.operations import Condition, SolidityCall
+
+from .dataflow import BitsetDataflow, Universe
+
+# 作为守卫的Solidity内置函数
+_GUARD_FUNCTIONS = (
+    SolidityFunction("require(bool)"),
+    SolidityFunction("require(bool,string)"),
+    SolidityFunction("require(bool,error)"),
+    SolidityFunction("assert(bool)"),
+)
+
+
+def guard_conditions(node):
+    """
+    返回节点中作为守卫的条件变量
+
+    Args:
+        node: CFG节点
+
+    Returns:
+        list: 条件分支的条件值和require/assert的第一个参数
+    """
+    values = []
+    for ir in node.irs:
+        if isinstance(ir, Condition):
+            values.append(ir.value)
+        elif isinstance(ir, SolidityCall) and ir.function in _GUARD_FUNCTIONS and ir.arguments:
+            values.append(ir.arguments[0])
+    return values
+
+
+class GuardAnalysis(BitsetDataflow):
+    """
+    前向must分析：到达节点前在所有路径上都检查过的关注变量
+    """
+
+    def __init__(self, function, variables):
+        # 关注变量预先编号，must分析的初值（全集）在求解前确定
+        super().__init__(function, forward=True, may=False, universe=Universe(variables))
+        self.variables = variables
+
+    def gen_kill(self, node):
+        gen = 0
+        for value in guard_conditions(node):
+            for var in self.variables:
+                if is_dependent(value, var, self.function):
+                    gen |= self.universe.bit(var)
+        return gen, 0
+
+
+class GuardIndex:
+    """
+    单个函数的守卫索引
+    """
+
+    def __init__(self, function, variables):
+        """
+        建立索引
+
+        Args:
+            function: Slither函数对象
+            variables: 关注的变量（如余额映射）
+        """
+        self.function = function
+        self.variables = frozenset(variables)
+        self._guarded = {}  # {节点: 所有路径上都已检查过的关注变量}
+        if not self.variables:
+            return
+        analysis = GuardAnalysis(function, list(self.variables)).solve()
+        for node in analysis.order:
+            self._guarded[node] = frozenset(analysis.universe.members(analysis.input(node)))
+
+    def guarded_variables(self, node):
+        """
+        返回在到达节点之前的所有路径上都被检查过的关注变量
+
+        Args:
+            node: CFG节点
+
+        Returns:
+            frozenset: 守卫变量集合；节点不可达时为空集
+        """
+        return self._guarded.get(node, frozenset())
+
+    def is_guarded(self, node, variables=None):
+        """
+        判断节点是否受到任一关注变量的守卫
+
+        Args:
+            node: CFG节点
+            variables: 只考虑这些变量，为None时考虑全部关注变量
+
+        Returns:
+            bool: 所有路径上都有依赖这些变量的守卫时返回True
+        """
+        guarded = self.guarded_variables(node)
+        if variables is None:
+            return bool(guarded)
+        return not guarded.isdisjoint(variables)
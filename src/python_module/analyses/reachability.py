@@ -0,0 +1,232 @@
+"""
+传递可达性索引 (Transitive Reachability Index)
+
+回调经内部辅助函数间接进行的外部调用和状态写入，只看回调自身的IR是发现不了的。
+本模块为编译单元中的函数计算传递摘要：
+1. 状态变量和外部调用点分别编号，摘要是三个位集：
+   可达的状态写入、可达的外部调用、在某条路径上先于（可达的）外部调用写入的状态变量
+2. 调用图（内部调用和修饰器）按Tarjan算法求强连通分量，被调函数所在的分量先求解，
+   分量内部迭代到位集不再变化，递归调用也能收敛
+3. 函数内部在位集数据流框架上传递"已写入"位集（前向may分析），内部调用点使用被调函数的摘要
+4. 摘要在第一次查询时按需计算并缓存，之后的查询都是常数时间的位运算
+"""
+
+from slither.core.declarations import Function
+from slither.slithir.operations import InternalCall
+
+from .dataflow import BitsetDataflow, Universe
+from .unit_cache import unit_cache
+from .write_after_call import EXTERNAL_CALL_TYPES, state_variable_written
+
+# 尚未求解的函数的初始摘要：(写入, 外部调用, 调用前写入)
+_EMPTY = (0, 0, 0)
+
+
+class _StateTrackingAnalysis(BitsetDataflow):
+    """
+    前向may分析：到达节点时在某条路径上已经写入的状态变量（含内部调用写入的）
+
+    转移函数按IR顺序处理节点，同时累积函数的写入、外部调用和调用前写入位集。
+    """
+
+    def __init__(self, index, function, entry_written):
+        super().__init__(function, forward=True, may=True, universe=index._variables)
+        self.index = index
+        self.entry_written = entry_written
+        self.writes = 0
+        self.calls = 0
+        self.before = 0
+
+    def boundary(self):
+        # 修饰器在函数体之前写入的状态变量
+        return self.entry_written
+
+    def transfer(self, node, bits):
+        summaries = self.index._summaries
+        for ir in node.irs:
+            if isinstance(ir, EXTERNAL_CALL_TYPES):
+                self.calls |= self.index._calls.bit(ir)
+                self.before |= bits
+            elif isinstance(ir, InternalCall) and isinstance(ir.function, Function):
+                callee_writes, callee_calls, callee_before = summaries.get(ir.function, _EMPTY)
+                self.before |= callee_before
+                if callee_calls:
+                    self.before |= bits
+                    self.calls |= callee_calls
+                bits |= callee_writes
+                self.writes |= callee_writes
+            variable = state_variable_written(ir)
+            if variable is not None:
+                bit = self.universe.bit(variable)
+                bits |= bit
+                self.writes |= bit
+        return bits
+
+
+class ReachabilityIndex:
+    """
+    编译单元的传递可达性索引
+    """
+
+    def __init__(self, compilation_unit):
+        """
+        初始化索引（摘要在查询时按需计算）
+
+        Args:
+            compilation_unit: Slither编译单元对象
+        """
+        self.compilation_unit = compilation_unit
+        self._variables = Universe()  # 状态变量
+        self._calls = Universe()  # 外部调用IR
+        self._summaries = {}  # {函数: (写入, 外部调用, 调用前写入)}
+
+    @staticmethod
+    def _callees(function):
+        """
+        调用图的边：内部调用的函数和修饰器
+        """
+        callees = [call.function for call in function.internal_calls if isinstance(getattr(call, "function", None), Function)]
+        callees.extend(function.modifiers)
+        return callees
+
+    def _local_pass(self, function):
+        """
+        用被调函数的当前摘要计算函数的摘要
+
+        Args:
+            function: Slither函数对象
+
+        Returns:
+            tuple: (写入, 外部调用, 调用前写入)
+        """
+        writes = calls = before = 0
+
+        # 修饰器在函数体之前按顺序执行
+        entry_written = 0
+        for modifier in function.modifiers:
+            modifier_writes, modifier_calls, modifier_before = self._summaries.get(modifier, _EMPTY)
+            before |= modifier_before
+            if modifier_calls:
+                before |= entry_written
+            entry_written |= modifier_writes
+            writes |= modifier_writes
+            calls |= modifier_calls
+
+        analysis = _StateTrackingAnalysis(self, function, entry_written).solve()
+        return writes | analysis.writes, calls | analysis.calls, before | analysis.before
+
+    def _solve_component(self, component):
+        """
+        求解一个强连通分量：迭代到分量内所有摘要不再变化
+        """
+        for function in component:
+            self._summaries[function] = _EMPTY
+        changed = True
+        while changed:
+            changed = False
+            for function in component:
+                summary = self._local_pass(function)
+                if summary != self._summaries[function]:
+                    self._summaries[function] = summary
+                    changed = True
+
+    def _ensure(self, function):
+        """
+        确保函数及其全部被调函数已求解（迭代式Tarjan，分量按被调在前的顺序求解）
+        """
+        if function in self._summaries:
+            return
+        index = {function: 0}
+        low = {function: 0}
+        stack = [function]
+        on_stack = {function}
+        work = [(function, iter(self._callees(function)))]
+        while work:
+            caller, callees = work[-1]
+            for callee in callees:
+                if callee in self._summaries:
+                    continue
+                if callee not in index:
+                    index[callee] = low[callee] = len(index)
+                    stack.append(callee)
+                    on_stack.add(callee)
+                    work.append((callee, iter(self._callees(callee))))
+                    break
+                if callee in on_stack:
+                    low[caller] = min(low[caller], index[callee])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[caller])
+                if low[caller] == index[caller]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member is caller:
+                            break
+                    self._solve_component(component)
+
+    def summary(self, function):
+        """
+        获取函数的位集摘要
+
+        Args:
+            function: Slither函数对象
+
+        Returns:
+            tuple: (写入, 外部调用, 调用前写入) 三个位集
+        """
+        self._ensure(function)
+        return self._summaries[function]
+
+    def reached_writes(self, function):
+        """
+        函数（含其传递调用的函数和修饰器）写入的状态变量
+
+        Returns:
+            list: 状态变量列表
+        """
+        return self._variables.members(self.summary(function)[0])
+
+    def reached_calls(self, function):
+        """
+        函数（含其传递调用的函数和修饰器）进行的外部调用
+
+        Returns:
+            list: 外部调用IR列表
+        """
+        return self._calls.members(self.summary(function)[1])
+
+    def writes_before_calls(self, function):
+        """
+        在某条路径上先写入、之后（直接或经内部调用）进行了外部调用的状态变量
+
+        Returns:
+            list: 状态变量列表
+        """
+        return self._variables.members(self.summary(function)[2])
+
+    def reaches_call_after_write(self, function):
+        """
+        判断函数是否可能在写入状态变量之后进行外部调用
+
+        Returns:
+            bool: 存在这样的路径时返回True
+        """
+        return self.summary(function)[2] != 0
+
+
+def get_reachability_index(compilation_unit):
+    """
+    获取编译单元共享的传递可达性索引
+
+    Args:
+        compilation_unit: Slither编译单元对象
+
+    Returns:
+        ReachabilityIndex: 可达性索引
+    """
+    return unit_cache(compilation_unit, "reachability_index", lambda: ReachabilityIndex(compilation_unit))
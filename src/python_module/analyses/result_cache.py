@@ -0,0 +1,204 @@
+"""
+检测结果持久缓存 (Persistent Detector Result Cache)
+
+逐函数检测的增强检测器（flashloan-callback-risks、unchecked-balance-change、
+unbounded-flashloan-risk）的结果只取决于函数本身、它调用的函数和合约的状态布局。
+本模块把这些逐函数结果保存在磁盘上，再次分析基本未改动的项目时跳过未改动的函数：
+1. 键：函数的规范指纹（含被调函数、修饰器和所用状态变量的布局，见interval_analysis.fingerprints），
+   加上可见性、节点源码文本（规范指纹不含字符串常量）和合约完整的状态变量布局
+2. 每个检测器一个JSON文件，文件名带检测器的CACHE_VERSION，检测逻辑改变时提高版本即可使旧结果失效
+3. 缓存值是检测器自定义的JSON值（风险描述列表、布尔值或计数），报告时用当前的合约和函数重新生成结果
+4. 缓存目录由环境变量SLITHER_ENHANCED_CACHE_DIR设置，默认在用户缓存目录下；设为off时不使用缓存
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+
+from ..interval_analysis.fingerprints import FunctionFingerprinter
+from .unit_cache import unit_cache
+
+logger = logging.getLogger("ResultCache")
+
+# 缓存目录的环境变量，取值为off/none/0时禁用缓存
+CACHE_DIR_ENVIRONMENT_VARIABLE = "SLITHER_ENHANCED_CACHE_DIR"
+
+# 每个检测器文件最多保留的条目数，超过时先淘汰最久未使用的条目
+MAX_ENTRIES = 50000
+
+_DISABLED_VALUES = ("off", "none", "0", "false")
+
+
+def default_cache_directory():
+    """
+    返回缓存目录
+
+    Returns:
+        str或None: 缓存目录路径，禁用缓存时返回None
+    """
+    value = os.environ.get(CACHE_DIR_ENVIRONMENT_VARIABLE)
+    if value is not None:
+        if value.strip().lower() in _DISABLED_VALUES + ("",):
+            return None
+        return os.path.expanduser(value)
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "slither_enhanced", "results")
+
+
+def _fingerprinter(compilation_unit):
+    # 每个编译单元共享的指纹计算器，被调函数的指纹在各检测器之间复用
+    return unit_cache(compilation_unit, "fingerprinter", FunctionFingerprinter)
+
+
+def function_cache_key(compilation_unit, function):
+    """
+    计算函数结果的缓存键
+
+    Args:
+        compilation_unit: Slither编译单元对象
+        function: Slither函数对象
+
+    Returns:
+        str或None: 十六进制SHA-256键，无法计算指纹时返回None（函数不参与缓存）
+    """
+    try:
+        fingerprint = _fingerprinter(compilation_unit).fingerprint(function)
+    except Exception as e:
+        logger.debug(f"无法计算函数 {function.name} 的规范指纹: {e}")
+        return None
+    contract = getattr(function, "contract", None)
+    variables = getattr(contract, "state_variables_ordered", None) or getattr(contract, "state_variables", [])
+    parts = [
+        fingerprint,
+        f"V:{function.visibility}:{function.is_constructor}",
+        # 合约完整的状态布局（检测器按名称和类型筛选关键变量、余额映射）
+        "L:" + ";".join(f"{var.name}:{var.type}" for var in variables),
+    ]
+    # 节点源码文本：require中的字符串常量等不在规范指纹中
+    parts.extend(str(node) for node in function.nodes)
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """
+    单个检测器的逐函数结果缓存
+    """
+
+    def __init__(self, detector, directory=None):
+        """
+        初始化缓存（文件在第一次查询时加载）
+
+        Args:
+            detector: 检测器实例，使用其ARGUMENT和CACHE_VERSION
+            directory: 缓存目录，为None时由环境变量或默认目录决定
+        """
+        self.compilation_unit = detector.compilation_unit
+        self.version = getattr(detector, "CACHE_VERSION", 1)
+        directory = directory if directory is not None else default_cache_directory()
+        self.path = os.path.join(directory, f"{detector.ARGUMENT}-v{self.version}.json") if directory else None
+        self._entries = None  # 磁盘上的条目 {键: 值}
+        self._updates = {}  # 本次新增或命中的条目，保存时排在最后（最近使用）
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self):
+        return self.path is not None
+
+    def _read(self):
+        """
+        读取缓存文件，文件不存在、损坏或版本不符时返回空表
+        """
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"忽略无法读取的结果缓存 {self.path}: {e}")
+            return {}
+        if not isinstance(data, dict) or data.get("version") != self.version or not isinstance(data.get("entries"), dict):
+            return {}
+        return data["entries"]
+
+    def key(self, function):
+        """
+        计算函数的缓存键
+
+        Args:
+            function: Slither函数对象
+
+        Returns:
+            str或None: 缓存键，禁用缓存或无法计算指纹时返回None
+        """
+        if not self.enabled:
+            return None
+        return function_cache_key(self.compilation_unit, function)
+
+    def get(self, key):
+        """
+        查询缓存
+
+        Args:
+            key: key()返回的缓存键
+
+        Returns:
+            缓存的值，未命中时返回None
+        """
+        if key is None:
+            return None
+        if self._entries is None:
+            self._entries = self._read()
+        value = self._updates.get(key)
+        if value is None:
+            value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._updates[key] = value
+        return value
+
+    def put(self, key, value):
+        """
+        记录函数的结果
+
+        Args:
+            key: key()返回的缓存键，为None时忽略
+            value: 可JSON序列化的结果（不能为None）
+        """
+        if key is not None:
+            self._updates[key] = value
+
+    def save(self):
+        """
+        把本次的条目合并写回缓存文件
+
+        写入前重新读取文件，合并其他进程同时写入的条目；先写临时文件再替换，
+        中断的写入不会留下损坏的缓存
+        """
+        if not self.enabled or not self._updates:
+            return
+        entries = self._read()
+        for key in self._updates:
+            entries.pop(key, None)
+        entries.update(self._updates)
+        if len(entries) > MAX_ENTRIES:
+            entries = dict(list(entries.items())[-MAX_ENTRIES:])
+        try:
+            directory = os.path.dirname(self.path)
+            os.makedirs(directory, exist_ok=True)
+            descriptor, temporary = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            try:
+                with os.fdopen(descriptor, "w", encoding="utf-8") as f:
+                    json.dump({"version": self.version, "entries": entries}, f, ensure_ascii=False)
+                os.replace(temporary, self.path)
+            except BaseException:
+                os.unlink(temporary)
+                raise
+        except OSError as e:
+            logger.warning(f"无法写入结果缓存 {self.path}: {e}")
+            return
+        logger.debug(f"结果缓存 {self.path}: 命中 {self.hits}，未命中 {self.misses}")
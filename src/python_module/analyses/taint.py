@@ -0,0 +1,68 @@
+"""
+回调污点摘要 (Callback Taint Summary)
+
+逐个状态变量调用 is_tainted 会对每个(被调函数, 状态变量)组合重复查询数据依赖。
+本模块对每个回调只读一次Slither已计算好的函数级数据依赖（传递闭包），
+得到依赖于回调参数（以及msg.sender/msg.value/msg.data等通用污点源）的全部状态变量，
+检测器之后只需做集合求交。被调函数写入的状态变量集合同样按编译单元缓存。
+"""
+
+from slither.analyses.data_dependency.data_dependency import GENERIC_TAINT, KEY_NON_SSA
+from slither.core.declarations import Function
+from slither.core.variables.state_variable import StateVariable
+
+from .unit_cache import unit_cache
+
+
+def compute_taint_summary(function):
+    """
+    计算依赖于函数参数或通用污点源的状态变量
+
+    Args:
+        function: Slither函数对象（需已完成数据依赖分析）
+
+    Returns:
+        frozenset: 被污染的状态变量
+    """
+    sources = set(function.parameters) | GENERIC_TAINT
+    dependencies = function.context.get(KEY_NON_SSA, {})
+    return frozenset(
+        variable for variable, origins in dependencies.items()
+        if isinstance(variable, StateVariable) and (variable in sources or not sources.isdisjoint(origins))
+    )
+
+
+def get_taint_summary(compilation_unit, function):
+    """
+    获取回调的污点摘要，同一编译单元中每个函数只计算一次
+
+    Args:
+        compilation_unit: Slither编译单元对象
+        function: Slither函数对象
+
+    Returns:
+        frozenset: 被污染的状态变量
+    """
+    # {函数: frozenset}
+    summaries = unit_cache(compilation_unit, "taint_summaries")
+    if function not in summaries:
+        summaries[function] = compute_taint_summary(function)
+    return summaries[function]
+
+
+def get_modified_state(compilation_unit, callee):
+    """
+    获取被调函数（含其递归调用）写入的状态变量，同一编译单元中每个函数只计算一次
+
+    Args:
+        compilation_unit: Slither编译单元对象
+        callee: 被调函数；Solidity内置函数和公开变量的getter不写状态
+
+    Returns:
+        frozenset: 写入的状态变量
+    """
+    # {函数: frozenset}
+    modified = unit_cache(compilation_unit, "modified_state")
+    if callee not in modified:
+        modified[callee] = frozenset(callee.all_state_variables_written()) if isinstance(callee, Function) else frozenset()
+    return modified[callee]
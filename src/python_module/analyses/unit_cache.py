@@ -0,0 +1,30 @@
+"""
+编译单元缓存 (Compilation Unit Cache)
+
+各分析的结果表保存在编译单元自己的context字典上，而不是以编译单元为键的模块级表：
+表中的函数对象引用着编译单元，以编译单元为键的弱引用表因此永远不会释放表项。
+保存在context上时，缓存与编译单元一起被回收。
+"""
+
+# context中的键前缀，避免与Slither自身的键冲突
+_KEY_PREFIX = "slither_enhanced."
+
+
+def unit_cache(compilation_unit, name, factory=dict):
+    """
+    获取编译单元上的命名缓存，不存在时创建
+
+    Args:
+        compilation_unit: Slither编译单元对象
+        name: 缓存名
+        factory: 无参的可调用对象，缓存不存在时调用它创建缓存
+
+    Returns:
+        缓存对象（默认是dict）
+    """
+    key = _KEY_PREFIX + name
+    context = compilation_unit.context
+    cache = context.get(key)
+    if cache is None:
+        cache = context[key] = factory()
+    return cache
@@ -0,0 +1,89 @@
+"""
+写后调用分析 (Write-Before-Call Analysis)
+
+沿CFG做前向数据流，计算"在某条路径上先写入状态变量、再进行外部调用"的位置：
+1. 状态变量按首次出现的顺序编号，集合用Python整数做位集，合并路径时按位或
+2. 在位集数据流框架（dataflow.py）上求解前向may分析，有循环时迭代到不动点
+3. 节点内部按IR顺序处理，同一节点中调用之后的写入不算在该调用之前
+4. 结果按(状态变量, 被调函数)去重，每对只报告第一次出现的调用节点
+"""
+
+from collections import namedtuple
+
+from slither.core.variables.state_variable import StateVariable
+from slither.slithir.operations import HighLevelCall, Index, Length, LowLevelCall, Member, OperationWithLValue, Send, Transfer
+from slither.slithir.variables import ReferenceVariable
+
+from .dataflow import BitsetDataflow
+
+# 视为外部调用的IR类型
+EXTERNAL_CALL_TYPES = (LowLevelCall, HighLevelCall, Send, Transfer)
+
+# 单条结果：被写入的状态变量、外部调用所在节点、外部调用IR、被调函数（低级调用和转账为None）
+WriteBeforeCall = namedtuple("WriteBeforeCall", ["state_variable", "node", "call", "callee"])
+
+
+def state_variable_written(ir):
+    """
+    返回IR写入的状态变量（与Slither计算node.state_variables_written的规则一致）
+
+    Args:
+        ir: SlithIR操作
+
+    Returns:
+        StateVariable: 被写入的状态变量，不写状态变量时为None
+    """
+    if not isinstance(ir, OperationWithLValue) or isinstance(ir, (Index, Member, Length)):
+        return None
+    variable = ir.lvalue
+    if isinstance(variable, ReferenceVariable):
+        variable = variable.points_to_origin
+    return variable if isinstance(variable, StateVariable) else None
+
+
+class WrittenStateAnalysis(BitsetDataflow):
+    """
+    前向may分析：到达节点时在某条路径上已经写入的状态变量
+    """
+
+    def __init__(self, function, universe=None):
+        super().__init__(function, forward=True, may=True, universe=universe)
+
+    def gen_kill(self, node):
+        # 写入不会被撤销，kill为空
+        return self.universe.bits(node.state_variables_written), 0
+
+
+def find_writes_before_calls(function, call_types=EXTERNAL_CALL_TYPES):
+    """
+    找出在某条路径上先于外部调用被写入的状态变量
+
+    Args:
+        function: Slither函数对象
+        call_types: 视为外部调用的IR类型
+
+    Returns:
+        List[WriteBeforeCall]: 按(状态变量, 被调函数)去重的结果，按逆后序中第一次出现的顺序排列
+    """
+    analysis = WrittenStateAnalysis(function)
+    if not any(isinstance(ir, call_types) for node in analysis.order for ir in node.irs):
+        return []
+    analysis.solve()
+    universe = analysis.universe
+
+    result = []
+    reported = set()
+    for node in analysis.order:
+        current = analysis.input(node)
+        for ir in node.irs:
+            if isinstance(ir, call_types):
+                callee = getattr(ir, "function", None)
+                for variable in universe.members(current):
+                    if (variable, callee) not in reported:
+                        reported.add((variable, callee))
+                        result.append(WriteBeforeCall(variable, node, ir, callee))
+            # 调用的返回值写入状态变量发生在调用之后
+            variable = state_variable_written(ir)
+            if variable is not None and variable in universe:
+                current |= universe.bit(variable)
+    return result
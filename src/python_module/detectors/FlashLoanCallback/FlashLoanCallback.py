@@ -6,10 +6,12 @@ from slither.detectors.abstract_detector import AbstractDetector, DetectorClassi
 from slither.core.declarations import Function
 from slither.core.cfg.node import NodeType
 from slither.core.variables.state_variable import StateVariable
-from slither.slithir.operations import SolidityCall, LowLevelCall, HighLevelCall, Send, Transfer
 from slither.analyses.data_dependency.data_dependency import is_tainted
+from slither_enhanced.src.python_module.analyses import (
+  DetectorBudget, ResultCache, classify_callback, find_writes_before_calls, get_function_facts,
+  get_reachability_index, truncated_result,
+)
 from typing import List, Dict, Set, Tuple
-import re
 
 class FlashLoanCallback(AbstractDetector):
   """
@@ -20,6 +22,8 @@ class FlashLoanCallback(AbstractDetector):
   """
   
   ARGUMENT = "flashloan-callback-risks"
+  # 结果缓存版本，检测逻辑或报告文本改变时提高
+  CACHE_VERSION = 1
   HELP = "检测闪电贷回调函数中的风险"
   IMPACT = DetectorClassification.HIGH
   CONFIDENCE = DetectorClassification.HIGH
@@ -67,67 +71,13 @@ contract vulnerableProtocal {
       bool: 是闪电贷回调函数就返回True,否则False
     """
     
-    # 如果函数没有签名属性，直接根据函数名判断
-    if not hasattr(function, 'signature') or function.signature is None:
-      # 检查函数名称是否包含闪电贷相关内容
-      if any(keyword in function.name.lower() for keyword in ["flashloan", "flash", "callback", "uniswap", "execute", "onflash"]):
-        return True
-      return False
+    # 已登记的协议回调（按规范化签名查表，结构体参数按函数名和参数个数匹配）
+    if classify_callback(self.compilation_unit, function) is not None:
+      return True
     
-    callback_signatures = [
-      # Uniswap V2 
-      "uniswapV2Call(address,uint256,uint256,bytes)",
-      
-      # AAVE
-      "executeOperation(address[],uint256[],uint256[],address,bytes)",
-      "executeOperation(address,uint256,uint256,address,bytes)",
-      
-      # Compound
-      "onFlashLoan(address,address,uint256,uint256,bytes)",
-      
-      # DyDx - 更新为结构体参数格式
-      "callFunction(address,tuple,bytes)",
-      "callFunction(address,(address,address,uint256,uint256),bytes)",
-      "callFunction(address,AccountInfo,bytes)",
-      
-      # Balancer
-      "receiveFlashLoan(address[],uint256[],uint256[],bytes)",
-      
-      # 1inch
-      "flashCallback(address,uint256,uint256,bytes)",
-      
-      # MakerDAO
-      "onFlashLoanTransfer(address,address,uint256,bytes)",
-      
-      # Uniswap V3
-      "uniswapV3FlashCallback(uint256,uint256,bytes)",
-      
-      # Curve
-      "callback(bytes)"
-    ]
-    
-    # 检查函数签名是否符合闪电贷回调
-    try:
-      function_sig = str(function.signature) if function.signature else ""
-      
-      # 规范化函数签名（移除空格）
-      clean_sig = re.sub(r'\s+', '', function_sig)
-      
-      for callback_sig in callback_signatures:
-        # 移除空格后进行比较
-        clean_callback = re.sub(r'\s+', '', callback_sig)
-        if clean_sig == clean_callback:
-          return True
-      
-      # 检查函数名称是否包含闪电贷相关内容
-      if any(keyword in function.name.lower() for keyword in ["flashloan", "flash", "callback", "uniswap", "execute", "onflash"]):
-        return True
-    except Exception as e:
-      # 如果发生异常，记录日志但继续执行
-      print(f"处理函数签名时出错: {e}")
-      # 降级为仅检查函数名
-      if any(keyword in function.name.lower() for keyword in ["flashloan", "flash", "callback", "uniswap", "execute", "onflash"]):
-        return True
+    # 检查函数名称是否包含闪电贷相关内容
+    if any(keyword in function.name.lower() for keyword in ["flashloan", "flash", "callback", "uniswap", "execute", "onflash"]):
+      return True
     
     return False
   
@@ -146,16 +96,15 @@ contract vulnerableProtocal {
     # 检查是否使用了重入锁
     reentrancy_modifiers = ["nonreentrant", "noreeentrant", "mutex", "lock", "reentrancyguard"]
     
-    for modifier in function.modifiers:
-      if any(lock_name in modifier.name.lower() for lock_name in reentrancy_modifiers):
+    facts = get_function_facts(self.compilation_unit, function)
+    for modifier_name in facts.modifier_names:
+      if any(lock_name in modifier_name for lock_name in reentrancy_modifiers):
         return True
     
     # 检查函数体中是否有手动实现的锁变量检查
-    for node in function.nodes:
-      if node.contains_require_or_assert():
-        req_str = str(node).lower()
-        if any(lock_term in req_str for lock_term in ["lock", "locked", "locker", "_notenter", "_notreenter"]):
-          return True
+    for req_str in facts.require_texts:
+      if any(lock_term in req_str for lock_term in ["lock", "locked", "locker", "_notenter", "_notreenter"]):
+        return True
         
     return False
   
@@ -168,43 +117,11 @@ contract vulnerableProtocal {
       function: 要检查的函数
       
     Returns:
-      List[Tuple[StateVariable, Function]]: 存在问题的(状态变量, 外部调用函数)列表
+      List[Tuple[StateVariable, Function]]: 存在问题的(状态变量, 外部调用函数)列表，
+        只包含在某条CFG路径上先写入、后调用的组合，每个组合只出现一次
     """
-    result = []
-    external_calls = []
-    state_vars_written = set()
-    
-    # 首先收集所有的外部调用
-    for node in function.nodes:
-      for ir in node.irs:
-        if isinstance(ir, (LowLevelCall, HighLevelCall, Send, Transfer)):
-          if hasattr(ir, "function"):
-            external_calls.append((node, ir.function))
-          else:
-            external_calls.append((node, None))
-    
-    # 如果没有外部调用，直接返回
-    if not external_calls:
-      return result
-    
-    # 检查每个外部调用前是否有状态变量写入
-    for node in function.nodes:
-      # 记录该节点写入的状态变量
-      for state_var in node.state_variables_written:
-        state_vars_written.add(state_var)
-      
-      # 检查该节点是否有外部调用
-      for ir in node.irs:
-        if isinstance(ir, (LowLevelCall, HighLevelCall, Send, Transfer)):
-          # 对于每个已写入的状态变量，检查是否在该外部调用之前
-          for state_var in state_vars_written:
-            # 如果有外部函数调用，且之前已经修改了状态变量
-            if hasattr(ir, "function"):
-              result.append((state_var, ir.function))
-            else:
-              result.append((state_var, None))
-    
-    return result
+    # 沿CFG的前向位集数据流，结果已按(状态变量, 被调函数)去重
+    return [(item.state_variable, item.callee) for item in find_writes_before_calls(function)]
   
   def _detect_unsafe_operations(self, function: Function) -> List[str]:
     """
@@ -218,11 +135,11 @@ contract vulnerableProtocal {
     """
     unsafe_operations = []
     
+    facts = get_function_facts(self.compilation_unit, function)
+    
     # 检查是否直接使用了msg.value
-    for node in function.nodes:
-      for ir in node.irs:
-        if isinstance(ir, SolidityCall) and "msg.value" in str(ir):
-          unsafe_operations.append(f"在闪电贷回调函数中直接使用了msg.value，可能导致资金被盗")
+    if facts.uses_msg_value:
+      unsafe_operations.append(f"在闪电贷回调函数中直接使用了msg.value，可能导致资金被盗")
     
     # 检查是否对重要状态变量进行修改
     critical_state_vars = []
@@ -232,10 +149,10 @@ contract vulnerableProtocal {
                "price", "rate", "value", "token", "fee"]):
         critical_state_vars.append(state_var)
     
-    for node in function.nodes:
-      for state_var in node.state_variables_written:
-        if state_var in critical_state_vars:
-          unsafe_operations.append(f"在闪电贷回调中修改了关键状态变量: {state_var.name}")
+    # 包括经内部辅助函数和修饰器间接写入的状态变量
+    for state_var in get_reachability_index(self.compilation_unit).reached_writes(function):
+      if state_var in critical_state_vars:
+        unsafe_operations.append(f"在闪电贷回调中修改了关键状态变量: {state_var.name}")
     
     return unsafe_operations
   
@@ -249,13 +166,59 @@ contract vulnerableProtocal {
     Returns:
       bool: 如果验证了发送者返回True，否则返回False
     """
-    for node in function.nodes:
-      if node.contains_require_or_assert():
-        req_str = str(node).lower()
-        if "msg.sender" in req_str and any(term in req_str for term in ["==", "require", "equal"]):
-          return True
+    return get_function_facts(self.compilation_unit, function).checks_msg_sender
+  
+  def _collect_risks(self, function: Function) -> List[str]:
+    """
+    收集闪电贷回调函数的全部风险
     
-    return False
+    Args:
+      function: 闪电贷回调函数
+      
+    Returns:
+      List[str]: 风险描述列表，只取决于函数、其被调函数和合约的状态布局
+    """
+    # 收集所有风险
+    risks = []
+    
+    # 1. 检查是否缺少重入保护
+    if not self._has_reentrancy_guard(function):
+      risks.append("缺少重入保护")
+    
+    # 2. 检查是否有写后调用的模式
+    write_after_calls = self._find_write_after_call(function)
+    if write_after_calls:
+      for var, call in write_after_calls:
+        call_name = call.name if call else "外部调用"
+        risks.append(f"写入状态变量 '{var.name}' 后进行了 '{call_name}' 的外部调用")
+    
+    # 经内部辅助函数间接发生的写后调用（传递可达性索引，常数时间查询）
+    reachability = get_reachability_index(self.compilation_unit)
+    if reachability.reaches_call_after_write(function):
+      reported = {var for var, _ in write_after_calls}
+      for var in reachability.writes_before_calls(function):
+        if var not in reported:
+          risks.append(f"写入状态变量 '{var.name}' 后经内部调用进行了外部调用")
+    
+    # 3. 检查是否有不安全操作
+    unsafe_ops = self._detect_unsafe_operations(function)
+    risks.extend(unsafe_ops)
+    
+    # 4. 检查是否验证了发送者
+    if not self._check_sender_validation(function):
+      risks.append("没有验证回调的发送者身份")
+    
+    # 5. 特别检查 DyDx callFunction - 特别关注状态变量修改
+    callback = classify_callback(self.compilation_unit, function)
+    if callback is not None and callback.provider == "DyDx":
+      # 检查是否修改了状态变量
+      state_vars_written = get_reachability_index(self.compilation_unit).reached_writes(function)
+      
+      if state_vars_written:
+        for var in state_vars_written:
+          risks.append(f"DyDx闪电贷回调中修改了状态变量: {var.name}")
+    
+    return risks
   
   def _detect(self) -> List:
     """
@@ -265,9 +228,17 @@ contract vulnerableProtocal {
       List: 检测结果列表
     """
     results = []
+    budget = DetectorBudget()
+    cache = ResultCache(self)
     
     for contract in self.compilation_unit.contracts:
       for function in contract.functions:
+        # 超过时间预算时停止，返回已有结果和截断标记
+        if budget.expired():
+          cache.save()
+          results.append(truncated_result(self, budget))
+          return results
+        
         # 跳过构造函数、内部函数和私有函数
         if function.is_constructor or function.visibility in ["internal", "private"]:
           continue
@@ -275,50 +246,15 @@ contract vulnerableProtocal {
         # 检查是否是闪电贷回调函数
         is_callback = self._is_flashloan_callback(function)
         
-        # 特殊处理 DyDx 的 callFunction
-        if not is_callback and function.name == "callFunction":
-          # 检查参数是否匹配 DyDx 的回调格式
-          if len(function.parameters) >= 2:
-            param_types = [str(p.type) for p in function.parameters]
-            # DyDx 回调通常有 address 和结构体参数
-            if "address" in param_types:
-              is_callback = True
-        
         if not is_callback:
           continue
         
-        # 收集所有风险
-        risks = []
-        
-        # 1. 检查是否缺少重入保护
-        if not self._has_reentrancy_guard(function):
-          risks.append("缺少重入保护")
-        
-        # 2. 检查是否有写后调用的模式
-        write_after_calls = self._find_write_after_call(function)
-        if write_after_calls:
-          for var, call in write_after_calls:
-            call_name = call.name if call else "外部调用"
-            risks.append(f"写入状态变量 '{var.name}' 后进行了 '{call_name}' 的外部调用")
-        
-        # 3. 检查是否有不安全操作
-        unsafe_ops = self._detect_unsafe_operations(function)
-        risks.extend(unsafe_ops)
-        
-        # 4. 检查是否验证了发送者
-        if not self._check_sender_validation(function):
-          risks.append("没有验证回调的发送者身份")
-        
-        # 5. 特别检查 DyDx callFunction - 特别关注状态变量修改
-        if function.name == "callFunction":
-          # 检查是否修改了状态变量
-          state_vars_written = set()
-          for node in function.nodes:
-            state_vars_written.update(node.state_variables_written)
-          
-          if state_vars_written:
-            for var in state_vars_written:
-              risks.append(f"DyDx闪电贷回调中修改了状态变量: {var.name}")
+        # 未改动的函数直接使用磁盘缓存中的风险列表
+        key = cache.key(function)
+        risks = cache.get(key)
+        if risks is None:
+          risks = self._collect_risks(function)
+          cache.put(key, risks)
         
         # 如果有任何风险，生成报告
         if risks:
@@ -334,4 +270,5 @@ contract vulnerableProtocal {
           res.add(function)
           results.append(res)
     
+    cache.save()
     return results
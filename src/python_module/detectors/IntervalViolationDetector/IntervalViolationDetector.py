@@ -1,5 +1,6 @@
 from slither.detectors.abstract_detector import AbstractDetector, DetectorClassification
-from slither_enhanced.src.python_module.interval_analysis import launch_analysis, create_analyzer
+from slither_enhanced.src.python_module.interval_analysis import IntervalAnalysisLauncher, create_analyzer, IntervalFinding
+from slither_enhanced.src.python_module.analyses import DetectorBudget, truncated_result
 import logging
 
 class IntervalViolationDetector(AbstractDetector):
@@ -63,12 +64,14 @@ function calculateExchangeRate(uint256 tokenAmount) public {
         try:
             results = []
             
-            # 启动区间分析
-            analysis_results = launch_analysis(self.compilation_unit)
+            # 启动区间分析（超过时间预算时只返回已完成函数的结果）
+            budget = DetectorBudget()
+            launcher = IntervalAnalysisLauncher(self.compilation_unit, time_budget=budget.remaining())
+            analysis_results = launcher.launch()
             
             # 处理分析结果 - 专注于一般性问题而不是DeFi特定约束
             for result in analysis_results:
-                if 'contract' in result and 'function' in result and 'violation' in result:
+                if isinstance(result, IntervalFinding):
                     # 获取违规信息
                     violation = result.get('violation', '')
                     
@@ -80,31 +83,9 @@ function calculateExchangeRate(uint256 tokenAmount) public {
                     if not self._is_general_problem(violation):
                         continue
                     
-                    # 构建检测结果
-                    contract_name = result.get('contract', 'Unknown')
-                    contract = None
-                    
-                    if hasattr(self.compilation_unit, "get_contract_from_name"):
-                        contract = self.compilation_unit.get_contract_from_name(contract_name)
-                    
-                    if not contract:
-                        continue
-                    
-                    # 处理get_contract_from_name返回列表的情况
-                    if isinstance(contract, list):
-                        if not contract:
-                            continue
-                        contract = contract[0]  # 使用第一个匹配的合约
-                        
-                    function_name = result.get('function', 'Unknown')
-                    function = None
-                    for f in contract.functions:
-                        if f.name == function_name:
-                            function = f
-                            break
-                    
-                    if not function:
-                        continue
+                    # 构建检测结果（结果直接引用合约和函数）
+                    contract_name = result['contract']
+                    function_name = result['function']
                     
                     info = [
                         f"在 {contract_name} 合约的 {function_name} 函数中，",
@@ -114,8 +95,7 @@ function calculateExchangeRate(uint256 tokenAmount) public {
                     
                     # 添加源代码位置
                     source_location = self.generate_result(info)
-                    if function:
-                        source_location.add(function)
+                    source_location.add(result.source_element)
                     
                     results.append(source_location)
                 
@@ -131,6 +111,8 @@ function calculateExchangeRate(uint256 tokenAmount) public {
                         info = [f"检测到潜在问题: {issue}\n"]
                         results.append(self.generate_result(info))
             
+            if launcher.truncated:
+                results.append(truncated_result(self, budget))
             return results
             
         except Exception as e:
@@ -11,7 +11,8 @@
 """
 
 from slither.detectors.abstract_detector import AbstractDetector, DetectorClassification
-from slither_enhanced.src.python_module.interval_analysis import launch_analysis
+from slither_enhanced.src.python_module.interval_analysis import IntervalAnalysisLauncher, IntervalFinding
+from slither_enhanced.src.python_module.analyses import DetectorBudget, truncated_result
 from slither_enhanced.src.python_module.interval_analysis.range_analysis import Interval
 
 class IntervalBasedNumericalAnomalies(AbstractDetector):
@@ -130,27 +131,9 @@ contract VulnerableContract {
             result['description'] += f"变量 {variable} 的区间为 {interval}\n"
             result['description'] += f"违规: {violation}"
             
-            # 添加元素信息（修复处理 contract_obj 的错误）
-            if hasattr(self.compilation_unit, "get_contract_from_name"):
-                try:
-                    contract_obj = self.compilation_unit.get_contract_from_name(contract)
-                    # 检查 contract_obj 是否为列表
-                    if isinstance(contract_obj, list):
-                        # 如果是列表，取第一个元素（假设是最相关的）
-                        if contract_obj and hasattr(contract_obj[0], "functions"):
-                            # 遍历所有合约中的函数
-                            for contract_item in contract_obj:
-                                function_obj = next((f for f in contract_item.functions if f.name == function), None)
-                                if function_obj:
-                                    result['elements'].append(function_obj)
-                                    break
-                    elif contract_obj and hasattr(contract_obj, "functions"):
-                        # 正常处理单个合约对象的情况
-                        function_obj = next((f for f in contract_obj.functions if f.name == function), None)
-                        if function_obj:
-                            result['elements'].append(function_obj)
-                except Exception as e:
-                    self.logger.error(f"查找合约或函数时出错: {e}")
+            # 添加元素信息（结果直接引用赋值节点或函数）
+            if isinstance(issue, IntervalFinding):
+                result['elements'].append(issue.source_element)
         
         return result
     
@@ -162,8 +145,10 @@ contract VulnerableContract {
             list: 检测结果列表
         """
         try:
-            # 使用增强的区间分析获取所有结果
-            raw_results = launch_analysis(self.compilation_unit)
+            # 使用增强的区间分析获取所有结果（超过时间预算时只返回已完成函数的结果）
+            budget = DetectorBudget()
+            launcher = IntervalAnalysisLauncher(self.compilation_unit, time_budget=budget.remaining())
+            raw_results = launcher.launch()
             
             # 过滤出高可信度问题
             high_confidence_issues = [issue for issue in raw_results if self._is_high_confidence_issue(issue)]
@@ -187,6 +172,8 @@ contract VulnerableContract {
                     import traceback
                     traceback.print_exc()
             
+            if launcher.truncated:
+                formatted_results.append(truncated_result(self, budget))
             return formatted_results
         except Exception as e:
             self.logger.error(f"区间分析执行出错: {e}")
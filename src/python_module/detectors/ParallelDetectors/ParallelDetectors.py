@@ -0,0 +1,150 @@
+"""
+增强检测器并行协调器 (Parallel Enhanced Detectors)
+
+Slither按顺序运行插件检测器，六个增强检测器的耗时相互叠加，而它们只读取编译单元。
+本检测器在解析完成后fork一个进程池，子进程以写时复制的方式共享已解析的编译单元，
+各自运行一个增强检测器，把结果序列化为Slither的标准结果字典传回父进程。
+
+使用方式（按需启用）：
+    slither yourfile.sol --detect enhanced-parallel
+
+只选择本检测器时并行运行全部增强检测器；如果某个增强检测器也被单独注册
+（例如默认运行全部检测器），它会由Slither自己运行，协调器跳过它以免结果重复。
+不支持fork的平台上退回到进程内顺序执行。
+"""
+
+import logging
+import multiprocessing
+import os
+import traceback
+
+from slither.detectors.abstract_detector import AbstractDetector, DetectorClassification
+
+logger = logging.getLogger("ParallelEnhancedDetectors")
+
+# 工作进程数的环境变量，默认取CPU核数与检测器个数中的较小值
+WORKERS_ENVIRONMENT_VARIABLE = "SLITHER_ENHANCED_WORKERS"
+
+# fork前设置，子进程继承：(编译单元, Slither实例, 检测器日志, [检测器类])
+_WORK = None
+
+
+def enhanced_detectors():
+    """
+    返回插件提供的增强检测器类（不含协调器本身）
+
+    Returns:
+        list: 检测器类列表
+    """
+    from slither_enhanced.src.python_module.detectors.UncheckedTokenBalanceChange import UncheckedBalanceChangeDetector
+    from slither_enhanced.src.python_module.detectors.UnboundedFlashLoanRisk import UnboundedFlashLoanRisk
+    from slither_enhanced.src.python_module.detectors.IntervalViolationDetector.IntervalViolationDetector import IntervalViolationDetector
+    from slither_enhanced.src.python_module.detectors.NumericalAnomalies.numerical_anomalies import IntervalBasedNumericalAnomalies
+    from slither_enhanced.src.python_module.interval_analysis.range_analysis import DeFiRangeViolationDetector
+    from slither_enhanced.src.python_module.detectors.FlashLoanCallback import FlashLoanCallback
+
+    return [
+        UncheckedBalanceChangeDetector,
+        UnboundedFlashLoanRisk,
+        IntervalViolationDetector,
+        IntervalBasedNumericalAnomalies,
+        DeFiRangeViolationDetector,
+        FlashLoanCallback,
+    ]
+
+
+def _run_detector(index):
+    """
+    在工作进程中运行一个检测器
+
+    Args:
+        index: 检测器在 _WORK 中的下标
+
+    Returns:
+        tuple: (检测器参数名, [结果字典], 错误信息或None)
+    """
+    compilation_unit, slither, detector_logger, detector_classes = _WORK
+    detector_class = detector_classes[index]
+    try:
+        detector = detector_class(compilation_unit, slither, detector_logger)
+        if not detector._is_applicable_detector():
+            return detector_class.ARGUMENT, [], None
+        return detector_class.ARGUMENT, [output.data for output in detector._detect()], None
+    except Exception:
+        return detector_class.ARGUMENT, [], traceback.format_exc()
+
+
+class _SerializedResult:
+    """
+    工作进程传回的结果：AbstractDetector.detect 只读取 data 属性
+    """
+
+    def __init__(self, data):
+        self.data = data
+
+
+class ParallelEnhancedDetectors(AbstractDetector):
+    """
+    并行运行增强检测器的协调器
+    """
+
+    ARGUMENT = 'enhanced-parallel'
+    HELP = '并行运行全部增强检测器（按需启用）'
+    IMPACT = DetectorClassification.INFORMATIONAL
+    CONFIDENCE = DetectorClassification.HIGH
+
+    WIKI = 'https://github.com/your-repo/wiki/enhanced-parallel'
+    WIKI_TITLE = '增强检测器并行协调器'
+    WIKI_DESCRIPTION = '在fork出的进程池中并行运行增强检测器，结果按各检测器原有的格式输出'
+    WIKI_EXPLOIT_SCENARIO = '不适用'
+    WIKI_RECOMMENDATION = '不适用'
+
+    def _pending_detectors(self):
+        """
+        返回需要由协调器运行的检测器类：已被Slither单独注册的检测器不重复运行
+        """
+        # 按ARGUMENT比较：插件可能经不同的包路径导入同一个检测器，类对象不相同
+        registered = {detector.ARGUMENT for detector in self.slither.detectors}
+        return [cls for cls in enhanced_detectors() if cls.ARGUMENT not in registered]
+
+    def _worker_count(self, tasks):
+        try:
+            workers = int(os.environ.get(WORKERS_ENVIRONMENT_VARIABLE, "0"))
+        except ValueError:
+            workers = 0
+        if workers <= 0:
+            workers = os.cpu_count() or 1
+        return max(1, min(workers, tasks))
+
+    def _detect(self):
+        """
+        并行运行检测器并收集结果
+
+        Returns:
+            list: 各检测器的结果（保留原检测器的check、impact、confidence字段）
+        """
+        global _WORK
+        detector_classes = self._pending_detectors()
+        if not detector_classes:
+            return []
+
+        _WORK = (self.compilation_unit, self.slither, self.logger, detector_classes)
+        try:
+            indexes = range(len(detector_classes))
+            workers = self._worker_count(len(detector_classes))
+            if workers > 1 and "fork" in multiprocessing.get_all_start_methods():
+                # fork之后子进程共享父进程已解析的编译单元（写时复制），只有结果字典需要序列化
+                with multiprocessing.get_context("fork").Pool(processes=workers) as pool:
+                    outcomes = pool.map(_run_detector, indexes, chunksize=1)
+            else:
+                outcomes = [_run_detector(index) for index in indexes]
+        finally:
+            _WORK = None
+
+        results = []
+        for argument, data, error in outcomes:
+            if error is not None:
+                logger.error(f"检测器 {argument} 执行出错:\n{error}")
+                continue
+            results.extend(_SerializedResult(item) for item in data)
+        return results
@@ -0,0 +1,6 @@
+"""
+增强检测器并行协调器
+"""
+from .ParallelDetectors import ParallelEnhancedDetectors
+
+__all__ = ['ParallelEnhancedDetectors']
@@ -1,7 +1,10 @@
 from slither.detectors.abstract_detector import AbstractDetector, DetectorClassification
 from slither.core.declarations import Function
-from slither.analyses.data_dependency.data_dependency import is_tainted
-from slither.slithir.operations import Call
+from slither.core.solidity_types import ArrayType, ElementaryType, MappingType
+from slither.core.solidity_types.elementary_type import Int, Uint
+from slither_enhanced.src.python_module.analyses import (
+    DetectorBudget, ResultCache, classify_callback, get_reachability_index, get_taint_summary, truncated_result,
+)
 
 class UnboundedFlashLoanRisk(AbstractDetector):
     """
@@ -9,6 +12,8 @@ class UnboundedFlashLoanRisk(AbstractDetector):
     """
 
     ARGUMENT = 'unbounded-flashloan-risk'
+    # Bump when the detection logic changes to invalidate cached per-function results
+    CACHE_VERSION = 1
     HELP = 'Unbounded state changes after flash loan callbacks'
     IMPACT = DetectorClassification.HIGH
     CONFIDENCE = DetectorClassification.MEDIUM
@@ -29,32 +34,53 @@ class UnboundedFlashLoanRisk(AbstractDetector):
     )
 
     def _is_flash_loan_callback(self, function: Function) -> bool:
-        """Check if function is a flash loan callback (e.g., Uniswap, Aave)."""
-        flash_loan_sigs = [
-            "uniswapV2Call(address,uint256,uint256,bytes)",
-            "executeOperation(address[],uint256[],uint256[],address,bytes)"
-        ]
-        return function.signature in flash_loan_sigs
+        """Check if function is a flash loan callback registered for a known provider (Uniswap, Aave, Balancer, ...)."""
+        return classify_callback(self.compilation_unit, function) is not None
+
+    @staticmethod
+    def _is_bounded_type(var_type) -> bool:
+        """Integers (directly or as mapping/array values) are unbounded; bool, address, bytes and enums are not."""
+        while isinstance(var_type, (MappingType, ArrayType)):
+            var_type = var_type.type_to if isinstance(var_type, MappingType) else var_type.type
+        if isinstance(var_type, ElementaryType):
+            return var_type.name not in Int + Uint
+        return True
 
     def _has_unbounded_state_change(self, function: Function) -> bool:
-        """Check for unbounded state modifications using interval analysis."""
-        for ir in function.slithir_operations:
-            if isinstance(ir, Call) and ir.function:
-                # Check if internal calls modify state without bounds
-                for var in ir.function.modified_state_variables:
-                    if not var.type.is_bounded and is_tainted(var, function):
-                        return True
+        """Check for unbounded state modifications reachable from the callback's inputs."""
+        # State variables depending on the callback parameters, computed once per callback
+        tainted = get_taint_summary(self.compilation_unit, function)
+        if not tainted:
+            return False
+        # State written by the callback itself or by any helper it reaches (transitive reachability index)
+        for var in get_reachability_index(self.compilation_unit).reached_writes(function):
+            if var in tainted and not self._is_bounded_type(var.type):
+                return True
         return False
 
     def _detect(self):
         results = []
+        budget = DetectorBudget()
+        cache = ResultCache(self)
         for contract in self.compilation_unit.contracts_derived:
             for function in contract.functions:
+                # Out of time: keep what was found so far and mark the output as truncated
+                if budget.expired():
+                    cache.save()
+                    results.append(truncated_result(self, budget))
+                    return results
                 if self._is_flash_loan_callback(function):
-                    if self._has_unbounded_state_change(function):
+                    # Unchanged functions reuse the verdict from the on-disk cache
+                    key = cache.key(function)
+                    unbounded = cache.get(key)
+                    if unbounded is None:
+                        unbounded = self._has_unbounded_state_change(function)
+                        cache.put(key, unbounded)
+                    if unbounded:
                         info = [
                             f"Function {function.full_name} in contract {contract.name} ",
                             "handles a flash loan callback with unbounded state changes.\n"
                         ]
                         results.append(self.generate_result(info))
+        cache.save()
         return results
@@ -1,13 +1,14 @@
 from slither.detectors.abstract_detector import AbstractDetector, DetectorClassification
-from slither.slithir.operations import Assignment, Binary, Condition
 from slither.core.declarations import Contract
-from slither.analyses.data_dependency.data_dependency import is_dependent
+from slither_enhanced.src.python_module.analyses import DetectorBudget, GuardIndex, ResultCache, get_function_facts, truncated_result
 
 class UncheckedBalanceChangeDetector(AbstractDetector):
     ARGUMENT = "unchecked-balance-change"
     HELP = "Detects unchecked changes to token balances"
     IMPACT = DetectorClassification.HIGH
     CONFIDENCE = DetectorClassification.MEDIUM
+    # Bump when the detection logic changes to invalidate cached per-function results
+    CACHE_VERSION = 2
 
     WIKI = "https://github.com/your-repo/wiki/unchecked-balance-change"
     WIKI_TITLE = "Unchecked Token Balance Change"
@@ -15,40 +16,64 @@ class UncheckedBalanceChangeDetector(AbstractDetector):
     WIKI_EXPLOIT_SCENARIO = "A function increases `balances[msg.sender]` without verifying funds."
     WIKI_RECOMMENDATION = "Add require() checks before modifying balances."
 
+    @staticmethod
+    def _written_balance(ir, balance_vars):
+        """Return the balance variable written by an assignment, or None."""
+        lvalue = ir.lvalue
+        origin = getattr(lvalue, "points_to_origin", None)
+        if origin in balance_vars:
+            return origin
+        for var in balance_vars:
+            if lvalue.name.startswith(var.name):
+                return var
+        return None
+
+    def _count_unchecked_changes(self, function, balance_vars):
+        """Count the assignments to balance variables that no guard checks on every path."""
+        facts = get_function_facts(self.compilation_unit, function)
+        guards = None
+        unchecked = 0
+        # Check for assignments to balance variables
+        for node, ir in facts.assignments:
+            balance = self._written_balance(ir, balance_vars)
+            if balance is None:
+                continue
+            # Only a guard on the written mapping itself, on every path to the assignment, counts as a check
+            if guards is None:
+                guards = GuardIndex(function, balance_vars)
+            if not guards.is_guarded(node, {balance}):
+                unchecked += 1
+        return unchecked
+
     def _detect(self):
         results = []
-        # Iterate over all contracts
-        for contract in self.slither.contracts:
+        budget = DetectorBudget()
+        cache = ResultCache(self)
+        # Only derived contracts: inherited functions are analyzed once, through the most derived contract
+        for contract in self.compilation_unit.contracts_derived:
             # Look for balance-like mappings in state variables
-            balance_vars = [v for v in contract.state_variables if "mapping(address=>uint256)" in str(v.type)]
+            balance_vars = [v for v in contract.state_variables if "mapping(address=>uint256)" in str(v.type).replace(" ", "")]
             if not balance_vars:
                 continue
 
             # Analyze each function
             for function in contract.functions:
-                for node in function.nodes:
-                    # Check for assignments to balance variables
-                    for ir in node.irs:
-                        if isinstance(ir, Assignment):
-                            # Check if left-hand side is a balance variable reference
-                            if any(ir.lvalue.name.startswith(var.name) for var in balance_vars):
-                                # Look for preceding conditions guarding this assignment
-                                has_check = False
-                                for parent_node in node.function.nodes:
-                                    if parent_node == node:
-                                        break
-                                    for parent_ir in parent_node.irs:
-                                        if isinstance(parent_ir, Condition):
-                                            # Check if condition depends on the balance variable
-                                            if any(is_dependent(parent_ir.expression, var, contract) for var in balance_vars):
-                                                has_check = True
-                                                break
-                                    if has_check:
-                                        break
-                                if not has_check:
-                                    info = [f"Unchecked balance change in {function.name} ({contract.name})\n"]
-                                    results.append(self.generate_result(info))
+                # Out of time: keep what was found so far and mark the output as truncated
+                if budget.expired():
+                    cache.save()
+                    results.append(truncated_result(self, budget))
+                    return results
+                # Unchanged functions reuse the count from the on-disk cache
+                key = cache.key(function)
+                unchecked = cache.get(key)
+                if unchecked is None:
+                    unchecked = self._count_unchecked_changes(function, balance_vars)
+                    cache.put(key, unchecked)
+                for _ in range(unchecked):
+                    info = [f"Unchecked balance change in {function.name} ({contract.name})\n"]
+                    results.append(self.generate_result(info))
 
+        cache.save()
         return results
 
 # Register the detector
@@ -1,4 +1,6 @@
 from .range_analysis import IntervalAnalysisLauncher, DeFiRangeAnalyzer, Interval, DeFiRangeViolationDetector
+from .range_analysis import ANALYSIS_TIERS, DEFAULT_TIER
+from .findings import IntervalFinding, IntervalIssue
 import json
 import logging
 
@@ -6,42 +8,63 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("IntervalAnalysis")
 
-def create_analyzer(compilation_unit):
+def create_analyzer(compilation_unit, tier=None):
     """
     创建区间分析器实例
     
     Args:
         compilation_unit: Slither编译单元对象
+        tier: 分析档位（0/1/2），为None时由环境变量INTERVAL_ANALYSIS_TIER或默认档位决定
         
     Returns:
         DeFiRangeAnalyzer: 区间分析器实例
     """
-    return DeFiRangeAnalyzer(compilation_unit)
+    return DeFiRangeAnalyzer(compilation_unit, tier=tier)
 
-def launch_analysis(compilation_unit):
+def launch_analysis(compilation_unit, tier=None, time_budget=None):
     """
     启动区间分析
     
     Args:
         compilation_unit: Slither编译单元对象
+        tier: 分析档位（0/1/2），为None时由环境变量INTERVAL_ANALYSIS_TIER或默认档位决定
+        time_budget: 分析时间预算（秒），超时后返回已完成函数的结果，为None时不限时
         
     Returns:
         list: 分析结果列表
     """
-    launcher = IntervalAnalysisLauncher(compilation_unit)
+    launcher = IntervalAnalysisLauncher(compilation_unit, tier=tier, time_budget=time_budget)
     return launcher.launch()
 
-def get_analysis_summary(compilation_unit):
+def iter_findings(compilation_unit, tier=None, time_budget=None):
+    """
+    启动区间分析，逐个产出结果
+    
+    每个函数分析完成后立即产出其违规结果，适合在分析进行中把结果写入队列或文件
+    
+    Args:
+        compilation_unit: Slither编译单元对象
+        tier: 分析档位（0/1/2），为None时由环境变量INTERVAL_ANALYSIS_TIER或默认档位决定
+        time_budget: 分析时间预算（秒），超时后停止产出，为None时不限时
+        
+    Yields:
+        IntervalFinding或IntervalIssue: 违规结果，或潜在问题
+    """
+    launcher = IntervalAnalysisLauncher(compilation_unit, tier=tier, time_budget=time_budget)
+    yield from launcher.iter_findings()
+
+def get_analysis_summary(compilation_unit, tier=None):
     """
     获取区间分析摘要
     
     Args:
         compilation_unit: Slither编译单元对象
+        tier: 分析档位（0/1/2），为None时由环境变量INTERVAL_ANALYSIS_TIER或默认档位决定
         
     Returns:
         dict: 函数区间分析摘要
     """
-    launcher = IntervalAnalysisLauncher(compilation_unit)
+    launcher = IntervalAnalysisLauncher(compilation_unit, tier=tier)
     launcher.launch()
     return launcher.get_summary()
 
@@ -98,7 +121,9 @@ def analyze_file(file_path, output_json=None, summary=False):
         # 输出JSON
         if output_json:
             with open(output_json, 'w') as f:
-                json.dump(results, f, indent=4, default=str)
+                # 违规结果（IntervalFinding）转换为字符串字典
+                serializable = results if summary else [dict(result) for result in results]
+                json.dump(serializable, f, indent=4, default=str)
             logger.info(f"分析结果已保存到: {output_json}")
         
         return results
@@ -114,9 +139,14 @@ __all__ = [
     'IntervalAnalysisLauncher', 
     'DeFiRangeAnalyzer', 
     'Interval',
+    'IntervalFinding',
+    'IntervalIssue',
+    'ANALYSIS_TIERS',
+    'DEFAULT_TIER',
     'DeFiRangeViolationDetector',
     'create_analyzer', 
     'launch_analysis',
+    'iter_findings',
     'get_analysis_summary',
     'analyze_file',
     'get_compilation_unit'
@@ -0,0 +1,107 @@
+"""
+基本块合并模块 (Basic Block Coalescing)
+
+Slither的CFG节点大致对应一条语句，工作列表如果按节点调度，
+每条语句都要单独入队、保存状态快照和检测状态变化。
+本模块把单入口单出口的最长节点链合并为基本块：
+1. 块内节点按顺序执行，前一个节点只有一个后继，后一个节点只有一个前驱
+2. 循环头（IFLOOP）、多前驱节点和函数入口只能作为块的第一个节点
+3. 死边不参与合并，不可达节点不属于任何块
+
+分析器以块为单位调度，块内依次应用各节点的转移函数，只在块边界保存状态。
+"""
+
+from slither.core.cfg.node import NodeType
+
+
+class BasicBlock:
+    """
+    基本块：按执行顺序排列的单入口单出口节点链
+    """
+
+    def __init__(self, nodes):
+        """
+        初始化基本块
+
+        Args:
+            nodes: 按执行顺序排列的节点列表
+        """
+        self.nodes = nodes
+        self.sons = []  # 后继块（与块尾节点的活跃出边一一对应）
+
+    @property
+    def head(self):
+        """
+        块的第一个节点
+        """
+        return self.nodes[0]
+
+    @property
+    def tail(self):
+        """
+        块的最后一个节点，块的所有出边都从这里发出
+        """
+        return self.nodes[-1]
+
+    def __repr__(self):
+        return f"BasicBlock({[node.node_id for node in self.nodes]})"
+
+
+def build_basic_blocks(function, excluded=None, dead_edges=None, coalesce=True):
+    """
+    把函数的CFG节点合并为基本块
+
+    Args:
+        function: Slither函数对象
+        excluded: 不参与分析的节点集合（如不可达节点）
+        dead_edges: 不会执行的CFG边集合 {(节点, 后继节点)}
+        coalesce: 为False时不合并，每个节点单独成块
+
+    Returns:
+        list: 按函数节点顺序排列的基本块列表
+    """
+    excluded = excluded or set()
+    dead_edges = dead_edges or set()
+    nodes = [node for node in function.nodes if node not in excluded]
+
+    def live_sons(node):
+        return [son for son in node.sons if son not in excluded and (node, son) not in dead_edges]
+
+    def live_fathers(node):
+        return [father for father in node.fathers if father not in excluded and (father, node) not in dead_edges]
+
+    def starts_block(node):
+        if not coalesce or node is function.entry_point or node.type == NodeType.IFLOOP:
+            return True
+        fathers = live_fathers(node)
+        return len(fathers) != 1 or len(live_sons(fathers[0])) != 1
+
+    # 从每个块首节点沿唯一后继延伸，直到遇到下一个块首节点
+    blocks = []
+    block_of = {}
+    for node in nodes:
+        if not starts_block(node):
+            continue
+        chain = [node]
+        block_of[node] = None
+        sons = live_sons(node)
+        while len(sons) == 1 and not starts_block(sons[0]) and sons[0] not in block_of:
+            chain.append(sons[0])
+            block_of[sons[0]] = None
+            sons = live_sons(sons[0])
+        block = BasicBlock(chain)
+        for member in chain:
+            block_of[member] = block
+        blocks.append(block)
+
+    # 只由不可达的环构成的节点没有块首，每个节点单独成块
+    for node in nodes:
+        if node not in block_of:
+            block = BasicBlock([node])
+            block_of[node] = block
+            blocks.append(block)
+
+    for block in blocks:
+        block.sons = [block_of[son] for son in live_sons(block.tail)]
+
+    return blocks
@@ -22,7 +22,7 @@ sys.path.append(str(ROOT_DIR))
 # 修复Slither导入
 try:
     from slither.slither import Slither
-    from slither_enhanced.src.python_module.interval_analysis import create_analyzer, launch_analysis
+    from slither_enhanced.src.python_module.interval_analysis import create_analyzer, launch_analysis, IntervalAnalysisLauncher
 except ImportError:
     print("无法导入Slither或区间分析模块。请确保正确安装。")
     sys.exit(1)
@@ -38,8 +38,12 @@ def parse_args():
     parser = argparse.ArgumentParser(description='使用区间分析工具分析智能合约')
     parser.add_argument('filename', help='要分析的Solidity文件/项目')
     parser.add_argument('--json', metavar='FILE', help='将结果以JSON格式保存到指定文件')
+    parser.add_argument('--jsonl', metavar='FILE', help='每分析完一个函数就把结果逐行写入JSONL文件（"-"表示标准输出）')
     parser.add_argument('--summary', action='store_true', help='只输出摘要')
     parser.add_argument('--debug', action='store_true', help='启用调试输出')
+    parser.add_argument('--tier', type=int, choices=[0, 1, 2], default=None,
+                        help='分析档位：0=单遍快速扫描，1=过程内分析，2=完整的过程间不动点（默认2，也可用环境变量INTERVAL_ANALYSIS_TIER设置）')
+    parser.add_argument('--stats', action='store_true', help='输出分析统计信息（迭代轮数、节点处理次数、加宽次数）')
     parser.add_argument('--solc-remaps', help='Solidity编译器重映射，用";"分隔', default="")
     return parser.parse_args()
 
@@ -100,6 +104,35 @@ def process_results(results, summary=False):
                 print(f"\n[{colored('全局问题', 'cyan')}]")
                 print(f"  {colored(issue, 'red')}")
 
+def write_jsonl(findings, path):
+    """
+    把结果逐行写入JSONL文件，每行写入后立即刷新
+    
+    Args:
+        findings: 结果迭代器（见IntervalAnalysisLauncher.iter_findings）
+        path: 输出文件路径，"-"表示标准输出
+        
+    Returns:
+        int: 写入的结果数
+    """
+    output = sys.stdout if path == '-' else open(path, 'w', encoding='utf-8')
+    count = 0
+    try:
+        for finding in findings:
+            output.write(json.dumps(dict(finding), ensure_ascii=False, default=str) + "\n")
+            output.flush()
+            count += 1
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    return count
+
+def print_statistics(statistics, file=None):
+    """打印分析统计信息"""
+    print("\n===== 区间分析统计 =====", file=file)
+    for key, value in statistics.items():
+        print(f"  {key}: {value}", file=file)
+
 def main():
     """主函数"""
     args = parse_args()
@@ -126,18 +159,32 @@ def main():
             compilation_unit = slither
         
         # 运行区间分析
-        results = launch_analysis(compilation_unit)
+        launcher = IntervalAnalysisLauncher(compilation_unit, tier=args.tier)
+        
+        if args.jsonl:
+            # 流式输出：边分析边写入
+            count = write_jsonl(launcher.iter_findings(), args.jsonl)
+            logger.info(f"已写入 {count} 条结果")
+            if args.stats:
+                # 结果写到标准输出时，统计信息写到标准错误，不混入JSONL
+                print_statistics(launcher.get_statistics(), file=sys.stderr if args.jsonl == '-' else None)
+            return 0
+        
+        results = launcher.launch()
         
         # 处理结果
         if args.json:
             # 保存JSON结果
             with open(args.json, 'w') as f:
-                json.dump(results, f, indent=4, default=str)
+                json.dump([dict(result) for result in results], f, indent=4, default=str)
             print(f"分析结果已保存到: {args.json}")
         else:
             # 显示格式化结果
             process_results(results, args.summary)
         
+        if args.stats:
+            print_statistics(launcher.get_statistics())
+        
         return 0
         
     except Exception as e:
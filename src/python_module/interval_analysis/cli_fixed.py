@@ -112,7 +112,7 @@ def main():
         # 导出JSON结果
         if args.json:
             with open(args.json, 'w') as f:
-                json.dump(results, f, indent=4)
+                json.dump([dict(result) for result in results], f, indent=4)
             logger.info(f"结果已保存到: {args.json}")
         
     except Exception as e:
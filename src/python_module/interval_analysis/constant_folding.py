@@ -0,0 +1,300 @@
+"""
+常量折叠预处理模块 (Constant Folding Pre-pass)
+
+在不动点迭代开始之前对函数的IR做一遍预处理：
+1. 折叠操作数全部为常量的二元运算和类型转换（如 `10**18`、`1e18 * 2`），
+   结果写入临时变量；SlithIR中临时变量只被赋值一次，因此折叠结果与程序点无关
+2. 常量状态变量（`uint constant WAD = 1e18`）直接使用其折叠后的值
+3. 条件为常量的IF/IFLOOP节点，把不会执行的出边标记为死边，
+   并计算从入口节点出发经过活边不可达的节点
+
+分析器据此跳过已折叠的运算和不可达节点，缩小实际参与迭代的CFG。
+"""
+
+from slither.core.cfg.node import NodeType
+from slither.core.variables.state_variable import StateVariable
+from slither.slithir.operations import Binary, Condition, TypeConversion
+from slither.slithir.operations.binary import BinaryType
+from slither.slithir.variables import Constant, TemporaryVariable
+from slither.visitors.expression.constants_folding import ConstantFolding, NotConstant
+import re
+
+# 折叠结果允许的取值范围，超出范围的运算不折叠，交给区间运算处理
+_MIN_VALUE = -(2**255)
+_MAX_VALUE = 2**256 - 1
+
+
+class FoldedFunction:
+    """
+    函数的常量折叠结果
+    """
+
+    def __init__(self):
+        """
+        初始化空的折叠结果
+        """
+        self.values = {}  # 折叠得到的变量值 {临时变量或常量状态变量: 整数值}
+        self.folded_irs = {}  # 已折叠的IR {IR: 整数值}
+        self.dead_edges = set()  # 条件为常量时不会执行的出边 {(节点, 后继节点)}
+        self.unreachable = set()  # 经过活边从入口不可达的节点
+
+    def is_dead_edge(self, node, son):
+        """
+        判断CFG边是否为死边
+
+        Args:
+            node: 源节点
+            son: 目标节点
+
+        Returns:
+            bool: 是死边时返回True
+        """
+        return (node, son) in self.dead_edges
+
+
+def fold_function(function):
+    """
+    对函数执行常量折叠和死分支剪枝
+
+    Args:
+        function: Slither函数对象
+
+    Returns:
+        FoldedFunction: 折叠结果
+    """
+    result = FoldedFunction()
+
+    # 临时变量可能在后面的节点中定义（如三元表达式），重复扫描直到没有新的折叠结果
+    # 函数读取的常量状态变量（如 `_status = _ENTERED`）直接使用其值
+    for node in function.nodes:
+        for ir in node.irs:
+            for variable in ir.read:
+                if isinstance(variable, StateVariable) and variable.is_constant:
+                    _operand_value(variable, result.values)
+
+    changed = True
+    while changed:
+        changed = False
+        for node in function.nodes:
+            for ir in node.irs:
+                if ir in result.folded_irs:
+                    continue
+                value = _fold_ir(ir, result.values)
+                if value is not None:
+                    result.folded_irs[ir] = value
+                    result.values[ir.lvalue] = value
+                    changed = True
+
+    # 条件为常量的分支节点：标记不会执行的出边
+    for node in function.nodes:
+        if node.type not in (NodeType.IF, NodeType.IFLOOP):
+            continue
+        condition = next((ir for ir in node.irs if isinstance(ir, Condition)), None)
+        if condition is None:
+            continue
+        value = _operand_value(condition.value, result.values)
+        if value is None:
+            continue
+        dead_son = node.son_false if value else node.son_true
+        if dead_son is not None:
+            result.dead_edges.add((node, dead_son))
+
+    if result.dead_edges and function.entry_point is not None:
+        reachable = {function.entry_point}
+        stack = [function.entry_point]
+        while stack:
+            node = stack.pop()
+            for son in node.sons:
+                if son not in reachable and not result.is_dead_edge(node, son):
+                    reachable.add(son)
+                    stack.append(son)
+        result.unreachable = {node for node in function.nodes if node not in reachable}
+
+    return result
+
+
+def _fold_ir(ir, values):
+    """
+    尝试折叠单条IR
+
+    Args:
+        ir: Slither中间表示指令
+        values: 已折叠的变量值
+
+    Returns:
+        int or None: 折叠结果，无法折叠时返回None
+    """
+    if not isinstance(getattr(ir, "lvalue", None), TemporaryVariable):
+        return None
+
+    if isinstance(ir, Binary):
+        left = _operand_value(ir.variable_left, values)
+        right = _operand_value(ir.variable_right, values)
+        if left is None or right is None:
+            return None
+        return _evaluate(ir.type, left, right)
+
+    if isinstance(ir, TypeConversion):
+        value = _operand_value(ir.variable, values)
+        bounds = _integer_bounds(ir.type)
+        if value is None or bounds is None:
+            return None
+        # 类型转换会截断超出范围的值，这里只折叠不发生截断的情况
+        if bounds[0] <= value <= bounds[1]:
+            return value
+        return None
+
+    return None
+
+
+def _operand_value(operand, values):
+    """
+    获取操作数的常量值
+
+    Args:
+        operand: IR操作数
+        values: 已折叠的变量值
+
+    Returns:
+        int or None: 常量值，非常量时返回None
+    """
+    if isinstance(operand, Constant):
+        return _literal_value(operand.value)
+    if operand in values:
+        return values[operand]
+    if isinstance(operand, StateVariable) and operand.is_constant:
+        value = state_variable_value(operand)
+        if value is not None:
+            values[operand] = value
+        return value
+    return None
+
+
+def state_variable_value(variable):
+    """
+    计算状态变量声明中初始化表达式的常量值
+
+    用于常量状态变量，也用于计算普通状态变量部署时的初始值
+
+    Args:
+        variable: 状态变量
+
+    Returns:
+        int or None: 整数值，无法计算时返回None
+    """
+    if variable.expression is None or (_integer_bounds(variable.type) is None and str(variable.type) != "bool"):
+        return None
+    try:
+        literal = ConstantFolding(variable.expression, variable.type).result()
+    except (NotConstant, KeyError, ValueError, TypeError, AttributeError):
+        return None
+    value = literal.value
+    if isinstance(value, str) and value in ("true", "false"):
+        return int(value == "true")
+    return _literal_value(value)
+
+
+def _literal_value(value):
+    """
+    把常量值解析为整数
+
+    Args:
+        value: 常量值（bool、int或十进制/十六进制字符串）
+
+    Returns:
+        int or None: 整数值，无法解析时返回None
+    """
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str):
+        try:
+            return int(value, 16) if value.startswith("0x") else int(value)
+        except ValueError:
+            return None
+    return None
+
+
+def _integer_bounds(var_type):
+    """
+    获取整数类型的取值边界
+
+    Args:
+        var_type: 变量类型
+
+    Returns:
+        tuple or None: (最小值, 最大值)，非整数类型返回None
+    """
+    match = re.fullmatch(r"(u?)int(\d*)", str(var_type).lower())
+    if not match:
+        return None
+    bits = int(match.group(2)) if match.group(2) else 256
+    if match.group(1):
+        return (0, 2**bits - 1)
+    return (-(2**(bits-1)), 2**(bits-1) - 1)
+
+
+def _evaluate(op_type, left, right):
+    """
+    计算常量二元运算
+
+    Args:
+        op_type: 运算类型（BinaryType）
+        left: 左操作数
+        right: 右操作数
+
+    Returns:
+        int or None: 运算结果，结果不确定（除零、溢出、超大幂）时返回None
+    """
+    if op_type == BinaryType.ADDITION:
+        value = left + right
+    elif op_type == BinaryType.SUBTRACTION:
+        value = left - right
+    elif op_type == BinaryType.MULTIPLICATION:
+        value = left * right
+    elif op_type in (BinaryType.DIVISION, BinaryType.MODULO):
+        if right == 0:
+            return None
+        # Solidity的整数除法向零取整
+        quotient = abs(left) // abs(right)
+        if (left < 0) != (right < 0):
+            quotient = -quotient
+        value = quotient if op_type == BinaryType.DIVISION else left - quotient * right
+    elif op_type == BinaryType.POWER:
+        # 指数过大时结果必然超出范围，避免计算巨大的整数
+        if right < 0 or (abs(left) > 1 and right > 256):
+            return None
+        value = left ** right
+    elif op_type in (BinaryType.LEFT_SHIFT, BinaryType.RIGHT_SHIFT):
+        if right < 0 or right > 256:
+            return None
+        value = left << right if op_type == BinaryType.LEFT_SHIFT else left >> right
+    elif op_type == BinaryType.AND:
+        value = left & right
+    elif op_type == BinaryType.OR:
+        value = left | right
+    elif op_type == BinaryType.CARET:
+        value = left ^ right
+    elif op_type == BinaryType.LESS:
+        value = int(left < right)
+    elif op_type == BinaryType.LESS_EQUAL:
+        value = int(left <= right)
+    elif op_type == BinaryType.GREATER:
+        value = int(left > right)
+    elif op_type == BinaryType.GREATER_EQUAL:
+        value = int(left >= right)
+    elif op_type == BinaryType.EQUAL:
+        value = int(left == right)
+    elif op_type == BinaryType.NOT_EQUAL:
+        value = int(left != right)
+    elif op_type == BinaryType.ANDAND:
+        value = int(bool(left) and bool(right))
+    elif op_type == BinaryType.OROR:
+        value = int(bool(left) or bool(right))
+    else:
+        return None
+
+    if value < _MIN_VALUE or value > _MAX_VALUE:
+        return None
+    return value
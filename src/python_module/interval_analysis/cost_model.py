@@ -0,0 +1,228 @@
+"""
+分析代价模型 (Analysis Cost Model)
+
+固定的加宽阈值和迭代上限既不适合几行的getter，也不适合四百个节点的清算函数。
+本模块从函数的廉价特征预测分析耗时和工作列表迭代轮数：
+1. 节点数、IR数
+2. 循环嵌套深度
+3. 调用数（内部调用、库调用和外部调用）
+4. 被赋值的变量数（近似跟踪状态的大小）
+
+预测采用线性模型，系数保存在 data/cost_model.json，
+由 scripts/fit_cost_model.py 在基准合约集上测量并用最小二乘拟合。
+分析器根据预测结果为每个函数选择加宽阈值、迭代上限和分析档位，
+调度时也可以按预测耗时从小到大排列函数。
+"""
+
+from slither.core.cfg.node import NodeType
+import json
+import logging
+import math
+import os
+
+logger = logging.getLogger("IntervalAnalysis")
+
+# 系数文件
+COST_MODEL_PATH = os.path.join(os.path.dirname(__file__), "data", "cost_model.json")
+
+# 特征名，与系数文件中的顺序一致
+FEATURE_NAMES = ("nodes", "irs", "loop_depth", "calls", "variables")
+
+
+class FunctionFeatures:
+    """
+    函数的代价特征
+    """
+
+    def __init__(self, nodes, irs, loop_depth, calls, variables):
+        """
+        初始化特征
+
+        Args:
+            nodes: CFG节点数
+            irs: IR指令数
+            loop_depth: 最大循环嵌套深度
+            calls: 调用数
+            variables: 被赋值的变量数（含参数）
+        """
+        self.nodes = nodes
+        self.irs = irs
+        self.loop_depth = loop_depth
+        self.calls = calls
+        self.variables = variables
+
+    def as_vector(self):
+        """
+        按FEATURE_NAMES的顺序返回特征值
+
+        Returns:
+            list: 特征值列表
+        """
+        return [getattr(self, name) for name in FEATURE_NAMES]
+
+    def __repr__(self):
+        return "FunctionFeatures(" + ", ".join(f"{name}={getattr(self, name)}" for name in FEATURE_NAMES) + ")"
+
+
+def extract_features(function):
+    """
+    提取函数的代价特征（一次遍历节点和IR）
+
+    Args:
+        function: Slither函数对象
+
+    Returns:
+        FunctionFeatures: 函数特征
+    """
+    irs = 0
+    calls = 0
+    variables = set(function.parameters)
+    depth = 0
+    max_depth = 0
+    for node in function.nodes:
+        # Slither按源码顺序生成节点，STARTLOOP/ENDLOOP成对出现
+        if node.type == NodeType.STARTLOOP:
+            depth += 1
+            max_depth = max(max_depth, depth)
+        elif node.type == NodeType.ENDLOOP:
+            depth = max(depth - 1, 0)
+        for ir in node.irs:
+            irs += 1
+            if hasattr(ir, "function") and hasattr(ir, "arguments"):
+                calls += 1
+            lvalue = getattr(ir, "lvalue", None)
+            if lvalue is not None:
+                variables.add(lvalue)
+    return FunctionFeatures(len(function.nodes), irs, max_depth, calls, len(variables))
+
+
+class CostModel:
+    """
+    线性代价模型：预测值 = 截距 + Σ 系数 × 特征
+    """
+
+    def __init__(self, path=COST_MODEL_PATH):
+        """
+        加载系数文件
+
+        Args:
+            path: 系数文件路径
+        """
+        self.path = path
+        self.fitted = False
+        self._coefficients = {
+            "seconds": {"intercept": 0.0, **{name: 0.0 for name in FEATURE_NAMES}},
+            "iterations": {"intercept": 1.0, **{name: 0.0 for name in FEATURE_NAMES}},
+        }
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.fitted = bool(data.get("fitted", False))
+            for target in self._coefficients:
+                self._coefficients[target].update(data.get(target, {}))
+        except (OSError, ValueError) as e:
+            logger.warning(f"无法加载代价模型系数 {path}: {e}")
+
+    def _predict(self, target, features):
+        coefficients = self._coefficients[target]
+        value = coefficients["intercept"]
+        for name, feature in zip(FEATURE_NAMES, features.as_vector()):
+            value += coefficients[name] * feature
+        return max(value, 0.0)
+
+    def predict_seconds(self, features):
+        """
+        预测完整分析（2档）的耗时
+
+        Args:
+            features: 函数特征
+
+        Returns:
+            float: 预测耗时（秒）
+        """
+        return self._predict("seconds", features)
+
+    def predict_iterations(self, features):
+        """
+        预测工作列表迭代轮数
+
+        Args:
+            features: 函数特征
+
+        Returns:
+            float: 预测迭代轮数
+        """
+        return self._predict("iterations", features)
+
+    def choose_parameters(self, features, tier, time_budget, max_iterations):
+        """
+        为函数选择分析参数
+
+        策略：
+        1. 迭代上限取预测轮数的两倍（不超过50），但不低于配置的上限，只放宽不收紧；单遍扫描（0档）不调整
+        2. 没有循环的函数不需要加宽，保持默认阈值；预测耗时超过预算一半的函数第一次回到循环头就加宽
+        3. 预测耗时超过预算时降一档，超过预算十倍时降到0档；只降档，不升档
+
+        Args:
+            features: 函数特征
+            tier: 当前配置的分析档位
+            time_budget: 单个函数的耗时预算（秒）
+            max_iterations: 当前配置的迭代上限
+
+        Returns:
+            dict: {"tier": 档位, "_max_iterations": 迭代上限, "_widening_threshold": 加宽阈值（可选）}
+        """
+        seconds = self.predict_seconds(features)
+        chosen_tier = tier
+        if seconds > 10 * time_budget:
+            chosen_tier = 0
+        elif seconds > time_budget:
+            chosen_tier = max(tier - 1, 0)
+        chosen_tier = min(chosen_tier, tier)
+
+        parameters = {"tier": chosen_tier}
+        if chosen_tier == 0:
+            return parameters
+        iterations = self.predict_iterations(features)
+        parameters["_max_iterations"] = max(min(int(math.ceil(2 * iterations)), 50), max_iterations)
+        if features.loop_depth > 0 and seconds > time_budget / 2:
+            parameters["_widening_threshold"] = 1
+        return parameters
+
+
+def fit_coefficients(samples):
+    """
+    用最小二乘拟合代价模型的系数
+
+    Args:
+        samples: [(FunctionFeatures, 耗时秒数, 迭代轮数)]
+
+    Returns:
+        dict: {"seconds": {...}, "iterations": {...}}，可直接写入系数文件
+    """
+    import numpy as np
+
+    matrix = np.array([[1.0] + [float(value) for value in features.as_vector()] for features, _, _ in samples])
+    result = {}
+    for target, column in (("seconds", 1), ("iterations", 2)):
+        observed = np.array([float(sample[column]) for sample in samples])
+        solution, _, _, _ = np.linalg.lstsq(matrix, observed, rcond=None)
+        result[target] = {"intercept": float(solution[0])}
+        result[target].update({name: float(value) for name, value in zip(FEATURE_NAMES, solution[1:])})
+    return result
+
+
+_COST_MODEL = None
+
+
+def get_cost_model():
+    """
+    获取共享的代价模型实例（系数文件只加载一次）
+
+    Returns:
+        CostModel: 代价模型
+    """
+    global _COST_MODEL
+    if _COST_MODEL is None:
+        _COST_MODEL = CostModel()
+    return _COST_MODEL
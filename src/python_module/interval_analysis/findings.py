@@ -0,0 +1,142 @@
+"""
+区间分析结果 (Interval Findings)
+
+分析器的每条违规结果和潜在问题直接引用合约、函数和相关的CFG节点，
+检测器不必再按名称查找合约并线性扫描函数列表（同名重载函数也不会解析错）。
+变量名和区间的字符串在第一次访问时才生成。
+
+结果同时实现只读映射接口，保留原来的字典键
+（contract、function、variable、violation、interval），
+潜在问题只有issue键。已有的 `result['violation']`、`result.get(...)`、`'contract' in result` 写法不受影响；
+需要序列化时用 `dict(result)` 或 `to_dict()`。
+"""
+
+from collections.abc import Mapping
+
+# 映射接口暴露的键（与原来的结果字典一致）
+_KEYS = ("contract", "function", "variable", "violation", "interval")
+
+
+class IntervalFinding(Mapping):
+    """
+    单条区间违规结果
+    """
+
+    def __init__(self, contract, function, variable, violation, interval, node=None):
+        """
+        初始化违规结果
+
+        Args:
+            contract: 发现违规的Slither合约对象
+            function: 发现违规的Slither函数对象
+            variable: 违规的变量对象
+            violation: 违规描述
+            interval: 变量的区间（Interval）
+            node: 最后一次为该变量赋值的CFG节点，未知时为None
+        """
+        self.contract_object = contract
+        self.function_object = function
+        self.variable_object = variable
+        self.violation = violation
+        self.interval_object = interval
+        self.node = node
+        self._rendered = {}  # 已生成的字符串 {键: 字符串}
+
+    @property
+    def source_element(self):
+        """
+        用于附加源码位置的元素：优先使用节点，没有节点时使用函数
+        """
+        return self.node if self.node is not None else self.function_object
+
+    def _render(self, key):
+        """
+        生成键对应的字符串
+        """
+        if key == "contract":
+            return self.contract_object.name
+        if key == "function":
+            return self.function_object.name
+        if key == "variable":
+            return str(self.variable_object)
+        if key == "violation":
+            return self.violation
+        return str(self.interval_object)
+
+    def __getitem__(self, key):
+        if key not in _KEYS:
+            raise KeyError(key)
+        if key not in self._rendered:
+            self._rendered[key] = self._render(key)
+        return self._rendered[key]
+
+    def __iter__(self):
+        return iter(_KEYS)
+
+    def __len__(self):
+        return len(_KEYS)
+
+    def to_dict(self):
+        """
+        转换为只包含字符串的字典，用于JSON序列化
+
+        Returns:
+            dict: {contract, function, variable, violation, interval}
+        """
+        return dict(self)
+
+    def __repr__(self):
+        return f"IntervalFinding({self.to_dict()})"
+
+
+class IntervalIssue(Mapping):
+    """
+    单条潜在问题（溢出、下溢、除零风险等）
+    """
+
+    def __init__(self, contract, function, issue, node=None, variable=None):
+        """
+        初始化潜在问题
+
+        Args:
+            contract: 发现问题的Slither合约对象
+            function: 发现问题的Slither函数对象
+            issue: 问题描述
+            node: 发现问题的CFG节点，未知时为None
+            variable: 发现问题的运算的结果变量，未知时为None
+        """
+        self.contract_object = contract
+        self.function_object = function
+        self.issue = issue
+        self.node = node
+        self.variable_object = variable
+
+    @property
+    def source_element(self):
+        """
+        用于附加源码位置的元素：优先使用节点，没有节点时使用函数
+        """
+        return self.node if self.node is not None else self.function_object
+
+    def __getitem__(self, key):
+        if key != "issue":
+            raise KeyError(key)
+        return self.issue
+
+    def __iter__(self):
+        return iter(("issue",))
+
+    def __len__(self):
+        return 1
+
+    def to_dict(self):
+        """
+        转换为字典，用于JSON序列化
+
+        Returns:
+            dict: {issue}
+        """
+        return dict(self)
+
+    def __repr__(self):
+        return f"IntervalIssue({self.issue!r})"
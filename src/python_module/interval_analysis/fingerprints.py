@@ -0,0 +1,271 @@
+"""
+函数指纹模块 (Function Fingerprints)
+
+被审计的项目中大量函数体是逐字复制的：同一份OpenZeppelin代码被多个合约继承，
+同一个合约文件被多个编译单元引入，fork出来的协议几乎原样保留上游的函数。
+本模块计算两种基于IR的规范化指纹：
+
+1. ir_fingerprint：只依赖函数体本身。参数按位置、其他变量按首次出现的顺序重命名，
+   字符串常量统一替换，用于匹配不同项目内置的同一份库代码（见library_summaries）
+2. function_fingerprint：规范指纹。保留参数、局部变量和状态变量的名称和类型
+   （分析器根据名称识别DeFi关键变量），状态变量附带其在合约存储布局中的位置；
+   被调用的内部函数、库函数和修饰器的规范指纹递归计入。
+   规范指纹相同的两个函数在相同的入口状态下分析结果相同
+"""
+
+from slither.core.declarations import Function
+from slither.core.variables.local_variable import LocalVariable
+from slither.core.variables.state_variable import StateVariable
+from slither.slithir.variables import Constant
+from slither.core.solidity_types import ElementaryType
+import hashlib
+
+# 规范指纹的计算方式，改变时加一：按旧指纹保存的磁盘结果缓存（见analyses.result_cache）随之失效
+FINGERPRINT_SCHEME = 2
+
+
+def _ir_lines(function, operand, callee_name):
+    """
+    生成函数CFG和IR的规范化文本
+
+    Args:
+        function: Slither函数对象
+        operand: 把IR操作数转换为文本的函数
+        callee_name: 把被调函数转换为文本的函数
+
+    Returns:
+        list: 每个节点和每条IR一行
+    """
+    node_index = {node: index for index, node in enumerate(function.nodes)}
+
+    parts = []
+    for node in function.nodes:
+        sons = ",".join(str(node_index[son]) for son in node.sons if son in node_index)
+        parts.append(f"N{node_index[node]}:{node.type.name}:{sons}")
+        for ir in node.irs:
+            fields = [type(ir).__name__]
+            # 运算类型（Binary的运算符、TypeConversion的目标类型等）
+            ir_type = getattr(ir, "type", None)
+            if ir_type is not None:
+                fields.append(str(getattr(ir_type, "value", ir_type)))
+            callee = getattr(ir, "function", None)
+            if callee is not None:
+                fields.append(callee_name(callee))
+            fields.append(operand(getattr(ir, "lvalue", None)))
+            fields.extend(operand(value) for value in ir.read)
+            parts.append(" ".join(fields))
+    return parts
+
+
+def _constant_text(value):
+    """
+    常量操作数的规范化文本：字符串常量（错误信息）统一替换
+    """
+    if isinstance(value.type, ElementaryType) and str(value.type) == "string":
+        return "C:string"
+    return f"C:{value.value}"
+
+
+def _digest(parts):
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+
+def ir_fingerprint(function):
+    """
+    计算函数IR的规范化指纹
+
+    节点按函数中的顺序编号；参数按位置、其他变量按首次出现的顺序重命名；
+    字符串常量（错误信息）统一替换，因此不同版本中只有错误信息不同的实现指纹相同
+
+    Args:
+        function: Slither函数对象
+
+    Returns:
+        str: 十六进制SHA-256指纹
+    """
+    names = {param: f"P{index}" for index, param in enumerate(function.parameters)}
+
+    def operand(value):
+        if isinstance(value, (list, tuple)):
+            return "(" + ",".join(operand(item) for item in value) + ")"
+        if isinstance(value, Constant):
+            return _constant_text(value)
+        if value is None:
+            return "_"
+        if value not in names:
+            names[value] = f"V{len(names)}"
+        return names[value]
+
+    def callee_name(callee):
+        return getattr(callee, "full_name", None) or getattr(callee, "name", str(callee))
+
+    return _digest(_ir_lines(function, operand, callee_name))
+
+
+class FunctionFingerprinter:
+    """
+    规范指纹计算器
+
+    每个函数的指纹只计算一次；被调函数的指纹在计算调用者时一并计算并缓存。
+    调用图按强连通分量计算：相互递归的函数作为一个整体，分量内的调用记为SCC:函数名，
+    每个成员的指纹包含自身和分量内全部成员的规范文本。
+    这样指纹与计算顺序无关，递归伙伴的函数体不同时指纹也不同
+    """
+
+    def __init__(self):
+        """
+        初始化空的指纹缓存
+        """
+        self._cache = {}  # {函数对象: 规范指纹}
+
+    def fingerprint(self, function):
+        """
+        计算函数的规范指纹
+
+        Args:
+            function: Slither函数对象
+
+        Returns:
+            str: 十六进制SHA-256指纹
+        """
+        if function not in self._cache:
+            self._ensure(function)
+        return self._cache[function]
+
+    @staticmethod
+    def _callees(function):
+        """
+        有实现的被调函数和修饰器（调用图的边）
+        """
+        callees = []
+        for node in function.nodes:
+            for ir in node.irs:
+                callee = getattr(ir, "function", None)
+                if isinstance(callee, Function) and callee.nodes:
+                    callees.append(callee)
+        for modifier in getattr(function, "modifiers", []):
+            if isinstance(modifier, Function) and modifier.nodes:
+                callees.append(modifier)
+        return callees
+
+    def _ensure(self, function):
+        """
+        计算函数及其全部被调函数的指纹（迭代式Tarjan，被调函数所在的分量先计算）
+        """
+        index = {function: 0}
+        low = {function: 0}
+        stack = [function]
+        on_stack = {function}
+        work = [(function, iter(self._callees(function)))]
+        while work:
+            caller, callees = work[-1]
+            for callee in callees:
+                if callee in self._cache:
+                    continue
+                if callee not in index:
+                    index[callee] = low[callee] = len(index)
+                    stack.append(callee)
+                    on_stack.add(callee)
+                    work.append((callee, iter(self._callees(callee))))
+                    break
+                if callee in on_stack:
+                    low[caller] = min(low[caller], index[callee])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[caller])
+                if low[caller] == index[caller]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member is caller:
+                            break
+                    self._fingerprint_component(component)
+
+    def _fingerprint_component(self, component):
+        """
+        计算一个强连通分量中各成员的指纹（分量外的被调函数已经有指纹）
+        """
+        texts = {member: _digest(self._canonical_parts(member, component)) for member in component}
+        if len(component) == 1:
+            self._cache[component[0]] = texts[component[0]]
+            return
+        members = sorted(texts.values())
+        for member in component:
+            self._cache[member] = _digest([texts[member], "SCC"] + members)
+
+    def _canonical_parts(self, function, component):
+        """
+        函数自身的规范化文本，分量内的调用不展开
+        """
+        names = {}
+        layout = self._storage_layout(getattr(function, "contract", None))
+
+        def operand(value):
+            if isinstance(value, (list, tuple)):
+                return "(" + ",".join(operand(item) for item in value) + ")"
+            if isinstance(value, Constant):
+                return _constant_text(value)
+            if value is None:
+                return "_"
+            if isinstance(value, StateVariable):
+                # 状态变量：名称、类型和存储布局中的位置
+                return f"S{layout.get(value, '?')}:{value.name}:{value.type}"
+            if isinstance(value, LocalVariable):
+                return f"L:{value.name}:{value.type}"
+            # 临时变量、引用变量等按首次出现的顺序重命名
+            if value not in names:
+                names[value] = f"T{len(names)}"
+            return names[value]
+
+        def callee_name(callee):
+            # 有实现的函数使用其规范指纹，其他函数使用签名
+            name = getattr(callee, "full_name", None) or getattr(callee, "name", str(callee))
+            if not isinstance(callee, Function) or not callee.nodes:
+                return name
+            if callee in component:
+                return f"SCC:{name}"
+            return f"{name}#{self._cache[callee]}"
+
+        parts = [f"V:{FINGERPRINT_SCHEME}", f"F:{function.full_name}"]
+        parts.extend(f"P:{param.name}:{param.type}" for param in function.parameters)
+        parts.extend(f"R:{ret.name}:{ret.type}" for ret in function.returns)
+        # 修饰器的摘要在调用处应用，修饰器体计入指纹
+        for modifier in getattr(function, "modifiers", []):
+            parts.append(f"M:{callee_name(modifier)}")
+        parts.extend(_ir_lines(function, operand, callee_name))
+        return parts
+
+    @staticmethod
+    def _storage_layout(contract):
+        """
+        计算合约状态变量在存储布局中的位置
+
+        Args:
+            contract: Slither合约对象
+
+        Returns:
+            dict: {状态变量: 序号}
+        """
+        if contract is None:
+            return {}
+        variables = getattr(contract, "state_variables_ordered", None)
+        if variables is None:
+            variables = getattr(contract, "state_variables", [])
+        return {var: index for index, var in enumerate(variables)}
+
+
+def function_fingerprint(function):
+    """
+    计算单个函数的规范指纹（不共享缓存）
+
+    Args:
+        function: Slither函数对象
+
+    Returns:
+        str: 十六进制SHA-256指纹
+    """
+    return FunctionFingerprinter().fingerprint(function)
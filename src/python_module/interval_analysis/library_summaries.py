@@ -0,0 +1,231 @@
+"""
+常用库函数摘要数据库 (Library Summary Database)
+
+几乎每个被审计的项目都内置了相同的OpenZeppelin SafeMath、Math、SafeCast，
+Uniswap FullMath以及ERC20实现。本模块提供预先编写的区间摘要表
+（data/library_summaries.json），调用这些库函数时直接用摘要计算返回值区间，
+不再分析库函数本身。
+
+匹配方式（按优先级）：
+1. 指纹匹配：函数IR的规范化哈希与表中记录的指纹一致。指纹只依赖CFG结构、
+   IR操作类型和规范化后的操作数，与变量名、错误信息和编译器版本无关。
+   随仓库发布的数据库还没有指纹（各表项的fingerprints为空），这一步要等生成指纹后才起作用
+2. 签名匹配：函数属于库合约，库名（去掉Upgradeable后缀）和函数签名与表项一致；
+   标记为contract的表项（ERC20实现）也可以匹配同名的普通合约
+3. 接口匹配：函数没有实现（接口或外部合约），签名与接口表项一致
+
+只有指纹匹配能确认函数就是表中的库代码。签名匹配和接口匹配只凭名称，
+得到的区间只作参考：分析器使用返回值区间，但不因为checked表项跳过溢出检查
+（用户自己写的SafeMath、名为ERC20的任意合约都会按名称匹配）。
+
+数据库在第一次查询时才加载。指纹（见fingerprints.ir_fingerprint）需要用 scripts/build_library_summaries.py 从库源码生成。
+"""
+
+from .fingerprints import ir_fingerprint
+import json
+import logging
+import math
+import os
+
+logger = logging.getLogger("IntervalAnalysis")
+
+# 摘要数据库文件
+DATABASE_PATH = os.path.join(os.path.dirname(__file__), "data", "library_summaries.json")
+
+_UINT256_MAX = 2**256 - 1
+
+
+def _library_name(contract):
+    """
+    规范化库名：去掉OpenZeppelin可升级版本的Upgradeable后缀
+    """
+    name = contract.name
+    if name.endswith("Upgradeable"):
+        name = name[:-len("Upgradeable")]
+    return name
+
+
+class LibrarySummaryDatabase:
+    """
+    库函数摘要数据库
+
+    数据库文件在第一次查询时加载，每个函数的匹配结果会被缓存
+    """
+
+    def __init__(self, path=DATABASE_PATH):
+        """
+        初始化数据库
+
+        Args:
+            path: 摘要数据库文件路径
+        """
+        self._path = path
+        self._loaded = False
+        self.version = None
+        self._by_fingerprint = {}  # {指纹: 表项}
+        self._by_signature = {}  # {(库名, 函数签名): 表项}
+        self._by_interface = {}  # {函数签名: 表项}
+        self._cache = {}  # {函数对象: (表项或None, 是否指纹匹配)}
+
+    def _load(self):
+        """
+        加载数据库文件并建立索引
+        """
+        self._loaded = True
+        try:
+            with open(self._path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"无法加载库函数摘要数据库 {self._path}: {e}")
+            return
+
+        self.version = data.get("version")
+        for entry in data.get("summaries", []):
+            for fingerprint in entry.get("fingerprints", []):
+                self._by_fingerprint[fingerprint] = entry
+            for signature in entry.get("signatures", []):
+                if entry.get("match") == "interface":
+                    self._by_interface[signature] = entry
+                else:
+                    self._by_signature[(entry["library"], signature)] = entry
+
+    def lookup(self, function):
+        """
+        查找函数的摘要
+
+        Args:
+            function: Slither函数对象
+
+        Returns:
+            dict or None: 数据库表项，没有匹配时返回None
+        """
+        return self.match(function)[0]
+
+    def match(self, function):
+        """
+        查找函数的摘要，并说明是否按指纹匹配
+
+        Args:
+            function: Slither函数对象
+
+        Returns:
+            tuple: (表项或None, 是否指纹匹配)；只按名称和签名匹配时第二项为False
+        """
+        if function in self._cache:
+            return self._cache[function]
+        if not self._loaded:
+            self._load()
+
+        entry = None
+        exact = False
+        contract = getattr(function, "contract", None)
+        full_name = getattr(function, "full_name", None)
+        if getattr(function, "nodes", None):
+            # 数据库没有指纹时不必计算函数的指纹
+            if self._by_fingerprint:
+                entry = self._by_fingerprint.get(ir_fingerprint(function))
+                exact = entry is not None
+            if entry is None and contract is not None:
+                entry = self._by_signature.get((_library_name(contract), full_name))
+                # 签名匹配只用于库合约；标记为contract的表项（如ERC20实现）也可以匹配普通合约
+                if entry is not None and not getattr(contract, "is_library", False) and entry.get("match") != "contract":
+                    entry = None
+        elif full_name is not None:
+            entry = self._by_interface.get(full_name)
+
+        self._cache[function] = (entry, exact)
+        return entry, exact
+
+
+def apply_summary(entry, arguments):
+    """
+    根据摘要计算返回值区间
+
+    Args:
+        entry: 数据库表项
+        arguments: 各参数的区间边界列表 [(min, max) 或 None]，None表示区间未知
+
+    Returns:
+        tuple or None: 返回值区间边界 (min, max)，无法计算时返回None
+    """
+    kind = entry["kind"]
+
+    if kind == "range":
+        return (entry.get("min", 0), 2**entry["max_bits"] - 1 if "max_bits" in entry else entry["max"])
+
+    needed = entry.get("arity", 2)
+    if len(arguments) < needed or any(argument is None for argument in arguments[:needed]):
+        return None
+    if any(bound is None or isinstance(bound, float) for argument in arguments[:needed] for bound in argument):
+        return None
+
+    (a_min, a_max) = arguments[0]
+    (b_min, b_max) = arguments[1] if needed >= 2 else (None, None)
+
+    if kind == "checked_add":
+        # 溢出时回滚，结果不超过uint256上限
+        result = (a_min + b_min, min(a_max + b_max, _UINT256_MAX))
+    elif kind == "checked_sub":
+        # 下溢时回滚，结果非负
+        result = (max(a_min - b_max, 0), a_max - b_min)
+    elif kind == "checked_mul":
+        result = (a_min * b_min, min(a_max * b_max, _UINT256_MAX))
+    elif kind == "checked_div":
+        # 除数为0时回滚
+        if b_max < 1:
+            return None
+        result = (a_min // b_max, a_max // max(b_min, 1))
+    elif kind == "checked_mod":
+        if b_max < 1:
+            return None
+        result = (0, min(a_max, b_max - 1))
+    elif kind == "min":
+        result = (min(a_min, b_min), min(a_max, b_max))
+    elif kind == "max":
+        result = (max(a_min, b_min), max(a_max, b_max))
+    elif kind == "average":
+        result = ((a_min + b_min) // 2, (a_max + b_max) // 2)
+    elif kind == "ceil_div":
+        if b_max < 1:
+            return None
+        result = (-(-a_min // b_max), -(-a_max // max(b_min, 1)))
+    elif kind == "sqrt":
+        result = (math.isqrt(max(a_min, 0)), math.isqrt(max(a_max, 0)))
+    elif kind in ("mul_div", "mul_div_up"):
+        # (a * b) / d，中间结果不会溢出，最终结果超过uint256时回滚
+        (d_min, d_max) = arguments[2]
+        if d_max < 1:
+            return None
+        if kind == "mul_div":
+            result = (a_min * b_min // d_max, a_max * b_max // max(d_min, 1))
+        else:
+            result = (-(-a_min * b_min // d_max), -(-a_max * b_max // max(d_min, 1)))
+        result = (result[0], min(result[1], _UINT256_MAX))
+    elif kind == "cast":
+        # 超出目标类型范围时回滚
+        bits = entry["bits"]
+        low, high = (-(2**(bits - 1)), 2**(bits - 1) - 1) if entry.get("signed") else (0, 2**bits - 1)
+        result = (max(a_min, low), min(a_max, high))
+    else:
+        return None
+
+    if result[0] > result[1]:
+        # 所有输入都会回滚
+        return None
+    return result
+
+
+_DATABASE = None
+
+
+def get_summary_database():
+    """
+    获取共享的摘要数据库实例（数据库文件在第一次查询时加载）
+
+    Returns:
+        LibrarySummaryDatabase: 摘要数据库
+    """
+    global _DATABASE
+    if _DATABASE is None:
+        _DATABASE = LibrarySummaryDatabase()
+    return _DATABASE
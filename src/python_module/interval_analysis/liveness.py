@@ -0,0 +1,108 @@
+"""
+临时变量活跃性分析模块 (Temporary Liveness)
+
+SlithIR为每个子表达式生成临时变量（TMP_n）和引用变量（REF_n），
+它们通常只在一两条语句内使用，但一旦进入分析器的跟踪状态就会一直保留到函数结束，
+此后的每次状态快照、变化检测和加宽都要为它们付出代价。
+
+本模块在基本块上做后向活跃性分析，计算每个块出口处仍然活跃的临时变量和引用变量。
+分析器在处理完一个块后，把不再活跃的临时变量和引用变量移出跟踪状态。
+"""
+
+from slither.slithir.variables import ReferenceVariable, TemporaryVariable
+
+
+def is_prunable(variable):
+    """
+    判断变量是否可以在死亡后移出跟踪状态
+
+    Args:
+        variable: 变量对象
+
+    Returns:
+        bool: 是临时变量或引用变量时返回True
+    """
+    return isinstance(variable, (TemporaryVariable, ReferenceVariable))
+
+
+def compute_live_out(blocks):
+    """
+    计算每个基本块出口处活跃的临时变量和引用变量
+
+    Args:
+        blocks: 基本块列表（见basic_blocks.build_basic_blocks）
+
+    Returns:
+        dict: {基本块: 出口处活跃变量的frozenset}
+    """
+    uses = {}
+    defs = {}
+    for block in blocks:
+        uses[block], defs[block] = _block_uses_defs(block)
+
+    # 后向迭代：live_in = use ∪ (live_out - def)，live_out = 所有后继的live_in之并
+    fathers = {block: [] for block in blocks}
+    for block in blocks:
+        for son in block.sons:
+            fathers[son].append(block)
+
+    live_in = {block: frozenset(uses[block]) for block in blocks}
+    live_out = {block: frozenset() for block in blocks}
+    worklist = list(blocks)
+    pending = set(worklist)
+    while worklist:
+        block = worklist.pop()
+        pending.discard(block)
+        out = frozenset().union(*(live_in[son] for son in block.sons))
+        live_out[block] = out
+        new_in = uses[block] | (out - defs[block])
+        if new_in != live_in[block]:
+            live_in[block] = frozenset(new_in)
+            for father in fathers[block]:
+                if father not in pending:
+                    pending.add(father)
+                    worklist.append(father)
+
+    return live_out
+
+
+def _block_uses_defs(block):
+    """
+    计算基本块向上暴露的使用和定义
+
+    Args:
+        block: 基本块
+
+    Returns:
+        tuple: (先使用后定义的变量集合, 块中定义的变量集合)
+    """
+    uses = set()
+    defs = set()
+    for node in block.nodes:
+        for ir in node.irs:
+            for variable in _flatten(ir.read):
+                if is_prunable(variable) and variable not in defs:
+                    uses.add(variable)
+            lvalue = getattr(ir, "lvalue", None)
+            if is_prunable(lvalue):
+                defs.add(lvalue)
+    return uses, defs
+
+
+def _flatten(values):
+    """
+    展开IR读取列表中嵌套的列表（如元组返回值）
+
+    Args:
+        values: IR的read列表
+
+    Returns:
+        list: 展开后的变量列表
+    """
+    result = []
+    for value in values:
+        if isinstance(value, (list, tuple)):
+            result.extend(_flatten(value))
+        else:
+            result.append(value)
+    return result
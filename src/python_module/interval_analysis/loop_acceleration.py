@@ -0,0 +1,247 @@
+"""
+计数循环加速模块 (Counted Loop Acceleration)
+
+识别形如 `for (uint i = 0; i < len; i++)` 的简单计数循环：
+1. 循环头是Slither的IFLOOP节点，且直接由STARTLOOP节点进入
+2. 循环条件是归纳变量与循环不变量（常量或循环体内不被写入的变量）的比较
+3. 归纳变量在循环体中只被写入一次，且写入形式为 i = i ± 常量
+
+对这类循环，循环头处归纳变量的区间可以直接用闭式计算，
+不需要经过多轮迭代和加宽。不支持的循环形状不会被识别，由分析器按普通方式迭代。
+"""
+
+from slither.core.cfg.node import NodeType
+from slither.core.variables.local_variable import LocalVariable
+from slither.slithir.operations import Binary, Assignment, Condition
+from slither.slithir.operations.binary import BinaryType
+from slither.slithir.variables import Constant
+
+# 归纳变量出现在比较右侧时，翻转运算符使其位于左侧
+_FLIPPED_COMPARISONS = {
+    BinaryType.LESS: BinaryType.GREATER,
+    BinaryType.LESS_EQUAL: BinaryType.GREATER_EQUAL,
+    BinaryType.GREATER: BinaryType.LESS,
+    BinaryType.GREATER_EQUAL: BinaryType.LESS_EQUAL,
+}
+
+
+class CountedLoop:
+    """
+    计数循环描述
+
+    记录循环头、归纳变量、步长、循环条件和循环体节点，
+    并提供循环头处归纳变量区间的闭式计算
+    """
+
+    def __init__(self, head, variable, stride, comparison, bound, body, back_edge_sources):
+        """
+        初始化计数循环描述
+
+        Args:
+            head: 循环头节点（IFLOOP）
+            variable: 归纳变量
+            stride: 每次迭代的步长（负数表示递减）
+            comparison: 归纳变量位于左侧时的比较运算类型（BinaryType）
+            bound: 循环边界（常量或循环不变量）
+            body: 循环体节点集合（包含循环头）
+            back_edge_sources: 回边的源节点列表
+        """
+        self.head = head
+        self.variable = variable
+        self.stride = stride
+        self.comparison = comparison
+        self.bound = bound
+        self.body = body
+        self.back_edge_sources = back_edge_sources
+        # 循环体中写入的其他变量，回边处需要对它们加宽
+        self.written = set()
+        for node in body:
+            for ir in node.irs:
+                lvalue = getattr(ir, "lvalue", None)
+                if lvalue is not None and lvalue != variable:
+                    self.written.add(lvalue)
+
+    def head_interval(self, init, bound):
+        """
+        闭式计算循环头处归纳变量的区间
+
+        以递增循环 `i < n` 为例：归纳变量从初值开始每次增加步长，
+        最后一次进入循环体时 i <= n-1，因此退出时 i <= n-1+步长。
+        循环头处的区间就是初值与退出值构成的区间
+
+        Args:
+            init: 进入循环时归纳变量的区间边界 (min, max)
+            bound: 循环边界的区间边界 (min, max)
+
+        Returns:
+            tuple: 循环头处归纳变量的区间边界 (min, max)
+        """
+        init_min, init_max = init
+        bound_min, bound_max = bound
+
+        if self.stride > 0:
+            if self.comparison == BinaryType.LESS:
+                last = bound_max - 1 + self.stride
+            else:
+                last = bound_max + self.stride
+            return (init_min, max(init_max, last))
+
+        if self.comparison == BinaryType.GREATER:
+            last = bound_min + 1 + self.stride
+        else:
+            last = bound_min + self.stride
+        return (min(init_min, last), init_max)
+
+
+def find_counted_loops(function):
+    """
+    识别函数中的所有计数循环
+
+    Args:
+        function: Slither函数对象
+
+    Returns:
+        dict: {循环头节点: CountedLoop}
+    """
+    loops = {}
+    for node in function.nodes:
+        if node.type == NodeType.IFLOOP:
+            loop = _match_counted_loop(node)
+            if loop is not None:
+                loops[node] = loop
+    return loops
+
+
+def _loop_body(head):
+    """
+    计算以head为循环头的自然循环
+
+    从回边源节点沿前驱反向遍历直到循环头。如果遍历到了进入循环的
+    STARTLOOP节点，说明不是以head为头的自然循环（例如do-while）
+
+    Args:
+        head: IFLOOP节点
+
+    Returns:
+        tuple or None: (循环体节点集合, 回边源节点列表)
+    """
+    starts = [father for father in head.fathers if father.type == NodeType.STARTLOOP]
+    if len(starts) != 1:
+        return None
+
+    back_edge_sources = [father for father in head.fathers if father.type != NodeType.STARTLOOP]
+    if not back_edge_sources:
+        return None
+
+    body = {head}
+    stack = list(back_edge_sources)
+    while stack:
+        node = stack.pop()
+        if node in body:
+            continue
+        if node is starts[0]:
+            return None
+        body.add(node)
+        stack.extend(node.fathers)
+
+    return body, back_edge_sources
+
+
+def _loop_guard(head):
+    """
+    获取循环头的比较运算
+
+    Args:
+        head: IFLOOP节点
+
+    Returns:
+        Binary or None: 结果作为循环条件的比较运算
+    """
+    condition_values = [ir.value for ir in head.irs if isinstance(ir, Condition)]
+    for ir in head.irs:
+        if isinstance(ir, Binary) and ir.lvalue in condition_values:
+            return ir
+    return None
+
+
+def _stride(ir, variable, temporaries):
+    """
+    判断一次写入是否为 i = i ± 常量，并返回步长
+
+    支持 `i++`/`i += c` 生成的 `i = i + c`，以及 `i = i + c` 生成的
+    `TMP = i + c; i := TMP` 两种IR形式
+
+    Args:
+        ir: 写入归纳变量的IR
+        variable: 归纳变量
+        temporaries: 同一节点中由二元运算定义的临时变量 {临时变量: Binary}
+
+    Returns:
+        int or None: 步长，不是常量步长更新时返回None
+    """
+    if isinstance(ir, Assignment) and ir.rvalue in temporaries:
+        ir = temporaries[ir.rvalue]
+    if not isinstance(ir, Binary) or ir.variable_left != variable:
+        return None
+    if not isinstance(ir.variable_right, Constant) or not isinstance(ir.variable_right.value, int):
+        return None
+    if ir.type == BinaryType.ADDITION:
+        return ir.variable_right.value
+    if ir.type == BinaryType.SUBTRACTION:
+        return -ir.variable_right.value
+    return None
+
+
+def _match_counted_loop(head):
+    """
+    尝试把循环头匹配为计数循环
+
+    Args:
+        head: IFLOOP节点
+
+    Returns:
+        CountedLoop or None: 匹配成功时返回循环描述
+    """
+    structure = _loop_body(head)
+    if structure is None:
+        return None
+    body, back_edge_sources = structure
+
+    guard = _loop_guard(head)
+    if guard is None:
+        return None
+
+    # 确定归纳变量和边界，归纳变量统一放在比较左侧
+    if isinstance(guard.variable_left, LocalVariable) and guard.type in _FLIPPED_COMPARISONS:
+        variable, bound, comparison = guard.variable_left, guard.variable_right, guard.type
+    elif isinstance(guard.variable_right, LocalVariable) and guard.type in _FLIPPED_COMPARISONS:
+        variable, bound, comparison = guard.variable_right, guard.variable_left, _FLIPPED_COMPARISONS[guard.type]
+    else:
+        return None
+
+    # 归纳变量在循环体中只能写入一次，边界在循环体中不能被写入（循环头中的读取除外）
+    writes = []
+    for node in body:
+        temporaries = {ir.lvalue: ir for ir in node.irs if isinstance(ir, Binary)}
+        for ir in node.irs:
+            lvalue = getattr(ir, "lvalue", None)
+            if lvalue is None:
+                continue
+            if lvalue == variable:
+                writes.append((ir, temporaries))
+            elif lvalue == bound and node is not head:
+                return None
+    if len(writes) != 1:
+        return None
+
+    stride = _stride(writes[0][0], variable, writes[0][1])
+    if not stride:
+        return None
+
+    # 步长方向必须与比较方向一致，否则循环不是计数循环
+    if stride > 0 and comparison not in (BinaryType.LESS, BinaryType.LESS_EQUAL):
+        return None
+    if stride < 0 and comparison not in (BinaryType.GREATER, BinaryType.GREATER_EQUAL):
+        return None
+
+    return CountedLoop(head, variable, stride, comparison, bound, body, back_edge_sources)
@@ -10,27 +10,146 @@
 5. SafeMath库识别与处理
 6. 简单函数调用的跨函数分析
 7. 增强的DeFi合约和变量识别
+8. 阈值加宽：从程序常量和类型边界中收集加宽阈值
+9. 计数循环加速：简单计数循环的归纳变量区间直接用闭式计算
+10. 常量折叠预处理：迭代前折叠常量表达式并剪除常量条件的死分支
+11. 基本块调度：单入口单出口的节点链合并为基本块，工作列表按块调度
+12. 活跃性剪枝：死亡的临时变量和引用变量移出跟踪状态，报告所需的区间保存在旁路表中
+13. 状态变量不变式：每个合约计算一次状态变量的不变区间，作为各函数的入口状态
+14. 修饰器摘要：每个修饰器计算一次在占位符处施加的约束和写入的状态，在调用处一次应用
+15. 库函数摘要数据库：SafeMath、Math、SafeCast、FullMath和ERC20的调用直接查表计算返回值区间
+16. 上下文敏感的调用摘要：内部函数调用按（被调函数, 抽象后的参数区间）缓存分析结果，LRU淘汰
+17. 函数去重：规范指纹和入口状态相同的函数（跨合约、跨编译单元）只分析一次，结果分发到每个合约
+18. 分析档位：0档单遍扫描，1档过程内分析（循环立即加宽），2档完整的过程间不动点
+19. 结果解释：每个函数只保存入口状态和IR指纹作为检查点，需要时回放该函数并记录完整的推导过程
+20. 代价模型：根据函数特征预测分析耗时和迭代轮数，为每个函数选择迭代上限、加宽阈值和档位
 
 更新日志:
 - v1.0: 初始版本，实现基本的区间分析功能
 - v1.1: 增加对SafeMath库的识别和处理，改进DeFi相关代码的识别能力，增强跨函数分析
+- v1.2: 加宽操作改为阈值加宽，条件细化改为基于IR，修正工作列表对回边的重新调度
+- v1.3: 增加计数循环的闭式加速
+- v1.4: 增加常量折叠和死分支剪枝预处理，checked算术（Solidity>=0.8）按普通运算符计算区间
+- v1.5: 工作列表改为按基本块调度
+- v1.6: 增加临时变量和引用变量的活跃性剪枝
+- v1.7: 增加合约级状态变量不变式，替代函数入口处对状态变量的全范围假设
+- v1.8: 增加修饰器摘要
+- v1.9: 库函数调用改为查询摘要数据库，不再根据合约名猜测SafeMath；_safemath_processed按函数重置
+- v1.10: 内部函数调用按调用上下文分析被调函数，结果缓存在LRU表中
+- v1.11: 增加基于规范指纹的函数去重
+- v1.12: 违规结果改为IntervalFinding，直接引用合约、函数和节点
+- v1.13: 增加分析档位
+- v1.14: 潜在问题改为IntervalIssue，记录所在函数和节点；增加检查点和explain()回放
+- v1.15: 增加代价模型，按函数调整分析参数
 """
 
-from slither.slithir.operations import Binary, Assignment, Member, TypeConversion, SolidityCall
+from slither.slithir.operations import Binary, Assignment, Member, TypeConversion, SolidityCall, Condition, InternalCall
+from slither.slithir.operations import LibraryCall, Return, Unpack
+from slither.core.cfg.node import NodeType
 from slither.slithir.variables import Constant, TemporaryVariable, ReferenceVariable
 from slither.core.variables.local_variable import LocalVariable
 from slither.core.variables.state_variable import StateVariable
 from slither.core.declarations import Contract, Function
 from slither.detectors.abstract_detector import AbstractDetector, DetectorClassification
-from collections import deque
+from .loop_acceleration import find_counted_loops
+from .constant_folding import fold_function, state_variable_value
+from ..analyses.budget import DetectorBudget, truncated_result
+from .basic_blocks import build_basic_blocks
+from .liveness import compute_live_out, is_prunable
+from .library_summaries import get_summary_database, apply_summary
+from .fingerprints import FunctionFingerprinter
+from .findings import IntervalFinding, IntervalIssue
+from .cost_model import extract_features, get_cost_model
+from collections import deque, OrderedDict
+import bisect
 import copy
+import hashlib
+import os
 import re
 import math
 import logging
+import time
 
 # 配置日志
 logger = logging.getLogger("IntervalAnalysis")
 
+
+class AnalysisTimeout(Exception):
+    """
+    分析超过墙钟截止时间
+    """
+
+
+# 比较运算符，用于条件细化和阈值收集
+COMPARISON_OPERATORS = ("<", "<=", ">", ">=", "==", "!=")
+
+# 分析档位：各档位覆盖的分析参数（未列出的参数使用默认值）
+# 0: 单遍扫描，不求不动点；只依赖常量、常量折叠和类型范围，用于合并前的快速检查
+# 1: 过程内分析，循环第一次回到循环头就加宽；不使用状态变量不变式、修饰器摘要和调用摘要
+# 2: 完整的过程间不动点分析（默认）
+ANALYSIS_TIERS = {
+    0: {
+        "_single_pass": True,
+        "_narrowing_iterations": 0,
+        "_use_state_invariants": False,
+        "_use_modifier_summaries": False,
+        "_use_call_summaries": False,
+    },
+    1: {
+        "_single_pass": False,
+        "_widening_threshold": 1,
+        "_narrowing_iterations": 1,
+        "_use_state_invariants": False,
+        "_use_modifier_summaries": False,
+        "_use_call_summaries": False,
+    },
+    2: {
+        "_single_pass": False,
+        "_widening_threshold": 3,
+        "_narrowing_iterations": 2,
+        "_use_state_invariants": True,
+        "_use_modifier_summaries": True,
+        "_use_call_summaries": True,
+    },
+}
+DEFAULT_TIER = 2
+# 检测器通过该环境变量选择档位
+TIER_ENVIRONMENT_VARIABLE = "INTERVAL_ANALYSIS_TIER"
+
+
+def resolve_tier(tier=None):
+    """
+    确定分析档位
+    
+    Args:
+        tier: 显式指定的档位，为None时读取环境变量INTERVAL_ANALYSIS_TIER，未设置时使用默认档位
+        
+    Returns:
+        int: 档位编号
+        
+    Raises:
+        ValueError: 显式指定的档位不存在
+    """
+    if tier is None:
+        value = os.environ.get(TIER_ENVIRONMENT_VARIABLE)
+        if not value:
+            return DEFAULT_TIER
+        try:
+            tier = int(value)
+        except ValueError:
+            tier = None
+        if tier not in ANALYSIS_TIERS:
+            logger.warning(f"环境变量 {TIER_ENVIRONMENT_VARIABLE}={value} 不是有效的分析档位，使用默认档位 {DEFAULT_TIER}")
+            return DEFAULT_TIER
+        return tier
+    if tier not in ANALYSIS_TIERS:
+        raise ValueError(f"未知的分析档位: {tier}（可选 {sorted(ANALYSIS_TIERS)}）")
+    return tier
+
+# 函数去重的分析结果，在所有分析器实例（即所有编译单元）之间共享 {去重键: 函数分析结果}
+# 表项只保存变量名、节点序号和区间，不引用任何编译单元的对象，命中时在当前函数中按名称找回变量
+_SHARED_FUNCTION_RESULTS = OrderedDict()
+
 class Interval:
     """
     区间表示类，支持区间运算
@@ -125,24 +244,26 @@ class Interval:
         if other.is_top:
             return copy.deepcopy(self)
         
-        # 取两区间的最大下界和最小上界
-        new_min = max(self.min_val, other.min_val) if (self.min_val is not None and other.min_val is not None) else None
-        new_max = min(self.max_val, other.max_val) if (self.max_val is not None and other.max_val is not None) else None
+        # 取两区间的最大下界和最小上界（None表示该方向无界，取另一方的边界）
+        new_min = max(self.min_val, other.min_val) if (self.min_val is not None and other.min_val is not None) else (self.min_val if self.min_val is not None else other.min_val)
+        new_max = min(self.max_val, other.max_val) if (self.max_val is not None and other.max_val is not None) else (self.max_val if self.max_val is not None else other.max_val)
         
         # 如果下界大于上界，表示交集为空
         if (new_min is not None and new_max is not None) and (new_min > new_max):
             return Interval()  # 空区间
         return Interval(new_min, new_max)
     
-    def widen(self, other):
+    def widen(self, other, thresholds=None):
         """
         加宽操作，用于加速不动点计算
         
         在抽象解释中，加宽操作用于控制迭代次数，
-        通过快速扩大区间范围达到收敛
+        通过快速扩大区间范围达到收敛。提供阈值时使用阈值加宽：
+        突破的边界扩展到下一个阈值，只有越过所有阈值时才扩展到无穷
         
         Args:
             other: 另一个区间
+            thresholds: 升序排列的阈值列表（可选），通常来自程序常量和类型边界
             
         Returns:
             Interval: 加宽后的区间
@@ -152,12 +273,48 @@ class Interval:
         if other.is_bottom:
             return copy.deepcopy(self)
         
-        # 无限上下界的处理：如果other的界限突破了self的界限，则扩展到无穷
-        new_min = float('-inf') if (other.min_val is not None and self.min_val is not None and other.min_val < self.min_val) else self.min_val
-        new_max = float('inf') if (other.max_val is not None and self.max_val is not None and other.max_val > self.max_val) else self.max_val
+        # 如果other的界限突破了self的界限，则扩展到下一个阈值（没有阈值时扩展到无穷）
+        new_min = self._threshold_below(other.min_val, thresholds) if (other.min_val is not None and self.min_val is not None and other.min_val < self.min_val) else self.min_val
+        new_max = self._threshold_above(other.max_val, thresholds) if (other.max_val is not None and self.max_val is not None and other.max_val > self.max_val) else self.max_val
         
         return Interval(new_min, new_max)
     
+    @staticmethod
+    def _threshold_above(value, thresholds):
+        """
+        查找不小于value的最小阈值
+        
+        Args:
+            value: 突破后的上界
+            thresholds: 升序排列的阈值列表
+            
+        Returns:
+            不小于value的最小阈值，不存在时返回正无穷
+        """
+        if thresholds:
+            index = bisect.bisect_left(thresholds, value)
+            if index < len(thresholds):
+                return thresholds[index]
+        return float('inf')
+    
+    @staticmethod
+    def _threshold_below(value, thresholds):
+        """
+        查找不大于value的最大阈值
+        
+        Args:
+            value: 突破后的下界
+            thresholds: 升序排列的阈值列表
+            
+        Returns:
+            不大于value的最大阈值，不存在时返回负无穷
+        """
+        if thresholds:
+            index = bisect.bisect_right(thresholds, value)
+            if index > 0:
+                return thresholds[index - 1]
+        return float('-inf')
+    
     def narrow(self, other):
         """
         收窄操作，用于恢复精度
@@ -233,12 +390,13 @@ class DeFiRangeAnalyzer:
     3. 支持加宽/收窄操作以平衡性能和精度
     """
     
-    def __init__(self, compilation_unit):
+    def __init__(self, compilation_unit, tier=None):
         """
         初始化区间分析器
         
         Args:
             compilation_unit: Slither编译单元对象，包含合约和函数信息
+            tier: 分析档位（见ANALYSIS_TIERS），为None时由环境变量或默认档位决定
         """
         # Slither编译单元
         self.compilation_unit = compilation_unit
@@ -248,14 +406,138 @@ class DeFiRangeAnalyzer:
         self._tracked_vars = {}
         # 函数分析摘要 {function: {parameter: Interval, return: Interval}}
         self._function_summaries = {}
-        # 潜在问题列表
+        # 潜在问题列表 [(描述, 节点, 变量)]
         self._potential_issues = []
+        self._current_node = None  # 正在处理的节点和IR，用于记录潜在问题的位置
+        self._current_ir = None
+        # 函数的回放检查点 {function: {"entry_state": {变量: Interval}, "tape": IR序列的哈希}}
+        self._checkpoints = {}
+        self._trace = None  # 回放时记录的IR执行轨迹，不回放时为None
         
         # 分析参数配置
         self._widening_threshold = 3  # 加宽操作阈值：达到此迭代次数后开始应用加宽
         self._narrowing_iterations = 2  # 收窄迭代次数：在分析结束后精化的迭代次数
         self._max_iterations = 20  # 最大迭代次数：防止无限循环
+        self._single_pass = False  # 是否只按顺序处理每个基本块一次，不求不动点（0档）
         self._worklist_batch_size = 5  # 工作列表批处理大小：每次从工作列表取出的节点数
+        self._use_threshold_widening = True  # 是否使用阈值加宽：关闭时加宽直接扩展到无穷
+        self._accelerate_counted_loops = True  # 是否对简单计数循环使用闭式计算代替迭代
+        self._fold_constants = True  # 是否在迭代前执行常量折叠和死分支剪枝
+        self._folded_irs = {}  # 当前函数中已折叠的IR {IR: 整数值}
+        self._coalesce_basic_blocks = True  # 是否把单入口单出口的节点链合并为基本块调度
+        self._prune_dead_temporaries = True  # 是否把死亡的临时变量和引用变量移出跟踪状态
+        # 被移出跟踪状态的变量死亡前的最后区间，用于违规报告 {variable: Interval}
+        self._retired_intervals = {}
+        # 当前函数中变量最后一次被赋值的节点，用于违规报告的源码位置 {variable: Node}
+        self._defining_nodes = {}
+        self._use_state_invariants = True  # 是否用合约级状态变量不变式作为函数入口状态
+        self._invariant_max_rounds = 6  # 不变式不动点的最大轮数，超过后未稳定的变量取类型范围
+        # 合约的状态变量不变式 {contract: {state_variable: Interval}}，为None表示无法计算
+        self._state_invariants = {}
+        # 计算不变式时收集的状态变量写入区间 {state_variable: Interval}，不计算时为None
+        self._state_writes = None
+        self._use_modifier_summaries = True  # 是否在修饰器调用处应用修饰器摘要
+        # 修饰器摘要 {modifier: {"constraints": {参数序号: Interval}, "writes": {state_variable: Interval}}}
+        self._modifier_summaries = {}
+        # 计算修饰器摘要时占位符处的状态，不计算时为None
+        self._placeholder_state = None
+        self._use_library_summaries = True  # 是否用库函数摘要数据库计算库函数调用的返回值
+        self._library_db = get_summary_database()  # 数据库文件在第一次查询时才加载
+        # 当前函数中由溢出时回滚的库函数（如SafeMath）计算的变量，跳过溢出检查
+        self._safemath_processed = set()
+        self._use_call_summaries = True  # 是否按调用上下文分析内部函数调用
+        self._call_memo_size = 256  # 调用摘要缓存的最大表项数，超过后淘汰最久未使用的表项
+        self._max_call_depth = 3  # 嵌套分析被调函数的最大深度
+        self._exact_bound_limit = 2**16  # 绝对值不超过此值的参数边界按原值作为缓存键，更大的边界向外取到2的幂
+        # 调用摘要缓存 {(被调函数, 抽象参数区间): ([返回值区间], 嵌套深度, 传递调用的函数)}，
+        # 只缓存没有截断任何嵌套调用的完整结果
+        self._call_memo = OrderedDict()
+        self._call_stack = []  # 正在分析的被调函数
+        # 与_call_stack一一对应：每个被调函数分析中的 {"height": 嵌套深度, "reached": 传递调用的函数, "cut": 是否截断过调用}
+        self._call_frames = []
+        self._return_intervals = None  # 分析被调函数时收集的返回值区间，不分析时为None
+        self._tuple_intervals = {}  # 多返回值调用的结果 {元组变量: [返回值区间]}
+        self._dedupe_functions = True  # 是否对规范指纹和入口状态相同的函数只分析一次
+        self._dedupe_cache_size = 4096  # 去重结果表的最大表项数，超过后淘汰最久未使用的表项
+        self._fingerprinter = FunctionFingerprinter()
+        # 去重结果表 {(规范指纹, 入口状态, 分析参数): 按变量名保存的函数分析结果}，跨编译单元共享
+        self._function_results = _SHARED_FUNCTION_RESULTS
+        self._cost_model = get_cost_model()
+        # 是否根据代价模型为每个函数选择迭代上限、加宽阈值和档位；系数拟合之前默认关闭
+        self._use_cost_model = self._cost_model.fitted
+        self._function_time_budget = 1.0  # 单个函数的预测耗时预算（秒），超过时降低档位
+        self._schedule_by_cost = False  # 是否按预测耗时从小到大的顺序分析函数（结果顺序随之改变）
+        self._deadline = None  # 墙钟截止时间（time.monotonic()），超过后停止分析；None表示不限时
+        self.truncated = False  # 分析是否因超过截止时间而提前结束（结果不完整）
+        
+        # 当前函数的加宽阈值（升序），在分析每个函数前收集
+        self._widening_thresholds = []
+        # 分析统计信息
+        self._statistics = {
+            "functions": 0,  # 已分析的函数数
+            "iterations": 0,  # 工作列表迭代轮数
+            "blocks": 0,  # 基本块数
+            "block_visits": 0,  # 基本块处理次数（调度步数）
+            "node_visits": 0,  # 节点处理次数
+            "widenings": 0,  # 加宽操作次数
+            "accelerated_loops": 0,  # 使用闭式计算的计数循环数
+            "folded_operations": 0,  # 预处理中折叠的运算数
+            "pruned_nodes": 0,  # 预处理中剪除的不可达节点数
+            "pruned_variables": 0,  # 因死亡被移出跟踪状态的次数
+            "peak_state_size": 0,  # 块入口状态快照中变量数的峰值
+            "invariant_contracts": 0,  # 计算了状态变量不变式的合约数
+            "invariant_rounds": 0,  # 不变式不动点的总轮数
+            "modifier_summaries": 0,  # 计算的修饰器摘要数
+            "modifier_applications": 0,  # 在修饰器调用处应用摘要的次数
+            "library_summary_hits": 0,  # 由摘要数据库回答的库函数调用次数
+            "call_memo_hits": 0,  # 调用摘要缓存命中次数
+            "call_memo_misses": 0,  # 调用摘要缓存未命中（需要分析被调函数）的次数
+            "call_memo_evictions": 0,  # 调用摘要缓存淘汰的表项数
+            "dedupe_functions": 0,  # 参与去重的函数数
+            "dedupe_hits": 0,  # 直接使用已有分析结果（未重新分析）的函数数
+            "cost_model_adjusted": 0,  # 代价模型调整了分析参数的函数数
+            "cost_model_downgrades": 0,  # 代价模型降低了档位的函数数
+            "unconverged_functions": 0,  # 达到迭代上限时工作列表仍非空（未到不动点）的函数数
+        }
+        
+        # 应用分析档位
+        self.tier = None
+        self.set_tier(resolve_tier(tier))
+    
+    def set_tier(self, tier):
+        """
+        切换分析档位，覆盖档位对应的分析参数
+        
+        Args:
+            tier: 档位编号（见ANALYSIS_TIERS）
+            
+        Raises:
+            ValueError: 档位不存在
+        """
+        if tier not in ANALYSIS_TIERS:
+            raise ValueError(f"未知的分析档位: {tier}（可选 {sorted(ANALYSIS_TIERS)}）")
+        for name, value in ANALYSIS_TIERS[tier].items():
+            setattr(self, name, value)
+        self.tier = tier
+    
+    def set_time_budget(self, seconds):
+        """
+        设置从现在起的墙钟时间预算
+        
+        超过预算时正在分析的函数被放弃，iter_findings()/analyze()返回已完成函数的结果，
+        并把truncated置为True
+        
+        Args:
+            seconds: 预算秒数，为None或不大于0时不限时
+        """
+        self._deadline = time.monotonic() + seconds if seconds is not None and seconds > 0 else None
+    
+    def _check_deadline(self):
+        """
+        超过截止时间时抛出AnalysisTimeout
+        """
+        if self._deadline is not None and time.monotonic() > self._deadline:
+            raise AnalysisTimeout()
     
     def _load_deFi_constraints(self):
         """
@@ -418,7 +700,8 @@ class DeFiRangeAnalyzer:
         Returns:
             dict: 当前跟踪变量的区间映射的副本
         """
-        return copy.deepcopy(self._tracked_vars)
+        # 只复制区间，变量对象本身必须保持同一身份，否则快照中的键无法与当前状态对应
+        return {var: copy.copy(interval) for var, interval in self._tracked_vars.items()}
     
     def _state_changed(self, old_state, threshold=0.01):
         """
@@ -473,6 +756,15 @@ class DeFiRangeAnalyzer:
         Args:
             ir: Slither中间表示指令
         """
+        # 预处理中已折叠的运算，结果已经写入跟踪变量
+        if ir in self._folded_irs:
+            return
+        
+        # 修饰器调用：应用修饰器摘要，不作为普通函数调用处理
+        if isinstance(ir, InternalCall) and ir.is_modifier_call:
+            self._apply_modifier_summary(ir)
+            return
+        
         # 根据IR类型调用对应的处理方法
         if isinstance(ir, Binary):
             self._handle_binary_op(ir)
@@ -484,10 +776,48 @@ class DeFiRangeAnalyzer:
             self._handle_member(ir)
         elif isinstance(ir, SolidityCall):
             self._handle_solidity_call(ir)
+        elif isinstance(ir, Return):
+            self._handle_return(ir)
+        elif isinstance(ir, Unpack):
+            intervals = self._tuple_intervals.get(ir.tuple)
+            if intervals is not None and ir.index < len(intervals) and intervals[ir.index] is not None:
+                self._tracked_vars[ir.lvalue] = copy.copy(intervals[ir.index])
         # 增加对函数调用的处理
         elif hasattr(ir, "function") and hasattr(ir, "lvalue") and hasattr(ir, "arguments"):
             self._handle_function_call(ir)
         # 其他类型的IR可以在这里扩展
+        
+        # 计算状态变量不变式时，记录对状态变量的写入
+        if self._state_writes is not None and isinstance(getattr(ir, "lvalue", None), StateVariable):
+            self._record_state_write(ir)
+    
+    def _process_ir_traced(self, node, ir):
+        """
+        处理IR指令并把执行前的操作数区间和执行后的结果区间记录到回放轨迹
+        
+        Args:
+            node: IR所在的节点
+            ir: Slither中间表示指令
+        """
+        reads = []
+        for value in ir.read:
+            if isinstance(value, Constant):
+                reads.append((value, None))
+            elif not isinstance(value, (list, tuple)):
+                interval = self._tracked_vars.get(value)
+                reads.append((value, copy.copy(interval) if interval is not None else None))
+        
+        self._process_ir(ir)
+        
+        lvalue = getattr(ir, "lvalue", None)
+        result = self._tracked_vars.get(lvalue) if lvalue is not None else None
+        self._trace.append({
+            "node": node,
+            "ir": ir,
+            "reads": reads,
+            "lvalue": lvalue,
+            "result": copy.copy(result) if result is not None else None,
+        })
     
     def _handle_assignment(self, ir):
         """
@@ -636,18 +966,10 @@ class DeFiRangeAnalyzer:
         Args:
             ir: Solidity调用的IR表示
         """
-        # 处理 SafeMath 相关操作和其他数学函数
+        # 处理数学函数（SafeMath等库函数调用不是SolidityCall，由_handle_function_call查询摘要数据库）
         if hasattr(ir, "function") and hasattr(ir, "arguments"):
             function_name = ir.function.name.lower()
             
-            # 检查是否是SafeMath库调用
-            is_safemath_call = False
-            if hasattr(ir.function, "contract"):
-                contract_name = str(ir.function.contract.name).lower()
-                # 检查合约名称是否暗示这是SafeMath库
-                if "safemath" in contract_name or "math" in contract_name:
-                    is_safemath_call = True
-            
             # 处理数学运算函数
             if function_name in ["add", "sub", "mul", "div", "mod"]:
                 # 获取参数区间
@@ -666,13 +988,6 @@ class DeFiRangeAnalyzer:
                     # 应用二元操作
                     result_interval = self._apply_binary_operation(function_name, arg_intervals[0], arg_intervals[1])
                     self._tracked_vars[ir.lvalue] = result_interval
-                    
-                    # 如果是SafeMath调用，记录此变量为SafeMath处理过，后续跳过溢出检查
-                    if is_safemath_call and hasattr(ir, "lvalue"):
-                        # 使用属性标记变量是否经过SafeMath处理
-                        if not hasattr(self, "_safemath_processed"):
-                            self._safemath_processed = set()
-                        self._safemath_processed.add(ir.lvalue)
             
             # 处理min/max函数
             elif function_name == "min":
@@ -717,6 +1032,15 @@ class DeFiRangeAnalyzer:
         function = ir.function
         target = ir.lvalue
         
+        # 优先查询库函数摘要数据库
+        if self._use_library_summaries and function is not None and self._apply_library_summary(ir):
+            return
+        
+        # 有实现的内部函数和库函数：按调用上下文分析（计算不变式期间不使用，避免缓存基于未稳定不变式的结果）
+        if (self._use_call_summaries and self._state_writes is None and isinstance(ir, (InternalCall, LibraryCall))
+                and isinstance(function, Function) and function.nodes and self._apply_call_summary(ir)):
+            return
+        
         # 检查是否是已知的DeFi函数
         function_name = function.name.lower() if hasattr(function, "name") else ""
         
@@ -750,6 +1074,227 @@ class DeFiRangeAnalyzer:
             # 如果是关键变量但无法确定区间，使用默认非负区间
             self._tracked_vars[target] = Interval(0, 2**256 - 1)
     
+    def _apply_library_summary(self, ir):
+        """
+        用摘要数据库计算库函数调用的返回值区间
+        
+        Args:
+            ir: 函数调用的IR表示
+            
+        Returns:
+            bool: 被调用函数在数据库中时返回True
+        """
+        entry, exact = self._library_db.match(ir.function)
+        if entry is None:
+            return False
+        self._statistics["library_summary_hits"] += 1
+        
+        target = ir.lvalue
+        if target is None:
+            return True
+        
+        arguments = []
+        for arg in ir.arguments:
+            if isinstance(arg, Constant):
+                value = self._constant_value(arg)
+                arguments.append((value, value) if value is not None else None)
+            elif arg in self._tracked_vars and not self._tracked_vars[arg].is_bottom:
+                arguments.append((self._tracked_vars[arg].min_val, self._tracked_vars[arg].max_val))
+            else:
+                arguments.append(None)
+        
+        result = apply_summary(entry, arguments)
+        if result is None:
+            # 参数区间未知：返回值只能取其类型范围
+            bounds = self._type_bounds(target.type) if hasattr(target, "type") else None
+            if bounds is None:
+                return True
+            result = bounds
+        self._tracked_vars[target] = Interval(*result)
+        # 只有指纹匹配才能确认是会回滚的checked库代码；按名称匹配的区间只作参考，仍然检查溢出
+        if entry.get("checked") and exact:
+            self._safemath_processed.add(target)
+        return True
+    
+    def _handle_return(self, ir):
+        """
+        处理返回语句：分析被调函数时记录各返回值的区间（多个返回点取并集）
+        
+        Args:
+            ir: Return的IR表示
+        """
+        if self._return_intervals is None:
+            return
+        for index, value in enumerate(ir.values):
+            if isinstance(value, Constant):
+                constant = self._constant_value(value)
+                interval = Interval(constant, constant) if constant is not None else None
+            elif value in self._tracked_vars and not self._tracked_vars[value].is_bottom:
+                interval = self._tracked_vars[value]
+            else:
+                interval = None
+            if interval is None:
+                # 返回值区间未知，取其类型范围
+                bounds = self._type_bounds(value.type) if hasattr(value, "type") else None
+                interval = Interval(*bounds) if bounds else Interval(float('-inf'), float('inf'))
+            while len(self._return_intervals) <= index:
+                self._return_intervals.append(None)
+            previous = self._return_intervals[index]
+            self._return_intervals[index] = copy.copy(interval) if previous is None else previous.join(interval)
+    
+    def _abstract_bound(self, value, upper):
+        """
+        把参数区间的边界抽象为缓存键
+        
+        绝对值较小的边界保持原值；较大的边界向外取到2的幂，
+        使取值接近的调用上下文共用一个缓存表项，抽象后的区间总是包含原区间
+        
+        Args:
+            value: 区间边界
+            upper: 是否为上界
+            
+        Returns:
+            int or None: 抽象后的边界
+        """
+        if value is None or isinstance(value, float) or abs(value) <= self._exact_bound_limit:
+            return value
+        bits = abs(value).bit_length()
+        if value > 0:
+            return 2**bits - 1 if upper else 2**(bits - 1)
+        return -(2**(bits - 1)) if upper else -(2**bits)
+    
+    def _apply_call_summary(self, ir):
+        """
+        用调用摘要计算内部函数调用的返回值区间
+        
+        被调函数以抽象后的实参区间为参数入口状态进行分析，结果按
+        （被调函数, 抽象参数区间）缓存；缓存已满时淘汰最久未使用的表项。
+        分析中有嵌套调用因递归或深度上限被截断时结果取决于调用栈，不缓存；
+        缓存的完整结果只在剩余深度足够、且它传递调用的函数都不在调用栈上时使用，
+        此时重新分析得到的结果与缓存相同，结果与分析顺序无关。
+        调用之后，被调函数写入的状态变量回到其不变式（没有不变式时移出跟踪状态）
+        
+        Args:
+            ir: InternalCall或LibraryCall
+            
+        Returns:
+            bool: 调用被处理时返回True；递归调用或超过嵌套深度时返回False
+        """
+        callee = ir.function
+        if callee in self._call_stack or len(self._call_stack) >= self._max_call_depth:
+            # 截断：正在分析的各层被调函数的结果都取决于调用栈
+            if self._call_frames:
+                self._call_frames[-1]["cut"] = True
+            return False
+        
+        # 抽象实参区间
+        context = []
+        for arg in ir.arguments:
+            if isinstance(arg, Constant):
+                value = self._constant_value(arg)
+                bounds = (value, value) if value is not None else None
+            elif arg in self._tracked_vars and not self._tracked_vars[arg].is_bottom:
+                bounds = (self._tracked_vars[arg].min_val, self._tracked_vars[arg].max_val)
+            else:
+                bounds = None
+            if bounds is not None:
+                bounds = (self._abstract_bound(bounds[0], False), self._abstract_bound(bounds[1], True))
+            context.append(bounds)
+        key = (callee, tuple(context))
+        
+        memo = self._call_memo.get(key)
+        if memo is not None and (memo[1] > self._max_call_depth - len(self._call_stack)
+                                 or not memo[2].isdisjoint(self._call_stack)):
+            # 在这里重新分析会截断嵌套调用，结果与缓存不同
+            memo = None
+        if memo is not None:
+            self._call_memo.move_to_end(key)
+            self._statistics["call_memo_hits"] += 1
+            returns, height, reached = memo
+            cut = False
+        else:
+            self._statistics["call_memo_misses"] += 1
+            frame = {"height": 0, "reached": set(), "cut": False}
+            self._call_frames.append(frame)
+            try:
+                returns = self._analyze_callee(callee, context)
+            finally:
+                self._call_frames.pop()
+            height, reached, cut = frame["height"] + 1, frozenset(frame["reached"]), frame["cut"]
+            if not cut:
+                self._call_memo[key] = (returns, height, reached)
+                if len(self._call_memo) > self._call_memo_size:
+                    self._call_memo.popitem(last=False)
+                    self._statistics["call_memo_evictions"] += 1
+        
+        # 计入外层被调函数的嵌套深度和传递调用的函数
+        if self._call_frames:
+            parent = self._call_frames[-1]
+            parent["height"] = max(parent["height"], height)
+            parent["reached"].add(callee)
+            parent["reached"].update(reached)
+            parent["cut"] = parent["cut"] or cut
+        
+        # 返回值
+        target = ir.lvalue
+        if target is not None and returns:
+            if len(returns) == 1 and returns[0] is not None:
+                self._tracked_vars[target] = copy.copy(returns[0])
+            else:
+                self._tuple_intervals[target] = returns
+        
+        # 被调函数写入的状态变量
+        invariants = self._get_state_invariants(getattr(callee, "contract", None)) if self._use_state_invariants else None
+        for var in callee.all_state_variables_written():
+            if var not in self._tracked_vars:
+                continue
+            if invariants and var in invariants:
+                self._tracked_vars[var] = copy.copy(invariants[var])
+            else:
+                del self._tracked_vars[var]
+        return True
+    
+    def _analyze_callee(self, callee, context):
+        """
+        在给定的参数上下文中分析被调函数，返回各返回值的区间
+        
+        分析会覆盖当前函数的全部分析状态，因此先保存、分析完成后恢复；
+        被调函数分析中产生的问题和函数摘要不保留
+        
+        Args:
+            callee: 被调函数
+            context: 抽象后的各参数区间边界列表
+            
+        Returns:
+            list: 各返回值的区间（未知时为None）
+        """
+        entry_state = dict(self._get_state_invariants(getattr(callee, "contract", None)) or {}) if self._use_state_invariants else {}
+        for param, bounds in zip(callee.parameters, context):
+            if bounds is not None:
+                entry_state[param] = Interval(*bounds)
+        
+        saved = (
+            self._tracked_vars, self._retired_intervals, self._defining_nodes, self._safemath_processed,
+            self._tuple_intervals, self._folded_irs, self._widening_thresholds, self._return_intervals,
+            self._placeholder_state, self._current_node, self._current_ir,
+            list(self._potential_issues), dict(self._function_summaries), self._trace,
+        )
+        self._call_stack.append(callee)
+        self._return_intervals = []
+        self._placeholder_state = None
+        # 回放轨迹只记录被回放函数自身的IR，被调函数的临时变量和参数名会与调用者重名
+        self._trace = None
+        try:
+            self._analyze_function_worklist(callee, entry_state=entry_state)
+            returns = self._return_intervals
+        finally:
+            self._call_stack.pop()
+            (self._tracked_vars, self._retired_intervals, self._defining_nodes, self._safemath_processed,
+             self._tuple_intervals, self._folded_irs, self._widening_thresholds, self._return_intervals,
+             self._placeholder_state, self._current_node, self._current_ir,
+             self._potential_issues, self._function_summaries, self._trace) = saved
+        return returns
+    
     def _handle_binary_op(self, ir):
         """
         处理二元运算符
@@ -759,7 +1304,9 @@ class DeFiRangeAnalyzer:
         Args:
             ir: 二元操作的IR表示
         """
-        op_type = ir.type_str
+        # checked算术的type_str带有"(c)"前缀，区间计算只使用运算符本身
+        op_type = str(ir.type.value)
+        is_checked = ir.type_str.startswith("(c)")
         result_var = ir.lvalue
         left = ir.variable_left
         right = ir.variable_right
@@ -768,39 +1315,23 @@ class DeFiRangeAnalyzer:
         left_interval = self._tracked_vars.get(left, Interval())
         right_interval = self._tracked_vars.get(right, Interval())
         
-        # 处理常量右操作数
+        # 处理常量操作数
         if isinstance(right, Constant) and right not in self._tracked_vars:
-            value = right.value
-            if isinstance(value, int) or (isinstance(value, str) and value.isdigit()):
-                value = int(value) if isinstance(value, int) else int(value)
+            value = self._constant_value(right)
+            if value is not None:
                 right_interval = Interval(value, value)
-            elif isinstance(value, str) and value.startswith("0x"):
-                try:
-                    value = int(value, 16)
-                    right_interval = Interval(value, value)
-                except ValueError:
-                    pass
-        
-        # 处理常量左操作数
         if isinstance(left, Constant) and left not in self._tracked_vars:
-            value = left.value
-            if isinstance(value, int) or (isinstance(value, str) and value.isdigit()):
-                value = int(value) if isinstance(value, int) else int(value)
+            value = self._constant_value(left)
+            if value is not None:
                 left_interval = Interval(value, value)
-            elif isinstance(value, str) and value.startswith("0x"):
-                try:
-                    value = int(value, 16)
-                    left_interval = Interval(value, value)
-                except ValueError:
-                    pass
         
         # 使用通用方法计算结果区间
         result_interval = self._apply_binary_operation(op_type, left_interval, right_interval)
         self._tracked_vars[result_var] = result_interval
         
         # 检查潜在问题
-        # 检查溢出/下溢
-        if op_type in ["+", "-", "*", "**"]:
+        # 检查溢出/下溢（checked算术溢出时会回滚，不需要检查）
+        if op_type in ["+", "-", "*", "**"] and not is_checked:
             self._check_overflow_underflow(op_type, left_interval, right_interval, result_var)
         
         # 检查除零
@@ -895,12 +1426,12 @@ class DeFiRangeAnalyzer:
                 # 不是 [0,0]（即不是确定的0），而是区间中包含0
                 if not (right_min == 0 and right_max == 0):
                     # 记录潜在问题
-                    self._potential_issues.append(f"确定性除零风险: 除数区间 {right_interval} 包含0")
+                    self._report_issue(f"确定性除零风险: 除数区间 {right_interval} 包含0")
                     # 返回完整范围，表示不确定的结果
                     return Interval(-(2**255), 2**256 - 1)
                 else:
                     # 除数确定是0，肯定会导致除零错误
-                    self._potential_issues.append(f"确定性除零错误: 除数区间为 [0,0]")
+                    self._report_issue(f"确定性除零错误: 除数区间为 [0,0]")
                     return Interval(-(2**255), 2**256 - 1)
             
             # 避免直接计算无穷，使用条件判断
@@ -955,9 +1486,9 @@ class DeFiRangeAnalyzer:
             if right_min <= 0 and right_max >= 0:
                 # 除数区间包含0，这是一个高置信度的除零风险
                 if not (right_min == 0 and right_max == 0):
-                    self._potential_issues.append(f"确定性除零风险: 模运算除数区间 {right_interval} 包含0")
+                    self._report_issue(f"确定性除零风险: 模运算除数区间 {right_interval} 包含0")
                 else:
-                    self._potential_issues.append(f"确定性除零错误: 模运算除数区间为 [0,0]")
+                    self._report_issue(f"确定性除零错误: 模运算除数区间为 [0,0]")
                 return Interval(0, 2**256 - 1)  # 全范围
             
             # 处理除数区间不包含零的情况
@@ -1170,7 +1701,7 @@ class DeFiRangeAnalyzer:
             result_var: 结果变量
         """
         # 如果变量是通过SafeMath处理的，跳过溢出检查
-        if hasattr(self, "_safemath_processed") and result_var in self._safemath_processed:
+        if result_var in self._safemath_processed:
             return
             
         issue = None
@@ -1204,7 +1735,17 @@ class DeFiRangeAnalyzer:
                     issue = f"潜在幂运算溢出: {result_var} = {left_interval} ** {right_interval}"
         
         if issue:
-            self._potential_issues.append(issue)
+            self._report_issue(issue)
+    
+    def _report_issue(self, issue):
+        """
+        记录潜在问题及其位置（正在处理的节点和IR的结果变量）
+        
+        Args:
+            issue: 问题描述
+        """
+        variable = getattr(self._current_ir, "lvalue", None) if self._current_ir is not None else None
+        self._potential_issues.append((issue, self._current_node, variable))
     
     def _check_division_by_zero(self, right_interval, result_var, left_var):
         """
@@ -1219,9 +1760,411 @@ class DeFiRangeAnalyzer:
         """
         if right_interval.min_val is not None and right_interval.max_val is not None:
             if right_interval.min_val <= 0 and right_interval.max_val >= 0:
-                self._potential_issues.append(f"潜在除零错误: {result_var} = {left_var} / [包含0的区间 {right_interval}]")
+                self._report_issue(f"潜在除零错误: {result_var} = {left_var} / [包含0的区间 {right_interval}]")
+    
+    def _constant_value(self, constant):
+        """
+        解析常量的整数值
+        
+        Args:
+            constant: Slither常量对象
+            
+        Returns:
+            int or None: 常量的整数值，无法解析时返回None
+        """
+        value = constant.value
+        if isinstance(value, bool):
+            return int(value)
+        if isinstance(value, int):
+            return value
+        if isinstance(value, str):
+            try:
+                return int(value, 16) if value.startswith("0x") else int(value)
+            except ValueError:
+                return None
+        return None
+    
+    def _type_bounds(self, var_type):
+        """
+        获取整数类型的取值边界
+        
+        Args:
+            var_type: 变量类型
+            
+        Returns:
+            tuple or None: (最小值, 最大值)，非整数类型返回None
+        """
+        match = re.fullmatch(r"(u?)int(\d*)", str(var_type).lower())
+        if not match:
+            return None
+        bits = int(match.group(2)) if match.group(2) else 256
+        if match.group(1):
+            return (0, 2**bits - 1)
+        return (-(2**(bits-1)), 2**(bits-1) - 1)
+    
+    def _collect_widening_thresholds(self, function):
+        """
+        收集函数的加宽阈值
+        
+        阈值来自函数中require/assert的比较运算出现的常量，
+        以及函数中出现的整数类型的边界。对于常量c同时加入c-1和c+1，
+        使 `x < n`、`x > n` 这类严格比较细化后的边界也是阈值。
+        条件分支和循环条件不细化区间（见_transfer_node），它们的常量只会让加宽多走几轮，不作为阈值
+        
+        Args:
+            function: 要分析的函数
+            
+        Returns:
+            list: 升序排列的阈值列表
+        """
+        thresholds = {0}
+        
+        variables = list(function.parameters)
+        for node in function.nodes:
+            refines = node.contains_require_or_assert()
+            for ir in node.irs:
+                if refines and isinstance(ir, Binary) and ir.type_str in COMPARISON_OPERATORS:
+                    for operand in (ir.variable_left, ir.variable_right):
+                        if isinstance(operand, Constant):
+                            value = self._constant_value(operand)
+                            if value is not None:
+                                thresholds.update((value - 1, value, value + 1))
+                variables.extend(ir.read)
+                if getattr(ir, "lvalue", None) is not None:
+                    variables.append(ir.lvalue)
+        
+        for var in variables:
+            bounds = self._type_bounds(var.type) if hasattr(var, "type") else None
+            if bounds:
+                thresholds.update(bounds)
+        
+        return sorted(thresholds)
+    
+    def _get_state_invariants(self, contract):
+        """
+        获取合约的状态变量不变式，每个合约只计算一次
+        
+        Args:
+            contract: Slither合约对象
+            
+        Returns:
+            dict or None: {state_variable: Interval}，无法计算时返回None
+        """
+        if contract is None:
+            return None
+        if contract not in self._state_invariants:
+            self._state_invariants[contract] = self._compute_state_invariants(contract)
+        return self._state_invariants[contract]
+    
+    def _compute_state_invariants(self, contract):
+        """
+        计算合约的状态变量不变式
+        
+        不变式从声明中的初始值开始，与构造函数中的写入合并；之后以当前不变式作为
+        入口状态反复分析所有写入状态变量的函数和修饰器，把写入的区间合并进不变式，
+        直到不再变化。超过最大轮数后仍未稳定的变量取其类型范围。
+        包含内联汇编或delegatecall的合约可能以分析器看不到的方式写入存储，不计算不变式
+        
+        Args:
+            contract: Slither合约对象
+            
+        Returns:
+            dict or None: {state_variable: Interval}，无法计算时返回None
+        """
+        functions = [f for f in list(contract.functions) + list(contract.modifiers) if f.nodes]
+        for function in functions:
+            if function.contains_assembly:
+                return None
+            if any(ir.function_name == "delegatecall" for ir in function.low_level_calls):
+                return None
+        
+        # 只处理整数和布尔类型的状态变量
+        bounds = {}
+        for var in contract.state_variables:
+            var_bounds = self._type_bounds(var.type) or ((0, 1) if str(var.type) == "bool" else None)
+            if var_bounds is not None:
+                bounds[var] = var_bounds
+        if not bounds:
+            return {}
+        
+        # 初始值：常量初始化表达式的值，没有初始化表达式时为0；
+        # 非常量初始化表达式在slitherConstructorVariables中赋值，不变式先置为空区间
+        invariants = {}
+        deploy_state = {}
+        for var, (low, high) in bounds.items():
+            value = 0 if var.expression is None else state_variable_value(var)
+            if value is not None and low <= value <= high:
+                invariants[var] = Interval(value, value)
+                deploy_state[var] = Interval(value, value)
+            else:
+                invariants[var] = Interval()
+                deploy_state[var] = Interval(low, high)
+        
+        # 分析过程会写入问题列表和函数摘要，计算不变式时不能留下这些副作用
+        saved_issues = list(self._potential_issues)
+        saved_summaries = dict(self._function_summaries)
+        # 嵌套分析时查询到的是正在计算的不变式
+        self._state_invariants[contract] = invariants
+        self._statistics["invariant_contracts"] += 1
+        
+        constructors = [f for f in functions if f.is_constructor or f.name == "slitherConstructorVariables"]
+        writers = [f for f in functions if f not in constructors and f.state_variables_written]
+        
+        # 加宽阈值：写入函数中的比较常量以及状态变量的类型边界
+        thresholds = {0}
+        for function in writers:
+            thresholds.update(self._collect_widening_thresholds(function))
+        for low, high in bounds.values():
+            thresholds.update((low, high))
+        thresholds = sorted(thresholds)
+        
+        try:
+            # 构造函数只在部署时执行一次，入口状态为部署时的初始值；
+            # slitherConstructorVariables（状态变量初始化）先于构造函数执行
+            self._state_writes = {}
+            for function in sorted(constructors, key=lambda f: f.is_constructor):
+                self._analyze_function_worklist(function, entry_state=deploy_state)
+            invariants = self._merge_state_writes(invariants, bounds, thresholds, 0)
+            self._state_invariants[contract] = invariants
+            
+            for round_index in range(1, self._invariant_max_rounds + 1):
+                self._statistics["invariant_rounds"] += 1
+                self._state_writes = {}
+                for function in writers:
+                    self._analyze_function_worklist(function, entry_state=invariants)
+                merged = self._merge_state_writes(invariants, bounds, thresholds, round_index)
+                stable = all(merged[var] == invariants[var] for var in invariants)
+                invariants = merged
+                self._state_invariants[contract] = invariants
+                if stable:
+                    break
+            else:
+                # 达到最大轮数仍未稳定：保守地使用类型范围
+                invariants = {var: Interval(*bounds[var]) for var in invariants}
+        finally:
+            self._state_writes = None
+            self._potential_issues = saved_issues
+            self._function_summaries = saved_summaries
+        
+        # 初始值未知且从未被写入的变量取类型范围
+        for var in invariants:
+            if invariants[var].is_bottom:
+                invariants[var] = Interval(*bounds[var])
+        return invariants
     
-    def _analyze_function_worklist(self, function):
+    def _merge_state_writes(self, invariants, bounds, thresholds, round_index):
+        """
+        把一轮分析中收集的状态变量写入合并到不变式
+        
+        从第二轮起对变化的变量做阈值加宽
+        
+        Args:
+            invariants: 当前不变式
+            bounds: 状态变量的类型边界 {state_variable: (最小值, 最大值)}
+            thresholds: 升序排列的加宽阈值
+            round_index: 当前轮数（构造函数为第0轮）
+            
+        Returns:
+            dict: 新的不变式
+        """
+        merged = {}
+        for var, interval in invariants.items():
+            low, high = bounds[var]
+            written = self._state_writes.get(var)
+            new_interval = interval if written is None else interval.join(written)
+            if round_index >= 2 and not interval.is_bottom and new_interval != interval:
+                new_interval = interval.widen(new_interval, thresholds)
+            # 超出类型范围说明可能发生了回绕，取整个类型范围
+            if not new_interval.is_bottom and (
+                new_interval.min_val is None or new_interval.min_val < low or
+                new_interval.max_val is None or new_interval.max_val > high
+            ):
+                new_interval = Interval(low, high)
+            merged[var] = new_interval
+        return merged
+    
+    def _record_state_write(self, ir):
+        """
+        记录一次状态变量写入的区间
+        
+        只有赋值、二元运算和类型转换的结果区间是可信的；其他写入
+        （如delete、未建模的调用）以及得不到区间的写入按类型范围处理
+        
+        Args:
+            ir: 左值为状态变量的IR
+        """
+        var = ir.lvalue
+        bounds = self._type_bounds(var.type) or ((0, 1) if str(var.type) == "bool" else None)
+        if bounds is None:
+            return
+        interval = self._tracked_vars.get(var)
+        if not isinstance(ir, (Assignment, Binary, TypeConversion)) or interval is None or interval.is_bottom:
+            interval = Interval(*bounds)
+        previous = self._state_writes.get(var)
+        self._state_writes[var] = interval if previous is None else previous.join(interval)
+    
+    def _get_modifier_summary(self, modifier):
+        """
+        获取修饰器摘要，每个修饰器只计算一次
+        
+        Args:
+            modifier: Slither修饰器对象
+            
+        Returns:
+            dict: {"constraints": {参数序号: Interval}, "writes": {state_variable: Interval}}
+        """
+        if modifier not in self._modifier_summaries:
+            self._modifier_summaries[modifier] = self._compute_modifier_summary(modifier)
+        return self._modifier_summaries[modifier]
+    
+    def _compute_modifier_summary(self, modifier):
+        """
+        计算修饰器摘要
+        
+        以参数的类型范围和合约的状态变量不变式为入口状态分析修饰器，
+        取占位符 `_` 处的状态：比类型范围更窄的参数区间是修饰器施加的约束
+        （如 `require(amount <= MAX)`），状态变量的区间是占位符之前写入的结果
+        （如 `nonReentrant` 中的 `_status = _ENTERED`）
+        
+        Args:
+            modifier: Slither修饰器对象
+            
+        Returns:
+            dict: {"constraints": {参数序号: Interval}, "writes": {state_variable: Interval}}
+        """
+        summary = {"constraints": {}, "writes": {}}
+        if not modifier.nodes:
+            return summary
+        
+        invariants = self._get_state_invariants(getattr(modifier, "contract", None)) if self._use_state_invariants else None
+        entry_state = dict(invariants or {})
+        param_bounds = {}
+        for param in modifier.parameters:
+            bounds = self._type_bounds(param.type) or ((0, 1) if str(param.type) == "bool" else None)
+            if bounds is not None:
+                param_bounds[param] = bounds
+                entry_state[param] = Interval(*bounds)
+        
+        # 分析过程会写入问题列表和函数摘要，计算摘要时不能留下这些副作用
+        saved_issues = list(self._potential_issues)
+        saved_summaries = dict(self._function_summaries)
+        saved_trace = self._trace
+        self._placeholder_state = {}
+        self._trace = None  # 修饰器的IR不计入回放轨迹
+        try:
+            self._analyze_function_worklist(modifier, entry_state=entry_state)
+            placeholder_state = self._placeholder_state
+        finally:
+            self._placeholder_state = None
+            self._potential_issues = saved_issues
+            self._function_summaries = saved_summaries
+            self._trace = saved_trace
+        self._statistics["modifier_summaries"] += 1
+        
+        for index, param in enumerate(modifier.parameters):
+            interval = placeholder_state.get(param)
+            if param in param_bounds and interval is not None and interval != Interval(*param_bounds[param]):
+                summary["constraints"][index] = interval
+        for var in modifier.state_variables_written:
+            if var in placeholder_state and not placeholder_state[var].is_bottom:
+                summary["writes"][var] = placeholder_state[var]
+        return summary
+    
+    def _apply_modifier_summary(self, ir):
+        """
+        在修饰器调用处应用修饰器摘要
+        
+        把参数约束与对应实参的区间求交，并写入修饰器在占位符之前修改的状态变量
+        
+        Args:
+            ir: 修饰器调用的InternalCall
+        """
+        summary = self._modifier_summaries.get(ir.function)
+        if summary is None:
+            return
+        self._statistics["modifier_applications"] += 1
+        
+        for index, constraint in summary["constraints"].items():
+            if index >= len(ir.arguments) or isinstance(ir.arguments[index], Constant):
+                continue
+            argument = ir.arguments[index]
+            if argument in self._tracked_vars:
+                self._tracked_vars[argument] = self._tracked_vars[argument].meet(constraint)
+            else:
+                self._tracked_vars[argument] = copy.copy(constraint)
+        
+        for var, interval in summary["writes"].items():
+            self._tracked_vars[var] = copy.copy(interval)
+    
+    def _accelerate_loop_head(self, loop, init):
+        """
+        在计数循环的循环头设置归纳变量的闭式区间
+        
+        Args:
+            loop: CountedLoop循环描述
+            init: 进入循环的边上归纳变量的区间（不能取回边上已经递增过的值，否则丢失第一次迭代）
+            
+        Returns:
+            bool: 能够计算闭式区间时返回True，否则返回False（回退到普通迭代）
+        """
+        if init is None or init.is_bottom or init.min_val is None or init.max_val is None:
+            return False
+        
+        # 边界区间：常量取其值，变量取跟踪的区间，否则取类型边界
+        if isinstance(loop.bound, Constant):
+            value = self._constant_value(loop.bound)
+            bound = (value, value) if value is not None else None
+        elif loop.bound in self._tracked_vars and not self._tracked_vars[loop.bound].is_bottom:
+            bound = (self._tracked_vars[loop.bound].min_val, self._tracked_vars[loop.bound].max_val)
+        else:
+            bound = self._type_bounds(loop.bound.type) if hasattr(loop.bound, "type") else None
+        if bound is None or None in bound or float('inf') in bound or float('-inf') in bound:
+            return False
+        if float('inf') in (init.min_val, init.max_val) or float('-inf') in (init.min_val, init.max_val):
+            return False
+        
+        new_min, new_max = loop.head_interval((init.min_val, init.max_val), bound)
+        
+        # 结果不超出归纳变量的类型范围
+        type_bounds = self._type_bounds(loop.variable.type) if hasattr(loop.variable, "type") else None
+        if type_bounds:
+            new_min = max(new_min, type_bounds[0])
+            new_max = min(new_max, type_bounds[1])
+        
+        self._tracked_vars[loop.variable] = Interval(new_min, new_max)
+        return True
+    
+    def _close_counted_loop(self, loop, head_state, init):
+        """
+        处理计数循环的回边
+        
+        归纳变量恢复为由入口区间计算的循环头闭式区间；循环体中写入的其他变量相对于循环头
+        上一次处理前的状态立即加宽（不使用阈值），因此循环最多再处理一遍即可稳定，
+        不需要等到加宽阈值
+        
+        Args:
+            loop: CountedLoop循环描述
+            head_state: 循环头上一次处理前的状态快照
+            init: 进入循环的边上归纳变量的区间
+        """
+        if init is not None:
+            self._accelerate_loop_head(loop, init)
+        
+        for var in loop.written:
+            if var in head_state and var in self._tracked_vars:
+                self._tracked_vars[var] = head_state[var].widen(self._tracked_vars[var])
+                self._statistics["widenings"] += 1
+    
+    def get_statistics(self):
+        """
+        获取分析统计信息
+        
+        Returns:
+            dict: 已分析函数数、工作列表迭代轮数、节点处理次数和加宽次数
+        """
+        return dict(self._statistics)
+    
+    def _analyze_function_worklist(self, function, entry_state=None):
         """
         使用优化的工作列表算法实现函数级分析
         
@@ -1233,9 +2176,30 @@ class DeFiRangeAnalyzer:
         
         Args:
             function: 要分析的函数
+            entry_state: 入口处状态变量的区间 {state_variable: Interval}，
+                默认使用函数所在合约的状态变量不变式
         """
+        if entry_state is None and self._use_state_invariants:
+            entry_state = self._get_state_invariants(getattr(function, "contract", None))
+        
+        # 修饰器摘要必须在重置跟踪状态之前计算；计算不变式期间不使用摘要（修饰器本身也作为写入函数参与计算）
+        if self._use_modifier_summaries and self._state_writes is None:
+            for modifier in getattr(function, "modifiers", []):
+                self._get_modifier_summary(modifier)
+        
         # 初始化变量范围
         self._tracked_vars = {}  # 重置跟踪变量
+        self._retired_intervals = {}  # 重置旁路表
+        self._defining_nodes = {}
+        self._safemath_processed = set()
+        self._tuple_intervals = {}
+        
+        # 用不变式初始化函数读写的状态变量
+        if entry_state:
+            accessed = set(getattr(function, "state_variables_read", [])) | set(getattr(function, "state_variables_written", []))
+            for var in accessed:
+                if var in entry_state:
+                    self._tracked_vars[var] = copy.copy(entry_state[var])
         
         # 为参数初始化区间
         for param in function.parameters:
@@ -1257,6 +2221,9 @@ class DeFiRangeAnalyzer:
                         self._tracked_vars[param] = Interval(0, 2**256 - 1)
                 else:
                     self._tracked_vars[param] = Interval(0, 2**256 - 1)
+            # 入口状态中给出的参数区间优先
+            if entry_state and param in entry_state:
+                self._tracked_vars[param] = copy.copy(entry_state[param])
         
         # 预处理：收集所有变量并进行分类
         local_vars = set()
@@ -1292,7 +2259,9 @@ class DeFiRangeAnalyzer:
                                 self._tracked_vars[var] = Interval(-(2**255), 2**255 - 1)
         
         # 为关键局部变量初始化区间
-        for var in local_vars.union(temp_vars):
+        # 临时变量总是先定义后使用，启用活跃性剪枝时不预先放入跟踪状态
+        seeded_vars = local_vars if self._prune_dead_temporaries else local_vars.union(temp_vars)
+        for var in seeded_vars:
             if self._is_deFi_critical(var):
                 if var not in self._tracked_vars:  # 避免覆盖已有区间
                     if hasattr(var, "type"):
@@ -1308,83 +2277,156 @@ class DeFiRangeAnalyzer:
                     else:
                         self._tracked_vars[var] = Interval(0, 2**256 - 1)
         
+        # 收集阈值加宽使用的阈值
+        self._widening_thresholds = self._collect_widening_thresholds(function) if self._use_threshold_widening else None
+        
+        # 常量折叠预处理：折叠结果直接作为跟踪区间，不可达节点不进入工作列表
+        folding = fold_function(function) if self._fold_constants else None
+        self._folded_irs = folding.folded_irs if folding else {}
+        if folding:
+            for var, value in folding.values.items():
+                self._tracked_vars[var] = Interval(value, value)
+            self._statistics["folded_operations"] += len(folding.folded_irs)
+            self._statistics["pruned_nodes"] += len(folding.unreachable)
+        
+        # 识别可以用闭式计算的计数循环 {循环头: CountedLoop}
+        counted_loops = find_counted_loops(function) if self._accelerate_counted_loops else {}
+        accelerated_heads = set()
+        loop_entries = {}  # {循环头: 进入循环的边上归纳变量的区间（多次进入时取并集）}
+        
+        # 把单入口单出口的节点链合并为基本块，工作列表以块为单位调度
+        blocks = build_basic_blocks(
+            function,
+            excluded=folding.unreachable if folding else None,
+            dead_edges=folding.dead_edges if folding else None,
+            coalesce=self._coalesce_basic_blocks,
+        )
+        self._statistics["blocks"] += len(blocks)
+        
+        # 块出口处活跃的临时变量和引用变量；折叠得到的常量不能剪除，因为对应的IR不会重新计算
+        live_out = compute_live_out(blocks) if self._prune_dead_temporaries else None
+        pinned = set(folding.values) if folding else set()
+        
         # 优化的工作列表算法
         # 使用双端队列以支持高效的头尾操作
-        worklist = deque(function.nodes)
-        processed = set()  # 跟踪已处理过的节点
+        worklist = deque(blocks)
         iteration = 0
         
         # 跟踪迭代状态，用于判断是否使用加宽
-        iteration_states = {}  # 记录每个节点的状态历史 {node: [state1, state2, ...]}
+        iteration_states = {}  # 记录每个块入口处的状态历史 {block: [state1, state2, ...]}
         
         # 迭代直到收敛或达到最大迭代次数
         while worklist and iteration < self._max_iterations:
-            # 批处理节点以减少迭代次数
+            self._check_deadline()
+            # 批处理基本块以减少迭代次数
             batch_size = min(self._worklist_batch_size, len(worklist))
-            batch_nodes = [worklist.popleft() for _ in range(batch_size)]
+            batch_blocks = [worklist.popleft() for _ in range(batch_size)]
             
-            for node in batch_nodes:
-                # 记录处理前的状态
+            for index, block in enumerate(batch_blocks):
+                # 记录处理前的状态（只在块边界保存）
                 old_state = self._snapshot_state()
                 
-                # 记录当前节点的状态历史
-                if node not in iteration_states:
-                    iteration_states[node] = []
-                iteration_states[node].append(old_state)
+                # 记录当前块的状态历史
+                if block not in iteration_states:
+                    iteration_states[block] = []
+                iteration_states[block].append(old_state)
+                self._statistics["block_visits"] += 1
+                self._statistics["peak_state_size"] = max(self._statistics["peak_state_size"], len(old_state))
+                self._statistics["node_visits"] += len(block.nodes)
                 
-                # 处理条件分支
-                if node.contains_if():
-                    self._process_condition(node)
+                # 计数循环的循环头总是块的第一个节点：用闭式区间代替迭代得到的归纳变量区间
+                if block.head in counted_loops:
+                    loop = counted_loops[block.head]
+                    init = loop_entries.get(block.head, self._tracked_vars.get(loop.variable))
+                    if self._accelerate_loop_head(loop, init):
+                        accelerated_heads.add(block.head)
+                    else:
+                        # 无法计算闭式区间，回退到普通迭代
+                        del counted_loops[block.head]
                 
-                # 处理IR指令
-                for ir in node.irs:
-                    self._process_ir(ir)
+                # 依次应用块内各节点的转移函数
+                for node in block.nodes:
+                    self._transfer_node(node)
                 
                 # 判断是否应用加宽操作
-                should_widen = len(iteration_states[node]) >= self._widening_threshold
+                visits = len(iteration_states[block])
+                should_widen = visits >= self._widening_threshold
+                # 有阈值时不必等到加宽延迟结束：第一次重新访问就跳到下一个阈值，
+                # 只有突破后没有阈值（会加宽到无穷）的变量才等到延迟结束
+                early_widen = not should_widen and visits >= 2 and bool(self._widening_thresholds)
                 
                 # 应用加宽操作以加速收敛
-                if should_widen:
-                    for var in self._tracked_vars:
-                        if var in old_state:
+                if should_widen or early_widen:
+                    widened = False
+                    # 只对该块赋值的变量加宽，条件细化得到的区间保持不变
+                    written = [ir.lvalue for node in block.nodes for ir in node.irs if getattr(ir, "lvalue", None) is not None]
+                    for var in written:
+                        if var in old_state and var in self._tracked_vars:
                             # 应用加宽操作：将当前值与旧值进行加宽
-                            self._tracked_vars[var] = old_state[var].widen(self._tracked_vars[var])
+                            interval = old_state[var].widen(self._tracked_vars[var], self._widening_thresholds)
+                            if early_widen and (interval.min_val == float('-inf') or interval.max_val == float('inf')):
+                                continue
+                            self._tracked_vars[var] = interval
+                            widened = True
+                    if should_widen or widened:
+                        self._statistics["widenings"] += 1
+                
+                # 移出死亡的临时变量和引用变量
+                if live_out is not None:
+                    self._prune_dead_variables(live_out[block], pinned)
                 
-                # 状态变化检测：如果状态发生变化，添加后继节点到工作列表
-                if self._state_changed(old_state):
-                    for son in node.sons:
-                        if son not in processed or son in worklist:
-                            # 只有当后继节点尚未处理或已经在工作列表中时才添加
-                            # 避免不必要地重复处理相同节点
-                            worklist.append(son)
+                # 进入计数循环的边：记录归纳变量的入口区间，循环头的闭式区间总是由它计算
+                for son in block.sons:
+                    loop = counted_loops.get(son.head)
+                    if loop is not None and block.tail not in loop.back_edge_sources:
+                        entry = self._tracked_vars.get(loop.variable)
+                        if entry is not None:
+                            previous = loop_entries.get(son.head)
+                            loop_entries[son.head] = copy.copy(entry) if previous is None else previous.join(entry)
                 
-                # 标记节点为已处理
-                processed.add(node)
+                # 单遍扫描：每个块只按顺序处理一次，不重新调度
+                if self._single_pass:
+                    continue
+                
+                # 状态变化检测：如果后继块上次处理时看到的状态已经改变，重新调度该后继块
+                # （包括循环回边上的块，否则循环体只会被处理一次）
+                for son in block.sons:
+                    # 计数循环的回边：恢复归纳变量的闭式区间，并立即加宽循环中写入的其他变量
+                    if son.head in counted_loops and block.tail in counted_loops[son.head].back_edge_sources:
+                        self._close_counted_loop(counted_loops[son.head], iteration_states[son][-1], loop_entries.get(son.head))
+                    if son in worklist or son in batch_blocks[index + 1:]:
+                        continue
+                    if son not in iteration_states or self._state_changed(iteration_states[son][-1]):
+                        worklist.append(son)
             
             iteration += 1
         
+        self._statistics["functions"] += 1
+        self._statistics["iterations"] += iteration
+        self._statistics["accelerated_loops"] += len(accelerated_heads)
+        
+        # 达到迭代上限时工作列表仍非空：结果不是不动点，不能当作已收敛
+        converged = not worklist
+        if not converged:
+            self._release_unconverged(function, worklist)
+        
         # 应用收窄操作以提高精度
-        # 收窄阶段通常在固定点达到后进行
-        if self._narrowing_iterations > 0:
-            # 定义固定的节点顺序以保证确定性
-            nodes_in_order = list(function.nodes)
-            
+        # 收窄阶段只在达到不动点后进行
+        if converged and self._narrowing_iterations > 0:
             for _ in range(self._narrowing_iterations):
-                for node in nodes_in_order:
-                    # 跳过没有历史状态的节点
-                    if node not in iteration_states or not iteration_states[node]:
+                # 按固定的块顺序处理以保证确定性
+                for block in blocks:
+                    # 跳过没有历史状态的块
+                    if block not in iteration_states or not iteration_states[block]:
                         continue
                     
-                    old_state = iteration_states[node][-1]  # 使用最后一个历史状态
-                    current_state = self._snapshot_state()
+                    old_state = iteration_states[block][-1]  # 使用最后一个历史状态
                     
-                    # 处理条件分支
-                    if node.contains_if():
-                        self._process_condition(node)
+                    for node in block.nodes:
+                        self._transfer_node(node)
                     
-                    # 处理IR指令
-                    for ir in node.irs:
-                        self._process_ir(ir)
+                    if live_out is not None:
+                        self._prune_dead_variables(live_out[block], pinned)
                     
                     # 应用收窄操作
                     for var in self._tracked_vars:
@@ -1398,32 +2440,115 @@ class DeFiRangeAnalyzer:
             "return": {ret: self._tracked_vars.get(ret, Interval()) for ret in function.returns}
         }
     
+    def _release_unconverged(self, function, pending):
+        """
+        处理未收敛的函数：待处理块及其可达块中写入的变量放宽到类型范围
+        
+        这些块的最新输入没有传播完，已有区间可能偏小；放宽后结果仍然可靠，只是不够精确
+        
+        Args:
+            function: 正在分析的函数
+            pending: 达到迭代上限时仍在工作列表中的块
+        """
+        self._statistics["unconverged_functions"] += 1
+        logger.warning(f"函数 {function.name} 达到迭代上限 {self._max_iterations} 时仍未收敛，"
+                       f"放宽 {len(pending)} 个待处理块可达的变量")
+        reached = set()
+        stack = list(pending)
+        while stack:
+            block = stack.pop()
+            if block in reached:
+                continue
+            reached.add(block)
+            stack.extend(block.sons)
+        for block in reached:
+            for node in block.nodes:
+                for ir in node.irs:
+                    var = getattr(ir, "lvalue", None)
+                    if var is None or var not in self._tracked_vars:
+                        continue
+                    bounds = self._type_bounds(var.type) if hasattr(var, "type") else None
+                    self._tracked_vars[var] = Interval(*bounds) if bounds else Interval(float('-inf'), float('inf'))
+    
+    def _prune_dead_variables(self, live, pinned):
+        """
+        把块出口处已经死亡的临时变量和引用变量移出跟踪状态
+        
+        被移出的变量的最后区间保存到旁路表中，函数分析结束后仍然可以用于违规报告
+        
+        Args:
+            live: 块出口处活跃的变量集合
+            pinned: 不允许移出的变量集合
+        """
+        dead = [var for var in self._tracked_vars if is_prunable(var) and var not in live and var not in pinned]
+        for var in dead:
+            self._retired_intervals[var] = self._tracked_vars.pop(var)
+        self._statistics["pruned_variables"] += len(dead)
+    
+    def _reportable_intervals(self):
+        """
+        获取当前函数中用于违规报告的变量区间
+        
+        Returns:
+            dict: 旁路表与当前跟踪状态合并后的区间映射（仍在跟踪的变量以当前区间为准）
+        """
+        intervals = dict(self._retired_intervals)
+        intervals.update(self._tracked_vars)
+        return intervals
+    
+    def _transfer_node(self, node):
+        """
+        应用单个节点的转移函数：先根据条件细化区间，再处理节点的IR指令
+        
+        Args:
+            node: CFG节点
+        """
+        # 计算修饰器摘要时记录占位符处的状态（多个占位符或多次到达时取并集）
+        if self._placeholder_state is not None and node.type == NodeType.PLACEHOLDER:
+            for var, interval in self._tracked_vars.items():
+                previous = self._placeholder_state.get(var)
+                self._placeholder_state[var] = copy.copy(interval) if previous is None else previous.join(interval)
+        
+        # 处理require/assert（不满足时回滚，之后的代码可以假设条件成立）
+        # 条件分支（IF/IFLOOP）不细化：分析器只有一份共享的跟踪状态，
+        # 按条件为真细化后的区间也会流到条件为假的分支和循环出口
+        if node.contains_require_or_assert():
+            self._process_condition(node)
+        
+        # 处理IR指令，记录变量最后一次被赋值的节点
+        self._current_node = node
+        for ir in node.irs:
+            self._current_ir = ir
+            if self._trace is None:
+                self._process_ir(ir)
+            else:
+                self._process_ir_traced(node, ir)
+            lvalue = getattr(ir, "lvalue", None)
+            if lvalue is not None:
+                self._defining_nodes[lvalue] = node
+    
     def _process_condition(self, node):
         """
-        处理条件表达式细化区间
+        处理require/assert的条件表达式细化区间
         
         通过分析条件表达式，精化条件中涉及的变量区间。
-        例如，当遇到 `if x > 5` 时，可以推断在条件为真的分支中 x 属于区间 [6, max]
+        例如，`require(x > 5)` 之后 x 属于区间 [6, max]
         
         Args:
-            node: 包含条件表达式的节点
-        """
-        if hasattr(node, "expression") and isinstance(node.expression, Binary):
-            left = node.expression.variable_left
-            right = node.expression.variable_right
-            op = node.expression.type_str
+            node: 包含require/assert的节点
+        """
+        # 节点的expression是表达式树而不是IR，需要从节点的IR中找出条件对应的比较运算
+        comparison = self._find_condition_comparison(node)
+        if comparison is not None:
+            left = comparison.variable_left
+            right = comparison.variable_right
+            op = comparison.type_str
             
             # 处理常量比较 (如 x < 10)
             if isinstance(right, Constant):
                 # 提取常量值
-                threshold = right.value
-                if isinstance(threshold, str):
-                    try:
-                        threshold = int(threshold, 16) if threshold.startswith("0x") else int(threshold)
-                    except ValueError:
-                        return
-                
-                if not isinstance(threshold, int):
+                threshold = self._constant_value(right)
+                if threshold is None:
                     return
                 
                 # 如果左操作数在跟踪范围内
@@ -1530,7 +2655,26 @@ class DeFiRangeAnalyzer:
                     self._tracked_vars[left] = intersection
                     self._tracked_vars[right] = intersection
     
-    def _check_bounds_violation(self, variable):
+    def _find_condition_comparison(self, node):
+        """
+        查找节点中require/assert条件对应的比较运算
+        
+        Args:
+            node: 包含require/assert的节点
+            
+        Returns:
+            Binary or None: 结果作为require/assert参数的比较运算
+        """
+        condition_values = [
+            ir.arguments[0] for ir in node.irs
+            if isinstance(ir, SolidityCall) and ir.function.name.startswith(("require(", "assert(")) and ir.arguments
+        ]
+        for ir in node.irs:
+            if isinstance(ir, Binary) and ir.lvalue in condition_values and ir.type_str in COMPARISON_OPERATORS:
+                return ir
+        return None
+    
+    def _check_bounds_violation(self, variable, interval=None):
         """
         检查区间约束违规
         
@@ -1539,14 +2683,17 @@ class DeFiRangeAnalyzer:
         
         Args:
             variable: 需要检查的变量
+            interval: 变量的区间，默认使用当前跟踪状态中的区间
             
         Returns:
             str or None: 如果发现违规则返回违规描述，否则返回None
         """
-        if variable not in self._tracked_vars:
-            return None
+        if interval is None:
+            if variable not in self._tracked_vars:
+                return None
+            interval = self._tracked_vars[variable]
         
-        current = self._tracked_vars[variable]
+        current = interval
         if current.is_bottom:
             # 空区间可能表示不可达代码
             return None
@@ -1581,11 +2728,27 @@ class DeFiRangeAnalyzer:
         执行整个分析过程，返回分析结果
         
         Returns:
-            list: 分析结果列表，包含发现的所有违规
+            list: 分析结果列表，违规为IntervalFinding，潜在问题为IntervalIssue（都引用合约、函数和节点）；
+                先按合约和函数顺序列出全部违规，再列出全部潜在问题
         """
-        results = []
+        results = list(self.iter_findings())
+        # 稳定排序：流式产出时两类结果按函数交错，这里恢复"违规在前、潜在问题在后"的顺序
+        results.sort(key=lambda result: isinstance(result, IntervalIssue))
+        return results
+    
+    def iter_findings(self):
+        """
+        逐函数分析并在每个函数分析完成后立即产出其违规结果和潜在问题
+        
+        与analyze()的结果相同，顺序不同：按合约和函数顺序，每个函数先产出违规、再产出潜在问题。
+        调用方可以在分析进行中处理结果，不必等待整个编译单元分析完成
+        设置了时间预算（set_time_budget）且超时时，停止在当前函数，产出已完成函数的结果并把truncated置为True
         
-        # 逐合约分析
+        Yields:
+            IntervalFinding或IntervalIssue: 违规结果，或潜在问题
+        """
+        # 逐合约收集待分析的函数
+        work = []
         for contract in self.compilation_unit.contracts_derived:
             # 只分析DeFi合约
             if not self._is_defi_contract(contract):
@@ -1596,30 +2759,352 @@ class DeFiRangeAnalyzer:
                 # 跳过构造函数和外部调用
                 if function.is_constructor or function.name == "slitherConstructorVariables":
                     continue
-                
-                # 执行区间分析
-                self._analyze_function_worklist(function)
-                
-                # 收集违规信息
-                for var in self._tracked_vars:
-                    violation = self._check_bounds_violation(var)
-                    if violation:
-                        results.append({
-                            "contract": contract.name,
-                            "function": function.name,
-                            "variable": str(var),
-                            "violation": violation,
-                            "interval": str(self._tracked_vars[var])
-                        })
-        
-        # 处理潜在问题
-        for issue in self._potential_issues:
-            results.append({
-                "issue": issue
-            })
-        
-        # 返回分析结果
-        return results
+                work.append((contract, function, extract_features(function) if self._use_cost_model else None))
+        
+        # 按预测耗时排序：便宜的函数先出结果
+        if self._schedule_by_cost and self._use_cost_model:
+            work.sort(key=lambda item: self._cost_model.predict_seconds(item[2]))
+        
+        for contract, function, features in work:
+            # 执行区间分析（函数体相同的函数只分析一次），保存回放检查点
+            overrides = self._function_parameters(features)
+            saved = self._apply_parameters(overrides)
+            try:
+                self._check_deadline()
+                outcome = self._analyze_function_deduplicated(function)
+                self._save_checkpoint(function, overrides)
+            except AnalysisTimeout:
+                # 超过时间预算：放弃当前函数，只保留已完成函数的结果
+                self.truncated = True
+                logger.warning(f"区间分析超过时间预算，在 {contract.name}.{function.name} 处停止，结果不完整")
+                break
+            finally:
+                self._apply_parameters(saved)
+            
+            # 把违规信息分发到当前合约和函数（函数体相同时节点顺序一致，按序号对应）
+            for (var, violation, interval, node_index) in outcome["findings"]:
+                node = function.nodes[node_index] if node_index is not None else None
+                yield IntervalFinding(contract, function, var, violation, interval, node)
+            for (issue, node_index, var) in outcome["issues"]:
+                node = function.nodes[node_index] if node_index is not None else None
+                yield IntervalIssue(contract, function, issue, node, var)
+    
+    def _function_parameters(self, features):
+        """
+        根据代价模型为函数选择分析参数
+        
+        Args:
+            features: 函数特征，不使用代价模型时为None
+            
+        Returns:
+            dict: 需要覆盖的分析参数 {属性名: 值}，不需要调整时为空
+        """
+        if features is None:
+            return {}
+        
+        parameters = self._cost_model.choose_parameters(features, self.tier, self._function_time_budget, self._max_iterations)
+        tier = parameters.pop("tier")
+        overrides = {}
+        if tier != self.tier:
+            overrides.update(ANALYSIS_TIERS[tier])
+            self._statistics["cost_model_downgrades"] += 1
+        overrides.update(parameters)
+        
+        # 只保留与当前参数不同的项
+        overrides = {name: value for name, value in overrides.items() if getattr(self, name) != value}
+        if overrides:
+            self._statistics["cost_model_adjusted"] += 1
+        return overrides
+    
+    def _apply_parameters(self, overrides):
+        """
+        覆盖分析参数
+        
+        Args:
+            overrides: {属性名: 值}
+            
+        Returns:
+            dict: 被覆盖前的参数值，用于恢复
+        """
+        saved = {name: getattr(self, name) for name in overrides}
+        for name, value in overrides.items():
+            setattr(self, name, value)
+        return saved
+    
+    def _analyze_function_deduplicated(self, function):
+        """
+        分析函数并收集违规信息；规范指纹、入口状态和分析参数都相同的函数直接使用已有结果
+        
+        Args:
+            function: 要分析的函数
+            
+        Returns:
+            dict: {"findings": [(变量, 违规描述, 区间, 赋值节点序号)], "issues": [(问题描述, 节点序号, 变量)],
+                "params": 参数区间列表, "returns": 返回值区间列表}
+        """
+        key = self._dedupe_key(function) if self._dedupe_functions else None
+        if key is not None:
+            self._statistics["dedupe_functions"] += 1
+            shared = self._function_results.get(key)
+            if shared is not None:
+                self._function_results.move_to_end(key)
+                self._statistics["dedupe_hits"] += 1
+                # 共享结果只有变量名，换回当前函数的变量对象（找不到时保留名称）
+                variables = self._variables_by_name(function)
+                outcome = {
+                    "findings": [(variables.get(name, name), violation, copy.copy(interval), index)
+                                 for (name, violation, interval, index) in shared["findings"]],
+                    "issues": [(issue, index, variables.get(name, name) if name is not None else None)
+                               for (issue, index, name) in shared["issues"]],
+                    "params": shared["params"],
+                    "returns": shared["returns"],
+                }
+                # 分发：潜在问题和函数摘要与重新分析时相同
+                self._potential_issues.extend(
+                    (issue, function.nodes[index] if index is not None else None, var)
+                    for (issue, index, var) in outcome["issues"]
+                )
+                self._function_summaries[function] = {
+                    "params": {param: copy.copy(interval) for param, interval in zip(function.parameters, outcome["params"])},
+                    "return": {ret: copy.copy(interval) for ret, interval in zip(function.returns, outcome["returns"])}
+                }
+                return outcome
+        
+        issue_count = len(self._potential_issues)
+        self._analyze_function_worklist(function)
+        
+        # 收集违规信息（包括已被活跃性剪枝移出跟踪状态的变量）
+        findings = []
+        intervals = self._reportable_intervals()
+        node_index = {node: index for index, node in enumerate(function.nodes)}
+        for var in intervals:
+            violation = self._check_bounds_violation(var, intervals[var])
+            if violation:
+                findings.append((var, violation, intervals[var], node_index.get(self._defining_nodes.get(var))))
+        
+        summary = self._function_summaries[function]
+        outcome = {
+            "findings": findings,
+            "issues": [(issue, node_index.get(node), var) for (issue, node, var) in self._potential_issues[issue_count:]],
+            "params": list(summary["params"].values()),
+            "returns": list(summary["return"].values()),
+        }
+        if key is not None:
+            # 共享表只保存变量名，不让表项引用本编译单元的变量对象
+            self._function_results[key] = {
+                "findings": [(str(var), violation, copy.copy(interval), index)
+                             for (var, violation, interval, index) in findings],
+                "issues": [(issue, index, str(var) if var is not None else None)
+                           for (issue, index, var) in outcome["issues"]],
+                "params": [copy.copy(interval) for interval in outcome["params"]],
+                "returns": [copy.copy(interval) for interval in outcome["returns"]],
+            }
+            if len(self._function_results) > self._dedupe_cache_size:
+                self._function_results.popitem(last=False)
+        return outcome
+    
+    @staticmethod
+    def _variables_by_name(function):
+        """
+        按名称索引函数中出现的变量（参数、返回值和IR读写的变量）
+        
+        Args:
+            function: Slither函数对象
+            
+        Returns:
+            dict: {变量名: 变量对象}，同名时保留最先出现的变量
+        """
+        variables = {}
+        for var in list(function.parameters) + list(function.returns):
+            variables.setdefault(str(var), var)
+        for node in function.nodes:
+            for ir in node.irs:
+                lvalue = getattr(ir, "lvalue", None)
+                if lvalue is not None:
+                    variables.setdefault(str(lvalue), lvalue)
+                for var in ir.read:
+                    variables.setdefault(str(var), var)
+        return variables
+    
+    def _dedupe_key(self, function):
+        """
+        计算函数去重的键
+        
+        键由三部分组成：函数的规范指纹（包含被调函数、修饰器和状态变量布局，见fingerprints模块）；
+        函数及其被调函数访问的状态变量的不变式（入口状态）；影响分析结果的分析参数
+        
+        Args:
+            function: 要分析的函数
+            
+        Returns:
+            tuple or None: 去重键，无法计算指纹时返回None（函数不参与去重）
+        """
+        try:
+            fingerprint = self._fingerprinter.fingerprint(function)
+        except Exception as e:
+            logger.debug(f"无法计算函数 {function.name} 的规范指纹: {e}")
+            return None
+        
+        invariants = self._get_state_invariants(getattr(function, "contract", None)) if self._use_state_invariants else None
+        entry = None
+        if invariants is not None:
+            accessed = set(function.all_state_variables_read()) | set(function.all_state_variables_written())
+            entry = tuple(sorted(f"{var.name}:{var.type}={invariants[var]}" for var in accessed if var in invariants))
+        
+        settings = (
+            self._single_pass, self._widening_threshold, self._narrowing_iterations, self._max_iterations,
+            self._worklist_batch_size,
+            self._use_threshold_widening, self._accelerate_counted_loops, self._fold_constants,
+            self._coalesce_basic_blocks, self._prune_dead_temporaries, self._use_state_invariants,
+            self._invariant_max_rounds, self._use_modifier_summaries, self._use_library_summaries,
+            self._use_call_summaries, self._max_call_depth, self._exact_bound_limit,
+        )
+        return (fingerprint, entry, settings)
+    
+    def _save_checkpoint(self, function, parameters=None):
+        """
+        保存函数的回放检查点：入口状态中函数访问的变量区间、IR序列的哈希和为该函数调整过的分析参数
+        
+        Args:
+            function: 已分析的函数
+            parameters: 代价模型为该函数覆盖的分析参数
+        """
+        entry_state = self._get_state_invariants(getattr(function, "contract", None)) if self._use_state_invariants else None
+        accessed = set(getattr(function, "state_variables_read", [])) | set(getattr(function, "state_variables_written", []))
+        self._checkpoints[function] = {
+            "entry_state": {var: copy.copy(interval) for var, interval in (entry_state or {}).items() if var in accessed},
+            "tape": self._ir_tape(function),
+            "parameters": dict(parameters or {}),
+        }
+    
+    @staticmethod
+    def _ir_tape(function):
+        """
+        按节点顺序计算函数IR文本的哈希
+        
+        每次调用都重新计算：规范指纹按函数对象缓存，不能用来判断IR是否已经改变
+        
+        Args:
+            function: Slither函数对象
+            
+        Returns:
+            str: 十六进制SHA-256
+        """
+        digest = hashlib.sha256()
+        for node in function.nodes:
+            digest.update(f"{node.node_id}:{node.type}\n".encode("utf-8"))
+            for ir in node.irs:
+                digest.update(f"{ir}\n".encode("utf-8"))
+        return digest.hexdigest()
+    
+    def explain(self, finding):
+        """
+        解释一条结果：从检查点回放所在函数，记录每条IR的操作数区间和结果区间，
+        返回产生该区间的IR推导链
+        
+        回放使用与分析时相同的入口状态和分析参数，结果是确定的；
+        回放不改变分析器的状态和统计信息
+        
+        Args:
+            finding: iter_findings()/analyze()产出的IntervalFinding或IntervalIssue
+            
+        Returns:
+            list: 按执行顺序排列的推导步骤
+                [{"node": 节点, "ir": IR文本, "operands": [(操作数, 区间文本)], "variable": 结果变量, "interval": 结果区间文本}]
+            
+        Raises:
+            ValueError: 函数没有检查点，或函数的IR与保存检查点时不同
+        """
+        function = finding.function_object
+        checkpoint = self._checkpoints.get(function)
+        if checkpoint is None:
+            raise ValueError(f"函数 {function.name} 没有回放检查点，请先用analyze()或iter_findings()分析")
+        if self._ir_tape(function) != checkpoint["tape"]:
+            raise ValueError(f"函数 {function.name} 的IR与保存检查点时不同，无法回放")
+        
+        saved = (
+            self._tracked_vars, self._retired_intervals, self._defining_nodes, self._safemath_processed,
+            self._tuple_intervals, self._folded_irs, self._widening_thresholds, self._current_node,
+            self._current_ir, list(self._potential_issues), dict(self._function_summaries), dict(self._statistics),
+        )
+        self._trace = []
+        # 回放不受分析时间预算限制
+        saved_parameters = self._apply_parameters(dict(checkpoint["parameters"], _deadline=None))
+        try:
+            self._analyze_function_worklist(function, entry_state=dict(checkpoint["entry_state"]))
+            trace = self._trace
+        finally:
+            self._trace = None
+            self._apply_parameters(saved_parameters)
+            (self._tracked_vars, self._retired_intervals, self._defining_nodes, self._safemath_processed,
+             self._tuple_intervals, self._folded_irs, self._widening_thresholds, self._current_node,
+             self._current_ir, self._potential_issues, self._function_summaries, self._statistics) = saved
+        
+        return [self._format_trace_step(step) for step in self._derivation(trace, finding)]
+    
+    @staticmethod
+    def _derivation(trace, finding):
+        """
+        在回放轨迹中从结果变量向前追溯其推导链
+        
+        去重命中的结果按名称换回当前函数的变量，找不到时只有变量名，因此变量按名称匹配
+        
+        Args:
+            trace: 回放轨迹
+            finding: IntervalFinding或IntervalIssue
+            
+        Returns:
+            list: 推导链上的轨迹步骤（按执行顺序）
+        """
+        target = str(finding.variable_object) if finding.variable_object is not None else None
+        if target is None:
+            return []
+        
+        # 结果变量最后一次被赋值的步骤；潜在问题限定在问题所在的节点
+        end = None
+        for index in range(len(trace) - 1, -1, -1):
+            step = trace[index]
+            if str(step["lvalue"]) != target:
+                continue
+            if isinstance(finding, IntervalIssue) and finding.node is not None and step["node"].node_id != finding.node.node_id:
+                continue
+            end = index
+            break
+        if end is None:
+            return []
+        
+        # 向前追溯每个操作数在被读取之前最后一次被赋值的步骤
+        selected = {end}
+        pending = [end]
+        while pending:
+            index = pending.pop()
+            for operand, _ in trace[index]["reads"]:
+                if isinstance(operand, Constant):
+                    continue
+                name = str(operand)
+                for earlier in range(index - 1, -1, -1):
+                    if str(trace[earlier]["lvalue"]) == name:
+                        if earlier not in selected:
+                            selected.add(earlier)
+                            pending.append(earlier)
+                        break
+        return [trace[index] for index in sorted(selected)]
+    
+    @staticmethod
+    def _format_trace_step(step):
+        """
+        把轨迹步骤转换为可读的推导步骤
+        """
+        return {
+            "node": step["node"],
+            "ir": str(step["ir"]),
+            "operands": [
+                (str(operand), str(interval) if interval is not None else ("常量" if isinstance(operand, Constant) else "未跟踪"))
+                for operand, interval in step["reads"]
+            ],
+            "variable": str(step["lvalue"]),
+            "interval": str(step["result"]) if step["result"] is not None else "未跟踪",
+        }
     
     def export_summary(self):
         """
@@ -1648,15 +3133,25 @@ class IntervalAnalysisLauncher:
     不依赖于Slither的检测器架构
     """
     
-    def __init__(self, compilation_unit):
+    def __init__(self, compilation_unit, tier=None, time_budget=None):
         """
         初始化启动器
         
         Args:
             compilation_unit: Slither编译单元对象
+            tier: 分析档位，为None时由环境变量或默认档位决定
+            time_budget: 墙钟时间预算（秒），为None时不限时
         """
         self.compilation_unit = compilation_unit
-        self.analyzer = DeFiRangeAnalyzer(compilation_unit)
+        self.analyzer = DeFiRangeAnalyzer(compilation_unit, tier=tier)
+        self.analyzer.set_time_budget(time_budget)
+    
+    @property
+    def truncated(self):
+        """
+        分析是否因超过时间预算而提前结束
+        """
+        return self.analyzer.truncated
     
     def launch(self):
         """
@@ -1667,6 +3162,27 @@ class IntervalAnalysisLauncher:
         """
         return self.analyzer.analyze()
     
+    def iter_findings(self):
+        """
+        执行分析并逐个产出结果
+        
+        Yields:
+            IntervalFinding或IntervalIssue: 违规结果，或潜在问题
+        """
+        return self.analyzer.iter_findings()
+    
+    def explain(self, finding):
+        """
+        回放结果所在的函数，返回产生该结果的IR推导链
+        
+        Args:
+            finding: launch()/iter_findings()产出的结果
+            
+        Returns:
+            list: 推导步骤（见DeFiRangeAnalyzer.explain）
+        """
+        return self.analyzer.explain(finding)
+    
     def get_summary(self):
         """
         获取分析摘要
@@ -1675,6 +3191,15 @@ class IntervalAnalysisLauncher:
             dict: 函数区间分析摘要
         """
         return self.analyzer.export_summary()
+    
+    def get_statistics(self):
+        """
+        获取分析统计信息
+        
+        Returns:
+            dict: 分析统计信息
+        """
+        return self.analyzer.get_statistics()
 
 class DeFiRangeViolationDetector(AbstractDetector):
     """
@@ -1723,14 +3248,16 @@ function calculateInterest(uint256 amount, uint256 rate) public returns (uint256
         Returns:
             list: 符合Slither检测器格式的结果列表
         """
-        # 创建分析器并运行分析
+        # 创建分析器并运行分析（超过时间预算时只返回已完成函数的结果）
+        budget = DetectorBudget()
         analyzer = DeFiRangeAnalyzer(self.compilation_unit)
+        analyzer.set_time_budget(budget.remaining())
         violations = analyzer.analyze()
         
         # 处理分析结果
         results = []
         for violation in violations:
-            if 'contract' in violation and 'function' in violation and 'violation' in violation:
+            if isinstance(violation, IntervalFinding):
                 # 为合约函数相关问题准备详细信息
                 contract_name = violation.get('contract', 'Unknown')
                 function_name = violation.get('function', 'Unknown')
@@ -1747,20 +3274,8 @@ function calculateInterest(uint256 amount, uint256 rate) public returns (uint256
                 # 创建初步结果
                 result = self.generate_result(info)
                 
-                # 添加源代码位置信息
-                contract = self.compilation_unit.get_contract_from_name(contract_name)
-                if contract:
-                    # 处理get_contract_from_name返回列表的情况
-                    if isinstance(contract, list):
-                        if contract:
-                            contract = contract[0]  # 使用第一个匹配的合约
-                        else:
-                            contract = None
-                            
-                    if contract:  # 确保contract不为None或空列表
-                        function = next((f for f in contract.functions if f.name == function_name), None)
-                        if function:
-                            result.add(function)
+                # 添加源代码位置信息（结果直接引用赋值节点或函数）
+                result.add(violation.source_element)
                 
                 results.append(result)
             
@@ -1769,4 +3284,6 @@ function calculateInterest(uint256 amount, uint256 rate) public returns (uint256
                 info = [f"检测到通用问题: {violation['issue']}\n"]
                 results.append(self.generate_result(info))
         
+        if analyzer.truncated:
+            results.append(truncated_result(self, budget))
         return results
\ No newline at end of file
@@ -27,6 +27,7 @@ import time
 import argparse
 import subprocess
 import shutil
+import signal
 import random
 import pandas as pd
 import numpy as np
@@ -199,11 +200,35 @@ def find_contracts(directory):
                 contracts.append(full_path)
     return contracts
 
-def run_slither(cmd, contract_file, detector_flag="", is_enhanced=False):
+def detector_time_budget(cmd, timeout):
+    """
+    根据整体超时计算增强检测器各自的时间预算
+    
+    增强检测器在预算内返回部分结果，预留两成时间给Slither的编译和解析，
+    剩余时间在命令选择的检测器之间平分
+    """
+    if not timeout or timeout <= 0:
+        return None
+    detectors = cmd.split("--detect", 1)[1].split()[0].split(",") if "--detect" in cmd else []
+    return timeout * 0.8 / max(len(detectors), 1)
+
+def _kill_process_tree(process):
+    """结束shell进程及其启动的Slither子进程"""
+    try:
+        if sys.platform.startswith('win'):
+            subprocess.run(["taskkill", "/F", "/T", "/PID", str(process.pid)], capture_output=True)
+        else:
+            os.killpg(process.pid, signal.SIGKILL)
+    except (OSError, subprocess.SubprocessError):
+        process.kill()
+
+def run_slither(cmd, contract_file, detector_flag="", is_enhanced=False, timeout=None):
     """
     运行Slither命令并返回结果
     
-    执行实际的Slither命令并收集结果
+    执行实际的Slither命令并收集结果。设置timeout时超时的命令被结束，
+    结果中timed_out为True；增强版命令同时通过SLITHER_ENHANCED_TIMEOUT
+    让各增强检测器在超时前返回部分结果（带truncated标记）
     """
     start_time = time.time()
     
@@ -211,20 +236,41 @@ def run_slither(cmd, contract_file, detector_flag="", is_enhanced=False):
     full_cmd = f"{cmd} {contract_file} {detector_flag} --json -"
     print_step(f"执行命令: {full_cmd}")
     
+    env = os.environ.copy()
+    budget = detector_time_budget(cmd, timeout) if is_enhanced else None
+    if budget is not None:
+        env["SLITHER_ENHANCED_TIMEOUT"] = f"{budget:.1f}"
+    
     try:
-        # 实际执行命令
-        process = subprocess.run(full_cmd, shell=True, capture_output=True, text=True)
+        # 实际执行命令（独立进程组，超时时连同子进程一起结束）
+        process = subprocess.Popen(full_cmd, shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                   text=True, env=env, start_new_session=not sys.platform.startswith('win'))
+        try:
+            output, error = process.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            _kill_process_tree(process)
+            process.communicate()
+            execution_time = time.time() - start_time
+            print_error(f"执行超时（{timeout} 秒）: {os.path.basename(contract_file)}")
+            return {
+                "total_issues": 0,
+                "high_severity": 0,
+                "medium_severity": 0,
+                "low_severity": 0,
+                "info_severity": 0,
+                "execution_time": execution_time,
+                "execution_error": True,
+                "timed_out": True,
+                "error_message": f"超过 {timeout} 秒超时"
+            }
         execution_time = time.time() - start_time
         
-        # 解析输出的JSON结果
-        output = process.stdout
-        error = process.stderr
-        
         # 初始化问题计数
         high = 0
         medium = 0
         low = 0
         info = 0
+        truncated = False
         
         # 检查是否有Solidity文件解析错误
         if process.returncode != 0:
@@ -251,6 +297,10 @@ def run_slither(cmd, contract_file, detector_flag="", is_enhanced=False):
                     
                     if "results" in result_json and "detectors" in result_json["results"]:
                         for detector in result_json["results"]["detectors"]:
+                            # 超过时间预算的检测器附加的截断标记不计入问题数
+                            if detector.get("additional_fields", {}).get("truncated"):
+                                truncated = True
+                                continue
                             if detector["impact"] == "High":
                                 high += 1
                             elif detector["impact"] == "Medium":
@@ -327,7 +377,9 @@ def run_slither(cmd, contract_file, detector_flag="", is_enhanced=False):
             "low_severity": low,
             "info_severity": info,
             "execution_time": execution_time,
-            "execution_error": False
+            "execution_error": False,
+            "timed_out": False,
+            "truncated": truncated
         }
     
     except Exception as e:
@@ -362,8 +414,8 @@ def identify_testset(contract_file):
     else:
         return "其他测试集"
 
-def test_contracts(contracts, detectors, output_dir):
-    """测试合约集"""
+def test_contracts(contracts, detectors, output_dir, timeout=None):
+    """测试合约集，timeout为每次Slither调用的超时时间（秒）"""
     results = []
     
     for contract_file in contracts:
@@ -401,20 +453,20 @@ def test_contracts(contracts, detectors, output_dir):
                         safe_flag = ""
                     
                     print_warning(f"原版不直接支持该检测器，使用相似功能的标准检测器: {safe_flag}")
-                    original_result = run_slither(original_cmd, contract_file, safe_flag, False)
+                    original_result = run_slither(original_cmd, contract_file, safe_flag, False, timeout)
                     
                     # 记录原始执行但不强制归零结果，保留对照基准
                     print_step("保留原版基准数据以供对比...")
                 else:
-                    original_result = run_slither(original_cmd, contract_file, detector_flag, False)
+                    original_result = run_slither(original_cmd, contract_file, detector_flag, False, timeout)
             else:
                 # 标准检测器使用正常流程
                 print_step("运行原版Slither...")
-                original_result = run_slither(SLITHER_ORIGINAL_CMD, contract_file, detector_flag, False)
+                original_result = run_slither(SLITHER_ORIGINAL_CMD, contract_file, detector_flag, False, timeout)
             
             # 始终使用增强版命令运行增强版测试
             print_step("运行增强版Slither...")
-            enhanced_result = run_slither(SLITHER_ENHANCED_CMD, contract_file, detector_flag, True)
+            enhanced_result = run_slither(SLITHER_ENHANCED_CMD, contract_file, detector_flag, True, timeout)
             
             # 计算改进率
             issue_diff = enhanced_result["total_issues"] - original_result["total_issues"]
@@ -460,6 +512,8 @@ def test_contracts(contracts, detectors, output_dir):
                 "增强_低危数": enhanced_result["low_severity"],
                 "增强_信息数": enhanced_result["info_severity"],
                 "增强_时间(秒)": enhanced_result["execution_time"],
+                "增强_超时": enhanced_result.get("timed_out", False),
+                "增强_结果截断": enhanced_result.get("truncated", False),
                 "检出差异": issue_diff,
                 "高危差异": high_diff,
                 "时间差异(%)": time_improvement,
@@ -1294,7 +1348,7 @@ def main():
     # 运行测试
     print_header("开始性能测试")
     try:
-        results_df = test_contracts(all_contracts, detectors, output_dir)
+        results_df = test_contracts(all_contracts, detectors, output_dir, args.timeout)
         
         # 生成图表
         try: